@@ -21,13 +21,14 @@
 # IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
-import argparse, os, sys
+import argparse, sys
 import numpy as np
 import tritonclient.grpc
 import inspect
-import re
 import matplotlib.pyplot as plt
 from tqdm import tqdm
+from dali_backend.test_utils.batch import pad_batch
+from dali_backend.test_utils.loader import iter_samples, list_samples, load_sample
 
 FLAGS = None
 
@@ -121,47 +122,13 @@ def batcher(dataset, batch_size_provider, n_iterations=-1):
         iter_idx += 1
 
 
-def load_sample(img_path: str):
-    """
-    Loads sample as an encoded array of bytes.
-    This is a typical approach you want to use in DALI backend.
-    """
-    with open(img_path, "rb") as f:
-        img = f.read()
-        return np.array(list(img)).astype(np.uint8)
-
-
 def load_samples(dir_path: str, name_pattern='.', max_samples=-1):
     """
     Loads all files in given dir_path. Treats them as samples. Optionally apply regex pattern to
     file names and use only the files, that suffice the pattern.
     """
-    assert max_samples > 0 or max_samples == -1
-    samples = []
-
-    # Traverses directory for files (not dirs) and returns full paths to them
-    path_generator = (os.path.join(dir_path, f) for f in os.listdir(dir_path) if
-                      os.path.isfile(os.path.join(dir_path, f)) and
-                      re.search(name_pattern, f) is not None)
-
-    sample_paths = [dir_path] if os.path.isfile(dir_path) else list(path_generator)
-    if 0 < max_samples < len(sample_paths):
-        sample_paths = sample_paths[:max_samples]
-    for img in tqdm(sample_paths, desc="Reading samples."):
-        samples.append(load_sample(img))
-    return samples
-
-
-def array_from_list(arrays):
-    """
-    Convert list of ndarrays to single ndarray with ndims+=1.
-    """
-    lengths = list(map(lambda x, arr=arrays: arr[x].shape[0], [x for x in range(len(arrays))]))
-    max_len = max(lengths)
-    arrays = list(map(lambda arr, ml=max_len: np.pad(arr, ((0, ml - arr.shape[0]))), arrays))
-    for arr in arrays:
-        assert arr.shape == arrays[0].shape, "Arrays must have the same shape."
-    return np.stack(arrays)
+    sample_paths = list_samples(dir_path, name_pattern, max_samples)
+    return list(tqdm(iter_samples(sample_paths), desc="Reading samples.", total=len(sample_paths)))
 
 
 def generate_inputs(input_name, input_shape, input_dtype):
@@ -228,7 +195,7 @@ def main(model_name):
 
     image_data = [load_sample(FLAGS.sample)]
 
-    image_data = array_from_list(image_data)
+    image_data, _ = pad_batch(image_data)
     print("Samples loaded")
 
     for batch in tqdm(batcher(image_data, FLAGS.batch_size, n_iterations=FLAGS.n_iter),
@@ -21,11 +21,13 @@
 # IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
-import argparse, os, sys
+import argparse, sys
 import numpy as np
 import tritonclient.grpc
 import utils
-import re
+from dali_backend.test_utils.batch import pad_batch
+from dali_backend.test_utils.loader import iter_samples, list_samples
+from dali_backend.test_utils.shm import SystemShmIO
 from tqdm import tqdm
 from PIL import Image
 
@@ -48,6 +50,10 @@ def parse_args():
                         help='Output name')
     parser.add_argument('--statistics', action='store_true', required=False, default=False,
                         help='Print tritonserver statistics after inferring')
+    parser.add_argument('--shared_memory', action='store_true', required=False, default=False,
+                        help='Pass inputs and outputs through the system shared memory')
+    parser.add_argument('--prefetch', action='store_true', required=False, default=False,
+                        help='Assemble the next batch in the background, while inferring')
     img_group = parser.add_mutually_exclusive_group()
     img_group.add_argument('--img', type=str, required=False, default=None,
                            help='Run a img dali pipeline. Arg: path to the image.')
@@ -57,47 +63,13 @@ def parse_args():
     return parser.parse_args()
 
 
-def load_image(img_path: str):
-    """
-    Loads image as an encoded array of bytes.
-    This is a typical approach you want to use in DALI backend
-    """
-    with open(img_path, "rb") as f:
-        img = f.read()
-        return np.array(list(img)).astype(np.uint8)
-
-
 def load_images(dir_path: str, name_pattern='.', max_images=-1):
     """
     Loads all files in given dir_path. Treats them as images. Optionally apply regex pattern to
     file names and use only the files, that suffice the pattern
     """
-    assert max_images > 0 or max_images == -1
-    images = []
-
-    # Traverses directory for files (not dirs) and returns full paths to them
-    path_generator = (os.path.join(dir_path, f) for f in os.listdir(dir_path) if
-                      os.path.isfile(os.path.join(dir_path, f)) and
-                      re.search(name_pattern, f) is not None)
-
-    img_paths = [dir_path] if os.path.isfile(dir_path) else list(path_generator)
-    if 0 < max_images < len(img_paths):
-        img_paths = img_paths[:max_images]
-    for img in tqdm(img_paths, desc="Reading images"):
-        images.append(load_image(img))
-    return images
-
-
-def array_from_list(arrays):
-    """
-    Convert list of ndarrays to single ndarray with ndims+=1
-    """
-    lengths = list(map(lambda x, arr=arrays: arr[x].shape[0], [x for x in range(len(arrays))]))
-    max_len = max(lengths)
-    arrays = list(map(lambda arr, ml=max_len: np.pad(arr, ((0, ml - arr.shape[0]))), arrays))
-    for arr in arrays:
-        assert arr.shape == arrays[0].shape, "Arrays must have the same shape"
-    return np.stack(arrays)
+    img_paths = list_samples(dir_path, name_pattern, max_images)
+    return list(tqdm(iter_samples(img_paths), desc="Reading images", total=len(img_paths)))
 
 
 def save_byte_image(bytes, size_wh=(224, 224), name_suffix=0):
@@ -133,28 +105,38 @@ def main():
     image_data = load_images(FLAGS.img_dir if FLAGS.img_dir is not None else FLAGS.img,
                              max_images=FLAGS.batch_size * FLAGS.n_iter)
 
-    image_data = array_from_list(image_data)
+    image_data, _ = pad_batch(image_data)
     print("Images loaded")
 
-    for batch in tqdm(utils.batcher(image_data, FLAGS.batch_size, n_iterations=FLAGS.n_iter),
-                      desc="Inferring", total=FLAGS.n_iter):
+    shm_io = SystemShmIO(triton_client, model_name, [FLAGS.input_name],
+                         [FLAGS.output_name]) if FLAGS.shared_memory else None
+
+    batches = utils.ring_batcher(image_data, FLAGS.batch_size, n_iterations=FLAGS.n_iter,
+                                 prefetch=FLAGS.prefetch)
+    for batch in tqdm(batches, desc="Inferring", total=FLAGS.n_iter):
 
-        inputs = generate_inputs(FLAGS.input_name, batch.shape, "UINT8")
-        outputs = generate_outputs(FLAGS.output_name)
+        if shm_io is not None:
+            output0_data, = shm_io.infer([batch])
+        else:
+            inputs = generate_inputs(FLAGS.input_name, batch.shape, "UINT8")
+            outputs = generate_outputs(FLAGS.output_name)
 
-        # Initialize the data
-        inputs[0].set_data_from_numpy(batch)
+            # Initialize the data
+            inputs[0].set_data_from_numpy(batch)
 
-        # Test with outputs
-        results = triton_client.infer(model_name=model_name, inputs=inputs, outputs=outputs)
+            # Test with outputs
+            results = triton_client.infer(model_name=model_name, inputs=inputs, outputs=outputs)
 
-        # Get the output arrays from the results
-        output0_data = results.as_numpy(FLAGS.output_name)
+            # Get the output arrays from the results
+            output0_data = results.as_numpy(FLAGS.output_name)
         maxs = np.argmax(output0_data, axis=1)
         if FLAGS.statistics:
             for i in range(len(maxs)):
                 print("Sample ", i, " - label: ", maxs[i], " ~ ", output0_data[i, maxs[i]])
 
+    if shm_io is not None:
+        shm_io.close()
+
     statistics = triton_client.get_inference_statistics(model_name="dali")
     if len(statistics.model_stats) != 1:
         print("FAILED: Inference Statistics")
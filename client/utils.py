@@ -21,6 +21,8 @@
 
 import numpy as np
 import inspect
+import queue
+import threading
 
 
 def _select_batch_size(batch_size_provider, batch_idx):
@@ -85,3 +87,110 @@ def batcher(dataset, batch_size_provider, n_iterations=-1):
             )
         curr_sample = (curr_sample + batch_size) % dataset_size
         iter_idx += 1
+
+
+class _IndexRing:
+    """
+    Precomputed ``arange(size) % dataset_size`` plan. Indices of any batch, which wraps around
+    the dataset, are a view into it, so no per-batch index array needs to be allocated.
+    The only exception are the batches bigger than the dataset.
+    """
+
+    def __init__(self, dataset_size):
+        self._dataset_size = dataset_size
+        self._ring = np.empty(0, dtype=np.int64)
+
+    def indices(self, start, batch_size):
+        suffix = self._dataset_size - start
+        n_rep = (batch_size - suffix) // self._dataset_size
+        if n_rep > 0:
+            # Same as ``batcher``: the whole revolutions repeat every sample ``n_rep`` times
+            # (rather than tile the dataset). Such batches are bigger than the dataset, so they
+            # get their own index array.
+            prefix = batch_size - (suffix + self._dataset_size * n_rep)
+            return np.concatenate((np.arange(start, self._dataset_size, dtype=np.int64),
+                                   np.repeat(np.arange(self._dataset_size, dtype=np.int64),
+                                             n_rep),
+                                   np.arange(prefix, dtype=np.int64)))
+        if start + batch_size > self._ring.shape[0]:
+            size = max(start + batch_size, 2 * self._ring.shape[0])
+            self._ring = np.arange(size, dtype=np.int64) % self._dataset_size
+        return self._ring[start: start + batch_size]
+
+
+def _ring_batches(dataset, batch_size_provider, n_iterations, n_buffers):
+    dataset_size = dataset.shape[0]
+    index_ring = _IndexRing(dataset_size)
+    buffers = [np.empty((0,) + dataset.shape[1:], dtype=dataset.dtype) for _ in range(n_buffers)]
+    iter_idx = 0
+    curr_sample = 0
+    while True:
+        try:
+            batch_size = _select_batch_size(batch_size_provider, iter_idx)
+        except StopIteration:
+            return
+
+        # Stop condition
+        if n_iterations == -1:
+            if curr_sample + batch_size >= dataset_size:
+                return
+        else:
+            if iter_idx >= n_iterations:
+                return
+
+        if curr_sample + batch_size < dataset_size:
+            yield dataset[curr_sample: curr_sample + batch_size]
+        else:
+            buf_idx = iter_idx % n_buffers
+            if buffers[buf_idx].shape[0] < batch_size:
+                buffers[buf_idx] = np.empty((batch_size,) + dataset.shape[1:], dtype=dataset.dtype)
+            out = buffers[buf_idx][:batch_size]
+            np.take(dataset, index_ring.indices(curr_sample, batch_size), axis=0, out=out)
+            yield out
+        curr_sample = (curr_sample + batch_size) % dataset_size
+        iter_idx += 1
+
+
+def _prefetched(generator):
+    """
+    Runs the ``generator`` in a background thread, keeping the next item ready in advance.
+    """
+    items = queue.Queue(maxsize=1)
+    end = object()
+
+    def produce():
+        try:
+            for item in generator:
+                items.put(item)
+        except Exception as e:
+            items.put(e)
+        items.put(end)
+
+    threading.Thread(target=produce, daemon=True).start()
+    while True:
+        item = items.get()
+        if item is end:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+
+def ring_batcher(dataset, batch_size_provider, n_iterations=-1, prefetch=False):
+    """
+    Allocation-free equivalent of ``batcher``.
+
+    Batches, which don't wrap around the dataset, are views into the ``dataset``. The ones
+    that do wrap, are gathered into output buffers, which are reused in a round-robin manner.
+    Therefore, a yielded batch is valid only until the next one is requested.
+
+    :param prefetch: If True, the next batch is assembled in a background thread, while the
+                     current one is being used.
+    For the description of the remaining parameters refer to ``batcher``.
+    :return: Yields batches
+    """
+    # With prefetching, one batch is held by the caller, one waits in the queue
+    # and one is being assembled
+    n_buffers = 3 if prefetch else 1
+    batches = _ring_batches(dataset, batch_size_provider, n_iterations, n_buffers)
+    return _prefetched(batches) if prefetch else batches
@@ -0,0 +1,81 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import numpy as np
+from typing import Sequence
+
+
+def _batch_layout(arrays):
+  assert len(arrays) > 0, "Cannot create a batch from an empty list"
+  inner_shape = arrays[0].shape[1:]
+  dtype = arrays[0].dtype
+  for arr in arrays:
+    assert arr.shape[1:] == inner_shape, \
+      "Arrays may differ only in the outermost dimension. Expected: (*, {}), got: {}" \
+      .format(', '.join(map(str, inner_shape)), arr.shape)
+    assert arr.dtype == dtype, "Arrays must have the same type"
+  lengths = np.array([arr.shape[0] for arr in arrays], dtype=np.int64)
+  shape = (len(arrays), int(lengths.max())) + inner_shape
+  return shape, dtype, lengths
+
+
+def _fill(out, arrays, lengths, pad_value):
+  for i, (arr, length) in enumerate(zip(arrays, lengths)):
+    out[i, :length] = arr
+    out[i, length:] = pad_value
+
+
+def pad_batch(arrays: Sequence[np.ndarray], pad_value=0):
+  """
+  Convert list of ndarrays to single ndarray with ndims+=1. The arrays are padded with
+  ``pad_value`` along the outermost dimension to the length of the longest one.
+
+  The output is allocated once and filled in place.
+  :return: Tuple of the batch and the lengths of the samples before padding.
+  """
+  shape, dtype, lengths = _batch_layout(arrays)
+  out = np.empty(shape, dtype=dtype)
+  _fill(out, arrays, lengths, pad_value)
+  return out, lengths
+
+
+
+class BatchBuilder:
+  """
+  Same as ``pad_batch``, but keeps the output memory between the calls and reuses it, whenever
+  the new batch fits in it.
+
+  The returned batch is a view of the internal buffer - it's valid only until the next call.
+  """
+  def __init__(self, pad_value=0):
+    self.pad_value = pad_value
+    self._buffer = np.empty(0, dtype=np.uint8)
+
+  def __call__(self, arrays: Sequence[np.ndarray]):
+    shape, dtype, lengths = _batch_layout(arrays)
+    nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    if nbytes > self._buffer.nbytes:
+      self._buffer = np.empty(nbytes, dtype=np.uint8)
+    # Flat storage keeps the view contiguous regardless of the previous batch shape
+    out = self._buffer[:nbytes].view(dtype).reshape(shape)
+    _fill(out, arrays, lengths, self.pad_value)
+    return out, lengths
@@ -21,13 +21,19 @@
 # SOFTWARE.
 
 
-import tritonclient.grpc as t_client
 import numpy as np
+import hashlib
+from collections import OrderedDict
+from dali_backend.test_utils.client_pool import ClientPool, ROUND_ROBIN
+from dali_backend.test_utils.perf import PerfRecorder, now_ns
+from dali_backend.test_utils.shm import SystemShmIO
 from typing import Sequence
 from itertools import cycle, islice
 from numpy.random import randint
 import argparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future, as_completed, wait, \
+  FIRST_COMPLETED
 
 # TODO: Extend
 def type_to_string(dtype):
@@ -54,18 +60,164 @@ def grouper(n, iterable):
         yield chunk
 
 
+def content_hash(arrays):
+  """
+  Hash of the contents, shapes and types of given arrays.
+  """
+  h = hashlib.blake2b(digest_size=16)
+  for arr in arrays:
+    arr = np.ascontiguousarray(arr)
+    h.update(arr.dtype.str.encode())
+    h.update(str(arr.shape).encode())
+    h.update(memoryview(arr).cast('B'))
+  return h.digest()
+
+
+class ReferenceCache:
+  """
+  LRU cache of the reference outputs, keyed by the content hash of the inputs.
+  Least recently used entries are evicted, when the total size of the cached outputs
+  exceeds `max_bytes`.
+  """
+  def __init__(self, max_bytes):
+    self.max_bytes = max_bytes
+    self.nbytes = 0
+    self.hits = 0
+    self.misses = 0
+    self._entries = OrderedDict()
+
+  def get(self, key):
+    if key not in self._entries:
+      self.misses += 1
+      return None
+    self._entries.move_to_end(key)
+    self.hits += 1
+    return self._entries[key][0]
+
+  def put(self, key, ref):
+    if key in self._entries:
+      return
+    ref_bytes = sum(np.asarray(r).nbytes for r in ref)
+    if ref_bytes > self.max_bytes:
+      return
+    while self.nbytes + ref_bytes > self.max_bytes:
+      _, (_, evicted_bytes) = self._entries.popitem(last=False)
+      self.nbytes -= evicted_bytes
+    self._entries[key] = (ref, ref_bytes)
+    self.nbytes += ref_bytes
+
+
+_worker_ref_func = None
+
+
+def _init_reference_worker(ref_func, is_factory):
+  global _worker_ref_func
+  _worker_ref_func = ref_func() if is_factory else ref_func
+
+
+def _compute_reference(*data):
+  return tuple(_worker_ref_func(*data))
+
+
+class ReferenceProvider:
+  """
+  Provides the reference outputs for the test inputs.
+
+  Without workers, the reference is computed on demand, in the calling thread.
+  With `workers > 0`, the reference computation is scheduled in a process pool as soon as
+  the input is sent to the server, so that it overlaps with the inference.
+
+  :param compare_to: Function computing the reference outputs. Must be picklable, if it's
+                     to be run in the worker processes and `factory` is not provided.
+  :param cache_bytes: Size of the reference cache. 0 disables the cache.
+  :param workers: Number of worker processes.
+  :param factory: Picklable callable, that creates the reference function. It's called once in
+                  each worker process. Use it, when the reference function can't be pickled
+                  (e.g. it owns a DALI pipeline).
+  """
+  def __init__(self, compare_to, cache_bytes=0, workers=0, factory=None):
+    self.compare_to = compare_to
+    self.cache = ReferenceCache(cache_bytes) if cache_bytes > 0 else None
+    self.executor = None
+    if workers > 0:
+      self.executor = ProcessPoolExecutor(
+        max_workers=workers, mp_context=mp.get_context('spawn'),
+        initializer=_init_reference_worker,
+        initargs=(factory, True) if factory is not None else (compare_to, False))
+    self._scheduled = {}  # iteration -> (cache key, future)
+    self._in_progress = {}  # cache key -> future, deduplicates the computations of equal inputs
+
+  def schedule(self, indexed_data):
+    """
+    Passes through `(it, data)` pairs and schedules the reference computation for each of them.
+    """
+    for it, data in indexed_data:
+      if self.executor is not None:
+        self._scheduled[it] = self._submit(data)
+      yield it, data
+
+  def _submit(self, data):
+    key = None
+    if self.cache is not None:
+      key = content_hash(data)
+      ref = self.cache.get(key)
+      if ref is not None:
+        future = Future()
+        future.set_result(ref)
+        return key, future
+      if key in self._in_progress:
+        return key, self._in_progress[key]
+    future = self.executor.submit(_compute_reference, *data)
+    if key is not None:
+      self._in_progress[key] = future
+    return key, future
+
+  def get(self, it, data):
+    if self.executor is None:
+      return self._compute(data)
+    key, future = self._scheduled.pop(it)
+    ref = future.result()
+    if key is not None:
+      self._in_progress.pop(key, None)
+      self.cache.put(key, ref)
+    return ref
+
+  def _compute(self, data):
+    if self.cache is None:
+      return self.compare_to(*data)
+    key = content_hash(data)
+    ref = self.cache.get(key)
+    if ref is None:
+      ref = tuple(self.compare_to(*data))
+      self.cache.put(key, ref)
+    return ref
+
+  def close(self):
+    if self.executor is not None:
+      self.executor.shutdown(wait=True, cancel_futures=True)
+      self.executor = None
+
+
 class TestClient:
   def __init__(self, model_name: str, input_names: Sequence[str], output_names: Sequence[str],
-               url, concurrency=1, verbose=False):
-    self.client = t_client.InferenceServerClient(url=url, verbose=verbose)
+               url, concurrency=1, verbose=False, shared_memory=False, n_channels=1,
+               protocol='grpc', channel_policy=ROUND_ROBIN):
+    # Requests are spread over `n_channels` connections, see ClientPool
+    self.client = ClientPool(url, n_channels, protocol, channel_policy, verbose=verbose,
+                             concurrency=concurrency)
+    self.client_module = self.client.client_module
     self.input_names = input_names
     self.output_names = output_names
     self.concurrency = concurrency
     self.model_name = model_name
+    # Pass the data through the system shared memory instead of the request/response messages
+    self.shm_io = SystemShmIO(self.client, model_name, input_names, output_names,
+                              n_slots=concurrency, client_module=self.client_module) \
+                  if shared_memory else None
+    self.perf = PerfRecorder()
 
-  @staticmethod
-  def _get_input(batch, name):
-    inp = t_client.InferInput(name, list(batch.shape), type_to_string(batch.dtype))
+  def _get_input(self, batch, name):
+    inp = self.client_module.InferInput(name, list(batch.shape), type_to_string(batch.dtype))
     inp.set_data_from_numpy(batch)
     return inp
 
@@ -74,29 +226,100 @@ class TestClient:
     if (len(data) > 1):
       for b in data:
         assert b.shape[0] == data[0].shape[0]
-    inputs = [self._get_input(batch, name) for batch, name in zip(data, self.input_names)]
-    outputs = [t_client.InferRequestedOutput(name) for name in self.output_names]
-    res = self.client.infer(model_name=self.model_name, inputs=inputs, outputs=outputs)
-    res_data = [res.as_numpy(name) for name in self.output_names]
+    send_ns = now_ns()
+    if self.shm_io is not None:
+      res_data = self.shm_io.infer(data)
+    else:
+      inputs = [self._get_input(batch, name) for batch, name in zip(data, self.input_names)]
+      outputs = [self.client_module.InferRequestedOutput(name) for name in self.output_names]
+      res = self.client.infer(model_name=self.model_name, inputs=inputs, outputs=outputs)
+      res_data = [res.as_numpy(name) for name in self.output_names]
+    recv_ns = now_ns()
+    self.perf.record(send_ns, recv_ns, int(data[0].shape[0]), sum(b.nbytes for b in data),
+                     sum(r.nbytes for r in res_data))
     return it, data, res_data
 
-  def run_tests(self, data, compare_to, n_infers=-1, eps=1e-7):
-    generator = data if n_infers < 1 else islice(cycle(data), n_infers)
-    for pack in grouper(self.concurrency, enumerate(generator)):
+  def _infer_grouped(self, indexed_data):
+    for pack in grouper(self.concurrency, indexed_data):
       with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
         results_f = [executor.submit(self.test_infer, data, it) for it, data in pack]
         for future in as_completed(results_f):
-          it, data, results = future.result()
-          ref = compare_to(*data)
-          assert(len(results) == len(ref))
-          for out_i, (out, ref_out) in enumerate(zip(results, ref)):
-            assert out.shape == ref_out.shape, "Expected: {}, Actual: {}".format(ref_out.shape, out.shape)
-            if not np.allclose(out, ref_out, atol=eps):
-              print("Test failure in iteration", it)
-              print("Output", out_i)
-              print("Expected:\n", ref_out)
-              print("Actual:\n", out)
-              print("Shape: ", ref_out.shape)
-              print("Mean err", (out - ref_out).mean())
-              assert False
-          print('PASS iteration:', it)
+          yield future.result()
+
+  def _infer_pipelined(self, indexed_data):
+    """
+    Keeps `concurrency` requests in flight at all times. A new request is submitted as soon as
+    any of the pending ones completes. Results are yielded in the order of completion.
+    """
+    indexed_data = iter(indexed_data)
+    in_flight = set()
+    with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+      def fill_window():
+        for it, data in islice(indexed_data, self.concurrency - len(in_flight)):
+          in_flight.add(executor.submit(self.test_infer, data, it))
+
+      fill_window()
+      while in_flight:
+        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+        # Refill before handing the results out, so the window stays full during validation
+        fill_window()
+        for future in done:
+          yield future.result()
+
+  @staticmethod
+  def _validate(it, results, ref, eps):
+    assert(len(results) == len(ref))
+    for out_i, (out, ref_out) in enumerate(zip(results, ref)):
+      assert out.shape == ref_out.shape, "Expected: {}, Actual: {}".format(ref_out.shape, out.shape)
+      if not np.allclose(out, ref_out, atol=eps):
+        print("Test failure in iteration", it)
+        print("Output", out_i)
+        print("Expected:\n", ref_out)
+        print("Actual:\n", out)
+        print("Shape: ", ref_out.shape)
+        print("Mean err", (out - ref_out).mean())
+        assert False
+
+  def run_tests(self, data, compare_to, n_infers=-1, eps=1e-7, pipelined=False,
+                ref_cache_bytes=0, ref_workers=0, ref_factory=None, report_path=None):
+    """
+    Run inference on the `data` and validate the results against `compare_to(*data)`.
+
+    By default, the requests are sent in groups of `concurrency` and the whole group is awaited
+    before the next one is sent. With `pipelined=True` exactly `concurrency` requests are kept
+    in flight and every result is validated as soon as it arrives.
+
+    With `ref_cache_bytes > 0` the reference outputs are cached (up to `ref_cache_bytes`),
+    so that `compare_to` is called only once per distinct input. Enable the cache only if
+    `compare_to` is a pure function of the input.
+
+    With `ref_workers > 0` the references are computed in a pool of worker processes, ahead of
+    time, overlapping with the inference. See `ReferenceProvider` for `ref_factory`.
+
+    If `report_path` is given, the latency and throughput of the requests, along with
+    the server-side statistics of the model, are reported at the end of the run and dumped
+    to a JSON or CSV file. The requests of the most recent run are recorded in `self.perf`
+    regardless.
+    """
+    refs = ReferenceProvider(compare_to, ref_cache_bytes, ref_workers, ref_factory)
+    generator = data if n_infers < 1 else islice(cycle(data), n_infers)
+    infer = self._infer_pipelined if pipelined else self._infer_grouped
+    # The server-side statistics are queried only for the report
+    self.perf = PerfRecorder(self.client if report_path is not None else None, self.model_name)
+    self.perf.start()
+    try:
+      for it, data, results in infer(refs.schedule(enumerate(generator))):
+        ref = refs.get(it, data)
+        self._validate(it, results, ref, eps)
+        print('PASS iteration:', it)
+    finally:
+      refs.close()
+    if report_path is not None:
+      self.perf.stop()
+      self.perf.report()
+      self.perf.dump(report_path)
+
+  def close(self):
+    if self.shm_io is not None:
+      self.shm_io.close()
+    self.client.close()
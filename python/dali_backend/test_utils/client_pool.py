@@ -0,0 +1,164 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+
+
+ROUND_ROBIN = 'round_robin'
+LEAST_OUTSTANDING = 'least_outstanding'
+
+
+def client_module(protocol):
+  """
+  Returns ``tritonclient.grpc`` or ``tritonclient.http`` module, according to the ``protocol``.
+  """
+  if protocol == 'grpc':
+    import tritonclient.grpc
+    return tritonclient.grpc
+  elif protocol == 'http':
+    import tritonclient.http
+    return tritonclient.http
+  raise ValueError("Unknown protocol: {}. Expected 'grpc' or 'http'".format(protocol))
+
+
+def _create_client(module, url, verbose, protocol, concurrency, own_connection):
+  if protocol == 'grpc':
+    if not own_connection:
+      return module.InferenceServerClient(url=url, verbose=verbose)
+    # gRPC shares the connections between the channels with the same arguments by default.
+    # The local subchannel pool makes every client open its own connection. The custom
+    # arguments replace the default ones, so the message size limits are repeated.
+    channel_args = [
+      ('grpc.max_send_message_length', module.MAX_GRPC_MESSAGE_SIZE),
+      ('grpc.max_receive_message_length', module.MAX_GRPC_MESSAGE_SIZE),
+      ('grpc.use_local_subchannel_pool', 1),
+    ]
+    return module.InferenceServerClient(url=url, verbose=verbose, channel_args=channel_args)
+  return module.InferenceServerClient(url=url, verbose=verbose, concurrency=concurrency)
+
+
+class ClientPool:
+  """
+  Spreads the inference requests over ``n_channels`` independent connections to the server.
+  A single connection (and, in case of gRPC, a single HTTP/2 stream multiplexer) becomes
+  a bottleneck when many large requests are in flight at once.
+
+  The pool can be used in place of ``InferenceServerClient``: ``infer`` and ``async_infer``
+  are dispatched to one of the channels, every other call (e.g. model config, statistics,
+  shared memory registration) goes to the first channel.
+
+  :param url: Inference server URL.
+  :param n_channels: Number of connections.
+  :param protocol: ``grpc`` or ``http``.
+  :param policy: How the channel for a request is selected: ``round_robin`` or
+                 ``least_outstanding`` (the one with the fewest requests in flight).
+  :param concurrency: Number of connections of every HTTP client. Unused with gRPC.
+  """
+  def __init__(self, url, n_channels=1, protocol='grpc', policy=ROUND_ROBIN, verbose=False,
+               concurrency=1):
+    assert n_channels > 0, "At least one channel is required"
+    assert policy in (ROUND_ROBIN, LEAST_OUTSTANDING), "Unknown policy: {}".format(policy)
+    self.protocol = protocol
+    self.client_module = client_module(protocol)
+    self.policy = policy
+    self.clients = [_create_client(self.client_module, url, verbose, protocol, concurrency,
+                                   n_channels > 1)
+                    for _ in range(n_channels)]
+    self._outstanding = [0] * n_channels
+    self._counter = count()
+    self._lock = threading.Lock()
+    # HTTP async_infer returns a handle instead of calling back - wait for it in a thread
+    self._waiter = ThreadPoolExecutor() if protocol == 'http' else None
+
+  def __getattr__(self, name):
+    if name == 'clients':
+      raise AttributeError(name)
+    return getattr(self.clients[0], name)
+
+  def outstanding(self):
+    with self._lock:
+      return list(self._outstanding)
+
+  def _acquire(self):
+    with self._lock:
+      if self.policy == ROUND_ROBIN:
+        idx = next(self._counter) % len(self.clients)
+      else:
+        idx = min(range(len(self.clients)), key=self._outstanding.__getitem__)
+      self._outstanding[idx] += 1
+    return idx
+
+  def _release(self, idx):
+    with self._lock:
+      self._outstanding[idx] -= 1
+
+  def infer(self, *args, **kwargs):
+    idx = self._acquire()
+    try:
+      return self.clients[idx].infer(*args, **kwargs)
+    finally:
+      self._release(idx)
+
+  def async_infer(self, model_name, inputs, callback, **kwargs):
+    """
+    Same as ``tritonclient.grpc.InferenceServerClient.async_infer``, regardless of the protocol:
+    ``callback(result, error)`` is called when the request completes.
+    """
+    idx = self._acquire()
+
+    def on_done(result, error):
+      self._release(idx)
+      callback(result, error)
+
+    try:
+      if self._waiter is None:
+        self.clients[idx].async_infer(model_name=model_name, inputs=inputs, callback=on_done,
+                                      **kwargs)
+        return
+      request = self.clients[idx].async_infer(model_name=model_name, inputs=inputs, **kwargs)
+    except Exception:
+      self._release(idx)
+      raise
+
+    def wait_for_result():
+      try:
+        result = request.get_result()
+      except Exception as e:
+        on_done(None, e)
+        return
+      on_done(result, None)
+
+    self._waiter.submit(wait_for_result)
+
+  def close(self):
+    if self._waiter is not None:
+      self._waiter.shutdown(wait=True)
+    for client in self.clients:
+      client.close()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.close()
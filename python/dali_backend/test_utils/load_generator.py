@@ -0,0 +1,234 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import threading
+import time
+import numpy as np
+import tritonclient.grpc
+from itertools import islice
+from numpy.random import default_rng
+from typing import Callable, Sequence
+from dali_backend.test_utils.perf import PerfRecorder, now_ns
+from tritonclient.utils import np_to_triton_dtype
+
+
+def fixed_arrivals(rate):
+  """
+  Generator of inter-arrival times (in seconds) of requests issued at a constant ``rate``
+  (requests per second).
+  """
+  while True:
+    yield 1. / rate
+
+
+def poisson_arrivals(rate, seed=None):
+  """
+  Generator of inter-arrival times (in seconds) of a Poisson process with a given ``rate``.
+  """
+  rng = default_rng(seed)
+  while True:
+    yield rng.exponential(1. / rate)
+
+
+def trace_arrivals(timestamps: Sequence[float], speedup=1.):
+  """
+  Generator of inter-arrival times (in seconds), that replays the arrival ``timestamps``
+  (in seconds) recorded from real traffic. ``speedup`` scales the offered load.
+  """
+  timestamps = np.sort(np.asarray(timestamps, dtype=np.float64))
+  yield 0.
+  for gap in np.diff(timestamps):
+    yield gap / speedup
+
+
+def scaled_trace_arrivals(timestamps: Sequence[float]):
+  """
+  Arrival factory for ``OpenLoopGenerator.sweep``, which replays the arrival ``timestamps``
+  sped up or slowed down to the requested rate (requests per second).
+  """
+  timestamps = np.sort(np.asarray(timestamps, dtype=np.float64))
+  assert len(timestamps) > 1 and timestamps[-1] > timestamps[0], \
+    "The trace must span a positive period of time"
+  trace_rate = (len(timestamps) - 1) / (timestamps[-1] - timestamps[0])
+  return lambda rate: trace_arrivals(timestamps, speedup=rate / trace_rate)
+
+
+def load_trace(path):
+  """
+  Reads the arrival timestamps (in seconds) from a text file, one per line.
+  """
+  return np.loadtxt(path, dtype=np.float64, ndmin=1)
+
+
+def batch_size_sampler(batch_sizes, seed=None):
+  """
+  Generator of batch sizes of the consecutive requests.
+
+  :param batch_sizes: Distribution of the batch size:
+                      * If the argument is a scalar, every batch will have the same size.
+                      * If a dict, it maps batch sizes to their (relative) probabilities.
+                      * If a callable, every batch size will be determined by calling it.
+  """
+  if isinstance(batch_sizes, int):
+    while True:
+      yield batch_sizes
+  elif isinstance(batch_sizes, dict):
+    rng = default_rng(seed)
+    sizes = np.array(list(batch_sizes.keys()))
+    probs = np.array(list(batch_sizes.values()), dtype=np.float64)
+    probs /= probs.sum()
+    while True:
+      yield int(rng.choice(sizes, p=probs))
+  elif callable(batch_sizes):
+    while True:
+      yield batch_sizes()
+  else:
+    raise TypeError("Incorrect batch_sizes type. Actual: ", type(batch_sizes))
+
+
+class OpenLoopGenerator:
+  """
+  Open-loop load generator. Requests are issued at the times dictated by the arrival process,
+  regardless of how many of them are still being processed, so that the queueing in the server
+  is not hidden by the client waiting for the responses.
+
+  The latency of every request is measured from its scheduled arrival time. When the generator
+  falls behind the schedule, the lag is accounted for in the latency.
+
+  :param client: ``InferenceServerClient`` supporting ``async_infer`` with a callback.
+  :param data_provider: Callable, which takes a batch size and returns a list of arrays
+                        (one per input) with this batch size.
+  """
+  def __init__(self, client, model_name: str, input_names: Sequence[str],
+               output_names: Sequence[str], data_provider: Callable,
+               client_module=tritonclient.grpc):
+    self.client = client
+    self.model_name = model_name
+    self.input_names = input_names
+    self.output_names = output_names
+    self.data_provider = data_provider
+    self.client_module = client_module
+    self._inputs = {}
+
+  def _get_inputs(self, batch_size):
+    # Inputs are serialized when the request is issued, so they can be reused between requests
+    if batch_size not in self._inputs:
+      inputs = []
+      for batch, name in zip(self.data_provider(batch_size), self.input_names):
+        inp = self.client_module.InferInput(name, list(batch.shape),
+                                            np_to_triton_dtype(batch.dtype))
+        inp.set_data_from_numpy(batch)
+        inputs.append((inp, batch.nbytes))
+      self._inputs[batch_size] = inputs
+    return self._inputs[batch_size]
+
+  def run(self, arrivals, batch_sizes=1, duration_s=None, n_requests=None, drain_timeout_s=60.):
+    """
+    Issue the requests according to the ``arrivals`` process, until ``duration_s`` elapses or
+    ``n_requests`` are issued.
+
+    :param arrivals: Iterable of inter-arrival times in seconds, e.g. ``poisson_arrivals(100)``.
+    :param batch_sizes: Batch size distribution, see ``batch_size_sampler``.
+    :return: Summary of the run (see ``PerfRecorder.summary``), extended with the offered load
+             and the number of failed requests.
+    """
+    assert duration_s is not None or n_requests is not None, \
+      "Either the duration or the number of requests must be provided"
+    perf = PerfRecorder()
+    outputs = [self.client_module.InferRequestedOutput(name) for name in self.output_names]
+    cv = threading.Condition()
+    state = {'outstanding': 0, 'failed': 0}
+
+    def callback(scheduled_ns, batch_size, input_bytes, result, error):
+      recv_ns = now_ns()
+      with cv:
+        if error is not None:
+          state['failed'] += 1
+        else:
+          perf.record(scheduled_ns, recv_ns, batch_size, input_bytes, 0)
+        state['outstanding'] -= 1
+        cv.notify_all()
+
+    arrivals = iter(arrivals)
+    if n_requests is not None:
+      arrivals = islice(arrivals, n_requests)
+    batch_sizes = batch_size_sampler(batch_sizes)
+    start_ns = now_ns()
+    end_ns = start_ns + int(duration_s * 1e9) if duration_s is not None else None
+    scheduled_ns = start_ns
+    n_sent = 0
+    for gap, batch_size in zip(arrivals, batch_sizes):
+      scheduled_ns += int(gap * 1e9)
+      if end_ns is not None and scheduled_ns >= end_ns:
+        break
+      inputs = self._get_inputs(batch_size)
+      delay = (scheduled_ns - now_ns()) / 1e9
+      if delay > 0:
+        time.sleep(delay)
+      with cv:
+        state['outstanding'] += 1
+      input_bytes = sum(nbytes for _, nbytes in inputs)
+      self.client.async_infer(
+        model_name=self.model_name, inputs=[inp for inp, _ in inputs], outputs=outputs,
+        callback=lambda result, error, s=scheduled_ns, b=batch_size, n=input_bytes:
+          callback(s, b, n, result, error))
+      n_sent += 1
+    last_scheduled_ns = scheduled_ns
+
+    with cv:
+      cv.wait_for(lambda: state['outstanding'] == 0, timeout=drain_timeout_s)
+      timed_out = state['outstanding']
+    summary = perf.summary()
+    offered_s = max((last_scheduled_ns - start_ns) / 1e9, 1e-9)
+    summary['offered_requests_per_s'] = n_sent / offered_s
+    summary['failed'] = state['failed']
+    summary['timed_out'] = timed_out
+    return summary
+
+  def sweep(self, rates: Sequence[float], arrival=poisson_arrivals, batch_sizes=1,
+            duration_s=10., report_path=None):
+    """
+    Runs the generator for each of the offered ``rates`` (requests per second) and collects
+    the tail latency versus the offered load.
+    :param arrival: Function creating the arrival process for a given rate, e.g.
+                    ``poisson_arrivals``, ``fixed_arrivals`` or ``scaled_trace_arrivals(ts)``.
+    :param report_path: If provided, the results are dumped there as JSON.
+    :return: List of the run summaries, one per rate.
+    """
+    if arrival is trace_arrivals:
+      raise TypeError("trace_arrivals takes the timestamps, not a rate. "
+                      "Use scaled_trace_arrivals(timestamps) instead.")
+    results = []
+    for rate in rates:
+      summary = self.run(arrival(rate), batch_sizes, duration_s=duration_s)
+      summary['rate'] = rate
+      results.append(summary)
+      lat = summary.get('latency_ms', {})
+      print('Offered: {:.2f} req/s, achieved: {:.2f} req/s, p50: {:.3f} ms, p99: {:.3f} ms, '
+            'failed: {}'.format(summary['offered_requests_per_s'],
+                                summary.get('requests_per_s', 0.), lat.get('p50', float('nan')),
+                                lat.get('p99', float('nan')), summary['failed']))
+    if report_path is not None:
+      with open(report_path, 'w') as f:
+        json.dump(results, f, indent=2)
+    return results
@@ -0,0 +1,92 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import re
+import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Sequence
+
+
+def load_sample(path: str, mmap=False):
+  """
+  Loads a file as an encoded (e.g. JPEG, MP4) 1D array of bytes.
+  This is a typical input format for the DALI backend.
+
+  :param mmap: If True, the file is memory-mapped instead of being read into memory.
+  """
+  if mmap:
+    return np.memmap(path, dtype=np.uint8, mode='r')
+  return np.fromfile(path, dtype=np.uint8)
+
+
+def list_samples(path: str, name_pattern='.', max_samples=-1, exclude: Sequence[str] = ()):
+  """
+  Lists the files (not directories) in a given directory. Optionally applies the regex pattern to
+  the file names and uses only the files, that match the pattern.
+  If ``path`` points to a file, returns only this file.
+
+  :param max_samples: Maximum number of returned paths. -1 means no limit.
+  :param exclude: File names, that shall be skipped.
+  """
+  assert max_samples > 0 or max_samples == -1
+  if os.path.isfile(path):
+    return [path]
+  paths = [os.path.join(path, f) for f in os.listdir(path)
+           if f not in exclude and re.search(name_pattern, f) is not None and
+           os.path.isfile(os.path.join(path, f))]
+  if 0 < max_samples < len(paths):
+    paths = paths[:max_samples]
+  return paths
+
+
+def iter_samples(paths: Iterable[str], num_workers=None, prefetch=64, mmap=False):
+  """
+  Generator, that loads the files from ``paths`` in a thread pool and yields them in order.
+  At most ``prefetch`` samples are read ahead, so that the whole data set never needs to be
+  held in memory at once.
+  """
+  paths = iter(paths)
+  pending = deque()
+  with ThreadPoolExecutor(max_workers=num_workers) as executor:
+    def schedule(n):
+      for path in paths:
+        pending.append(executor.submit(load_sample, path, mmap))
+        n -= 1
+        if n == 0:
+          return
+
+    schedule(max(prefetch, 1))
+    while pending:
+      sample = pending.popleft().result()
+      schedule(1)
+      yield sample
+
+
+def load_samples(path: str, name_pattern='.', max_samples=-1, num_workers=None, mmap=False):
+  """
+  Loads all files in a given directory (see ``list_samples``) in parallel.
+  :return: List of encoded samples.
+  """
+  return list(iter_samples(list_samples(path, name_pattern, max_samples),
+                           num_workers=num_workers, mmap=mmap))
@@ -0,0 +1,175 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import csv
+import json
+import threading
+import time
+import numpy as np
+from collections import namedtuple
+
+
+RequestRecord = namedtuple('RequestRecord',
+                           ['send_ns', 'recv_ns', 'batch_size', 'input_bytes', 'output_bytes'])
+
+SERVER_STAT_STAGES = ['success', 'fail', 'queue', 'compute_input', 'compute_infer',
+                      'compute_output']
+
+PERCENTILES = [50, 90, 99]
+
+
+def now_ns():
+  return time.monotonic_ns()
+
+
+def _stats_json(client, model_name):
+  try:
+    return client.get_inference_statistics(model_name=model_name, as_json=True)
+  except TypeError:
+    return client.get_inference_statistics(model_name=model_name)
+
+
+def _sum_inference_stats(stats_json):
+  """
+  Sums ``count`` and ``ns`` of every inference stage over all versions of the model.
+  """
+  ret = {stage: {'count': 0, 'ns': 0} for stage in SERVER_STAT_STAGES}
+  for model_stats in stats_json.get('model_stats', []):
+    inference_stats = model_stats.get('inference_stats', {})
+    for stage in SERVER_STAT_STAGES:
+      stage_stats = inference_stats.get(stage, {})
+      ret[stage]['count'] += int(stage_stats.get('count', 0))
+      ret[stage]['ns'] += int(stage_stats.get('ns', 0))
+  return ret
+
+
+def latency_summary(latencies_ns):
+  """
+  Latency statistics (in milliseconds) of given latencies (in nanoseconds).
+  """
+  if len(latencies_ns) == 0:
+    return {}
+  lat_ms = np.asarray(latencies_ns, dtype=np.float64) / 1e6
+  ret = {'p{}'.format(p): float(v) for p, v in zip(PERCENTILES, np.percentile(lat_ms, PERCENTILES))}
+  ret['mean'] = float(lat_ms.mean())
+  ret['max'] = float(lat_ms.max())
+  return ret
+
+
+class PerfRecorder:
+  """
+  Collects per-request timings and payload sizes and, optionally, server-side statistics
+  of the model, so that the server-side queue and compute time can be told apart from
+  the client overhead.
+  """
+  def __init__(self, client=None, model_name=None):
+    self.client = client
+    self.model_name = model_name
+    self.records = []
+    self._lock = threading.Lock()
+    self._server_before = None
+    self._server_after = None
+
+  def start(self):
+    self.records = []
+    if self.client is not None:
+      self._server_before = _sum_inference_stats(_stats_json(self.client, self.model_name))
+
+  def stop(self):
+    if self.client is not None:
+      self._server_after = _sum_inference_stats(_stats_json(self.client, self.model_name))
+
+  def record(self, send_ns, recv_ns, batch_size, input_bytes, output_bytes):
+    with self._lock:
+      self.records.append(RequestRecord(send_ns, recv_ns, batch_size, input_bytes, output_bytes))
+
+  def server_summary(self):
+    """
+    Average time (in milliseconds) of each server-side stage, per request, during the run.
+    """
+    if self._server_before is None or self._server_after is None:
+      return {}
+    ret = {}
+    for stage in SERVER_STAT_STAGES:
+      count = self._server_after[stage]['count'] - self._server_before[stage]['count']
+      ns = self._server_after[stage]['ns'] - self._server_before[stage]['ns']
+      ret[stage] = {'count': count, 'avg_ms': ns / count / 1e6 if count > 0 else 0.0}
+    return ret
+
+  def summary(self):
+    if len(self.records) == 0:
+      return {'requests': 0}
+    send = np.array([r.send_ns for r in self.records], dtype=np.int64)
+    recv = np.array([r.recv_ns for r in self.records], dtype=np.int64)
+    duration_s = max((recv.max() - send.min()) / 1e9, 1e-9)
+    n_samples = sum(r.batch_size for r in self.records)
+    ret = {
+      'requests': len(self.records),
+      'samples': n_samples,
+      'duration_s': float(duration_s),
+      'requests_per_s': len(self.records) / duration_s,
+      'samples_per_s': n_samples / duration_s,
+      'input_bytes': sum(r.input_bytes for r in self.records),
+      'output_bytes': sum(r.output_bytes for r in self.records),
+      'latency_ms': latency_summary(recv - send),
+    }
+    server = self.server_summary()
+    if server:
+      ret['server'] = server
+      # Client overhead = end-to-end latency not accounted for by the server
+      server_ms = sum(server[stage]['avg_ms'] for stage in
+                      ['queue', 'compute_input', 'compute_infer', 'compute_output'])
+      ret['client_overhead_ms'] = ret['latency_ms']['mean'] - server_ms
+    return ret
+
+  def report(self):
+    s = self.summary()
+    if s['requests'] == 0:
+      print('No requests recorded')
+      return
+    lat = s['latency_ms']
+    print('Requests: {}, samples: {}, duration: {:.3f} s'.format(s['requests'], s['samples'],
+                                                                 s['duration_s']))
+    print('Throughput: {:.2f} requests/s, {:.2f} samples/s'.format(s['requests_per_s'],
+                                                                   s['samples_per_s']))
+    print('Latency [ms]: ' + ', '.join('{}: {:.3f}'.format(k, v) for k, v in lat.items()))
+    if 'server' in s:
+      print('Server avg [ms]: ' + ', '.join('{}: {:.3f}'.format(stage, v['avg_ms'])
+                                            for stage, v in s['server'].items()
+                                            if stage not in ('success', 'fail')))
+      print('Client overhead [ms]: {:.3f}'.format(s['client_overhead_ms']))
+
+  def dump(self, path):
+    """
+    Dumps the report to a file. CSV files get a row per request,
+    any other get the summary and all the records as JSON.
+    """
+    if path.endswith('.csv'):
+      with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(RequestRecord._fields + ('latency_ns',))
+        for r in self.records:
+          writer.writerow(tuple(r) + (r.recv_ns - r.send_ns,))
+    else:
+      with open(path, 'w') as f:
+        json.dump({'summary': self.summary(), 'records': [r._asdict() for r in self.records]},
+                  f, indent=2)
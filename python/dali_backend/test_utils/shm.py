@@ -0,0 +1,241 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import queue
+import re
+import threading
+import numpy as np
+import tritonclient.grpc
+import tritonclient.utils.shared_memory as shm
+from tritonclient.utils import InferenceServerException, np_to_triton_dtype, triton_to_np_dtype
+from typing import Sequence
+
+
+DEFAULT_REGION_SIZE = 16 * 1024 * 1024
+
+# Status of the error, that the server reports when an output doesn't fit in its region
+_INVALID_ARG_STATUSES = ('StatusCode.INVALID_ARGUMENT', '400')
+_OUTPUT_TOO_SMALL_RE = re.compile(r"shared memory size specified with the request for output "
+                                  r"'(?P<name>[^']+)' \(\d+ bytes\) should be at least "
+                                  r"(?P<size>\d+) bytes")
+
+
+def _config_dtype_size(config_type):
+  """
+  Converts model config data type (e.g. ``TYPE_UINT8``) to the element size in bytes.
+  """
+  dtype = triton_to_np_dtype(config_type[len('TYPE_'):])
+  return None if dtype is None else np.dtype(dtype).itemsize
+
+
+def _max_byte_size(io_config, max_batch_size):
+  """
+  Upper bound of the byte size of an input or output declared in the model config.
+  Returns None, if any of the dimensions is not known upfront.
+  """
+  dims = [int(d) for d in io_config.get('dims', [])]
+  elem_size = _config_dtype_size(io_config.get('data_type', ''))
+  if elem_size is None or any(d < 0 for d in dims):
+    return None
+  return max(max_batch_size, 1) * int(np.prod(dims)) * elem_size
+
+
+def _required_output_size(error):
+  """
+  Returns the name and the required byte size of the output, that didn't fit in its shared
+  memory region, or None if the ``error`` is not about a too small output region.
+  """
+  if error.status() not in _INVALID_ARG_STATUSES:
+    return None
+  match = _OUTPUT_TOO_SMALL_RE.search(error.message() or '')
+  if match is None:
+    return None
+  return match.group('name'), int(match.group('size'))
+
+
+def _output_meta(result, name):
+  """
+  Returns shape and datatype of an output, for both gRPC and HTTP results.
+  """
+  output = result.get_output(name)
+  if isinstance(output, dict):
+    return output['shape'], output['datatype']
+  return list(output.shape), output.datatype
+
+
+class SystemShmRegion:
+  """
+  System shared memory region registered in the server. The region is grown (i.e. recreated
+  and registered again) when it is too small to hold the requested amount of data.
+  """
+  def __init__(self, client, name: str, byte_size: int):
+    self.client = client
+    self.name = name
+    self.key = '/' + name
+    self.byte_size = 0
+    self.handle = None
+    self.ensure(byte_size)
+
+  def ensure(self, byte_size):
+    if byte_size <= self.byte_size:
+      return
+    # Grow geometrically to avoid re-registering the region on every slightly bigger batch
+    new_size = max(byte_size, 2 * self.byte_size)
+    self.destroy()
+    self.handle = shm.create_shared_memory_region(self.name, self.key, new_size)
+    self.client.register_system_shared_memory(self.name, self.key, new_size)
+    self.byte_size = new_size
+
+  def destroy(self):
+    if self.handle is None:
+      return
+    self.client.unregister_system_shared_memory(self.name)
+    shm.destroy_shared_memory_region(self.handle)
+    self.handle = None
+    self.byte_size = 0
+
+
+class SystemShmIO:
+  """
+  Passes inputs and outputs of the inference requests through reusable system shared memory
+  regions, instead of serializing them into the request and response messages.
+
+  Every concurrently running request uses its own set of regions (a slot). The slots are created
+  lazily, at most ``n_slots`` of them. The regions are initially sized according to the model
+  config and grown on demand.
+
+  :param client: ``InferenceServerClient`` used to register the regions and run the inference.
+  :param model_name: Name of the model.
+  :param input_names: Names of the model inputs.
+  :param output_names: Names of the requested outputs.
+  :param n_slots: Maximum number of concurrent requests.
+  :param client_module: ``tritonclient.grpc`` or ``tritonclient.http``, matching the ``client``.
+  :param default_byte_size: Initial size of the regions, which can't be sized from the config.
+  """
+  def __init__(self, client, model_name: str, input_names: Sequence[str],
+               output_names: Sequence[str], n_slots=1, client_module=tritonclient.grpc,
+               default_byte_size=DEFAULT_REGION_SIZE):
+    self.client = client
+    self.model_name = model_name
+    self.input_names = input_names
+    self.output_names = output_names
+    self.client_module = client_module
+    self._prefix = 'dali_backend_{}_{}'.format(os.getpid(), id(self))
+    self._n_slots = n_slots
+    self._slots = []
+    self._free_slots = queue.Queue()
+    self._lock = threading.Lock()
+    self._sizes = self._initial_sizes(default_byte_size)
+
+  def _initial_sizes(self, default_byte_size):
+    sizes = {name: default_byte_size for name in list(self.input_names) + list(self.output_names)}
+    try:
+      config = self.client.get_model_config(self.model_name, as_json=True)
+    except TypeError:
+      config = self.client.get_model_config(self.model_name)
+    config = config.get('config', config)
+    max_batch_size = int(config.get('max_batch_size', 0))
+    for io_config in config.get('input', []) + config.get('output', []):
+      if io_config['name'] in sizes:
+        size = _max_byte_size(io_config, max_batch_size)
+        if size is not None:
+          sizes[io_config['name']] = size
+    return sizes
+
+  def _create_slot(self):
+    slot_idx = len(self._slots)
+    slot = {name: SystemShmRegion(self.client, '{}_{}_{}'.format(self._prefix, slot_idx, name),
+                                  size)
+            for name, size in self._sizes.items()}
+    self._slots.append(slot)
+    return slot
+
+  def _acquire(self):
+    try:
+      return self._free_slots.get_nowait()
+    except queue.Empty:
+      pass
+    with self._lock:
+      if len(self._slots) < self._n_slots:
+        return self._create_slot()
+    return self._free_slots.get()
+
+  def _infer(self, slot, batches, **infer_kwargs):
+    inputs = []
+    for batch, name in zip(batches, self.input_names):
+      region = slot[name]
+      region.ensure(batch.nbytes)
+      shm.set_shared_memory_region(region.handle, [np.ascontiguousarray(batch)])
+      inp = self.client_module.InferInput(name, list(batch.shape), np_to_triton_dtype(batch.dtype))
+      inp.set_shared_memory(region.name, batch.nbytes)
+      inputs.append(inp)
+    # The server reports one too small output region at a time - each retry grows another one
+    for attempt in range(len(self.output_names) + 1):
+      outputs = []
+      for name in self.output_names:
+        out = self.client_module.InferRequestedOutput(name)
+        out.set_shared_memory(slot[name].name, slot[name].byte_size)
+        outputs.append(out)
+      try:
+        result = self.client.infer(model_name=self.model_name, inputs=inputs, outputs=outputs,
+                                   **infer_kwargs)
+        break
+      except InferenceServerException as e:
+        required = _required_output_size(e)
+        if required is None or required[0] not in slot or attempt == len(self.output_names):
+          raise
+        name, byte_size = required
+        slot[name].ensure(byte_size)
+    ret = []
+    for name in self.output_names:
+      shape, datatype = _output_meta(result, name)
+      # get_contents_as_numpy returns a view of the region - copy it, so that the slot can be
+      # reused (or regrown), while the caller still holds the outputs
+      contents = shm.get_contents_as_numpy(slot[name].handle, triton_to_np_dtype(datatype), shape)
+      ret.append(np.array(contents, copy=True))
+    return ret
+
+  def infer(self, batches, **infer_kwargs):
+    """
+    Run the inference on given ``batches`` (one per input) through the shared memory.
+    :return: List of outputs, as numpy arrays.
+    """
+    assert len(batches) == len(self.input_names)
+    slot = self._acquire()
+    try:
+      return self._infer(slot, batches, **infer_kwargs)
+    finally:
+      self._free_slots.put(slot)
+
+  def close(self):
+    for slot in self._slots:
+      for region in slot.values():
+        region.destroy()
+    self._slots = []
+    self._free_slots = queue.Queue()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.close()
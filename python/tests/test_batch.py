@@ -0,0 +1,63 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import numpy as np
+from dali_backend.test_utils.batch import BatchBuilder, pad_batch
+
+
+def check_batch(arrays, batch, lengths, pad_value):
+  np.testing.assert_array_equal(lengths, [arr.shape[0] for arr in arrays])
+  for arr, sample, length in zip(arrays, batch, lengths):
+    np.testing.assert_array_equal(sample[:length], arr)
+    assert (sample[length:] == pad_value).all()
+
+
+def test_pad_batch():
+  arrays = [np.full((n, 2), n, dtype=np.int16) for n in (3, 1, 4)]
+  batch, lengths = pad_batch(arrays, pad_value=-1)
+  assert batch.shape == (3, 4, 2)
+  assert batch.dtype == np.int16
+  check_batch(arrays, batch, lengths, -1)
+
+
+def test_batch_builder_reuses_buffer():
+  build = BatchBuilder(pad_value=7)
+  big = [np.arange(n, dtype=np.int32) for n in (5, 2, 8)]
+  batch, lengths = build(big)
+  assert batch.shape == (3, 8)
+  check_batch(big, batch, lengths, 7)
+  first = batch
+
+  # A smaller batch, even of another type and shape, lands in the same memory
+  small = [np.ones((n, 3), dtype=np.uint8) for n in (2, 1)]
+  batch, lengths = build(small)
+  assert batch.shape == (2, 2, 3)
+  assert batch.dtype == np.uint8
+  assert batch.flags.c_contiguous
+  assert np.shares_memory(batch, first)
+  check_batch(small, batch, lengths, 7)
+
+  # The buffer grows, when the batch doesn't fit
+  bigger = [np.arange(n, dtype=np.int64) for n in (10, 20)]
+  batch, lengths = build(bigger)
+  assert not np.shares_memory(batch, first)
+  check_batch(bigger, batch, lengths, 7)
@@ -0,0 +1,113 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import threading
+
+import numpy as np
+import pytest
+from dali_backend.test_utils import client as test_client
+
+
+class FakeResult:
+  def __init__(self, outputs):
+    self.outputs = outputs
+
+  def as_numpy(self, name):
+    return self.outputs[name]
+
+
+def input_data(inputs):
+  return np.frombuffer(inputs[0]._get_content(), dtype=np.int32).reshape(inputs[0].shape())
+
+
+def make_client(monkeypatch, concurrency=2, before_infer=None):
+  client = test_client.TestClient('model', ['INPUT'], ['OUTPUT'], 'localhost:8001',
+                                  concurrency=concurrency)
+
+  def infer(model_name, inputs, outputs):
+    data = input_data(inputs)
+    if before_infer is not None:
+      before_infer(data)
+    return FakeResult({'OUTPUT': data * 2})
+
+  def no_statistics(*args, **kwargs):
+    raise AssertionError('The server statistics must not be queried')
+
+  monkeypatch.setattr(client.client, 'infer', infer)
+  monkeypatch.setattr(client.client.clients[0], 'get_inference_statistics', no_statistics)
+  return client
+
+
+def test_run_tests_defaults(monkeypatch, capsys):
+  client = make_client(monkeypatch)
+  calls = []
+
+  def ref(x):
+    calls.append(x)
+    return [x * 2]
+
+  data = [[np.full((2, 3), 7, dtype=np.int32)]] * 4
+  client.run_tests(data, ref)
+  # Without the reference cache, the reference is computed for every request
+  assert len(calls) == 4
+  assert len(client.perf.records) == 4
+  assert 'Throughput' not in capsys.readouterr().out
+  client.close()
+
+
+def test_run_tests_pipelined(monkeypatch, capsys):
+  concurrency, n_infers = 3, 12
+  cond = threading.Condition()
+  state = {'in_flight': 0, 'max_in_flight': 0, 'started': 0}
+  overtaken = threading.Event()
+
+  def before_infer(data):
+    it = int(data.flat[0])
+    with cond:
+      state['in_flight'] += 1
+      state['started'] += 1
+      state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+      if it >= concurrency:
+        overtaken.set()
+      cond.notify_all()
+      # Let the window fill up, to see how many requests are in flight at once
+      cond.wait_for(lambda: state['in_flight'] == concurrency or state['started'] >= n_infers,
+                    timeout=10)
+    # The first request is slow - the window is refilled, while it's still in flight
+    if it == 0:
+      state['overtaken'] = overtaken.wait(timeout=10)
+    with cond:
+      state['in_flight'] -= 1
+      cond.notify_all()
+
+  client = make_client(monkeypatch, concurrency, before_infer)
+  data = [[np.full((2, 3), it, dtype=np.int32)] for it in range(n_infers)]
+  client.run_tests(data, lambda x: [x * 2], pipelined=True)
+  assert state['overtaken']
+  assert state['max_in_flight'] == concurrency
+  out = capsys.readouterr().out
+  # Every result is validated
+  for it in range(n_infers):
+    assert 'PASS iteration: {}\n'.format(it) in out
+  with pytest.raises(AssertionError):
+    client.run_tests(data[concurrency:], lambda x: [x * 3], pipelined=True)
+  client.close()
@@ -0,0 +1,146 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import threading
+import pytest
+from dali_backend.test_utils import client_pool
+from dali_backend.test_utils.client_pool import ClientPool, LEAST_OUTSTANDING, ROUND_ROBIN
+
+
+class FakeClient:
+  def __init__(self, idx):
+    self.idx = idx
+    self.calls = 0
+    self.callbacks = []
+    self.closed = False
+
+  def infer(self, **kwargs):
+    self.calls += 1
+    return self.idx
+
+  def async_infer(self, model_name, inputs, callback, **kwargs):
+    self.calls += 1
+    self.callbacks.append(callback)
+
+  def get_model_config(self, model_name):
+    return self.idx
+
+  def close(self):
+    self.closed = True
+
+
+@pytest.fixture
+def fake_clients(monkeypatch):
+  counter = iter(range(100))
+  monkeypatch.setattr(client_pool, '_create_client', lambda *args: FakeClient(next(counter)))
+
+
+def test_round_robin(fake_clients):
+  with ClientPool('localhost:8001', n_channels=3, policy=ROUND_ROBIN) as pool:
+    assert [pool.infer(model_name='m') for _ in range(7)] == [0, 1, 2, 0, 1, 2, 0]
+    # The calls other than the inference go to the first channel
+    assert pool.get_model_config('m') == 0
+    assert pool.outstanding() == [0, 0, 0]
+  assert all(client.closed for client in pool.clients)
+
+
+def test_least_outstanding(fake_clients):
+  pool = ClientPool('localhost:8001', n_channels=3, policy=LEAST_OUTSTANDING)
+  results = []
+  for _ in range(3):
+    pool.async_infer('m', [], lambda result, error: results.append(error))
+  # Every channel has a request in flight
+  assert pool.outstanding() == [1, 1, 1]
+  pool.clients[1].callbacks.pop()(None, None)
+  assert pool.outstanding() == [1, 0, 1]
+  pool.async_infer('m', [], lambda result, error: results.append(error))
+  assert [client.calls for client in pool.clients] == [1, 2, 1]
+  # The blocking inference goes to the least loaded channel as well
+  pool.clients[2].callbacks.pop()(None, None)
+  assert pool.infer(model_name='m') == 2
+  assert pool.outstanding() == [1, 1, 0]
+  assert results == [None, None]
+  pool.close()
+
+
+def test_release_on_error(fake_clients):
+  pool = ClientPool('localhost:8001', n_channels=2, policy=LEAST_OUTSTANDING)
+
+  def failing_infer(**kwargs):
+    raise RuntimeError('connection lost')
+
+  pool.clients[0].infer = failing_infer
+  with pytest.raises(RuntimeError):
+    pool.infer(model_name='m')
+  assert pool.outstanding() == [0, 0]
+  pool.close()
+
+
+def test_http_async_infer(fake_clients):
+  class Handle:
+    def __init__(self, result, error=None):
+      self.result, self.error = result, error
+
+    def get_result(self):
+      if self.error is not None:
+        raise self.error
+      return self.result
+
+  pool = ClientPool('localhost:8000', n_channels=2, protocol='http')
+  pool.clients[0].async_infer = lambda model_name, inputs, **kwargs: Handle('ok')
+  pool.clients[1].async_infer = lambda model_name, inputs, **kwargs: Handle(None, ValueError())
+  done = threading.Event()
+  results = []
+
+  def callback(result, error):
+    results.append((result, type(error)))
+    if len(results) == 2:
+      done.set()
+
+  pool.async_infer('m', [], callback)
+  pool.async_infer('m', [], callback)
+  assert done.wait(10)
+  assert sorted(results, key=str) == sorted([('ok', type(None)), (None, ValueError)], key=str)
+  assert pool.outstanding() == [0, 0]
+  pool.close()
+
+
+class FakeModule:
+  MAX_GRPC_MESSAGE_SIZE = 2**31 - 1
+
+  class InferenceServerClient:
+    def __init__(self, **kwargs):
+      self.kwargs = kwargs
+
+
+@pytest.mark.parametrize('n_channels', [1, 3])
+def test_grpc_channel_args(monkeypatch, n_channels):
+  monkeypatch.setattr(client_pool, 'client_module', lambda protocol: FakeModule)
+  pool = ClientPool('localhost:8001', n_channels=n_channels)
+  for client in pool.clients:
+    channel_args = client.kwargs.get('channel_args')
+    if n_channels == 1:
+      # A single channel keeps the default arguments of tritonclient
+      assert channel_args is None
+    else:
+      assert ('grpc.use_local_subchannel_pool', 1) in channel_args
+      assert ('grpc.max_send_message_length', FakeModule.MAX_GRPC_MESSAGE_SIZE) in channel_args
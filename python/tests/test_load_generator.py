@@ -0,0 +1,93 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import threading
+import numpy as np
+import pytest
+from itertools import islice
+from dali_backend.test_utils.load_generator import (OpenLoopGenerator, batch_size_sampler,
+                                                    fixed_arrivals, poisson_arrivals,
+                                                    scaled_trace_arrivals, trace_arrivals)
+
+
+def test_fixed_arrivals():
+  assert list(islice(fixed_arrivals(4), 3)) == [0.25] * 3
+
+
+def test_poisson_arrivals():
+  gaps = np.array(list(islice(poisson_arrivals(100, seed=42), 20000)))
+  assert (gaps >= 0).all()
+  assert gaps.mean() == pytest.approx(0.01, rel=0.05)
+  # Exponential distribution: the standard deviation equals the mean
+  assert gaps.std() == pytest.approx(0.01, rel=0.05)
+  assert list(islice(poisson_arrivals(100, seed=1), 5)) == \
+         list(islice(poisson_arrivals(100, seed=1), 5))
+
+
+def test_trace_arrivals():
+  timestamps = [3., 1., 1.5, 4.]
+  assert list(trace_arrivals(timestamps)) == [0., 0.5, 1.5, 1.]
+  assert list(trace_arrivals(timestamps, speedup=2.)) == [0., 0.25, 0.75, 0.5]
+  # The trace has 3 gaps in 3 s, replaying it at 2 requests per second halves the gaps
+  scaled = scaled_trace_arrivals(timestamps)
+  assert list(scaled(2.)) == pytest.approx([0., 0.25, 0.75, 0.5])
+
+
+def test_batch_size_sampler():
+  assert list(islice(batch_size_sampler(3), 3)) == [3, 3, 3]
+  sizes = list(islice(batch_size_sampler({1: 3, 8: 1}, seed=0), 4000))
+  assert set(sizes) == {1, 8}
+  assert sizes.count(8) / len(sizes) == pytest.approx(0.25, abs=0.03)
+  with pytest.raises(TypeError):
+    next(batch_size_sampler('1'))
+
+
+class FakeAsyncClient:
+  def __init__(self):
+    self.requests = []
+    self.lock = threading.Lock()
+
+  def async_infer(self, model_name, inputs, outputs, callback):
+    with self.lock:
+      self.requests.append(inputs[0].shape())
+    callback(object(), None)
+
+
+def test_open_loop_generator(monkeypatch):
+  client = FakeAsyncClient()
+  generator = OpenLoopGenerator(client, 'model', ['INPUT'], ['OUTPUT'],
+                                lambda bs: [np.zeros((bs, 4), dtype=np.float32)])
+  summary = generator.run(fixed_arrivals(1000), batch_sizes=2, n_requests=20)
+  assert summary['requests'] == 20
+  assert summary['samples'] == 40
+  assert summary['failed'] == 0
+  assert summary['timed_out'] == 0
+  assert client.requests == [[2, 4]] * 20
+
+  rates = []
+  monkeypatch.setattr(generator, 'run',
+                      lambda arrivals, batch_sizes, duration_s: rates.append(next(arrivals)) or
+                      {'offered_requests_per_s': 0, 'failed': 0})
+  generator.sweep([10, 20], arrival=fixed_arrivals, duration_s=1.)
+  assert rates == [0.1, 0.05]
+  with pytest.raises(TypeError):
+    generator.sweep([10], arrival=trace_arrivals)
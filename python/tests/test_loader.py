@@ -0,0 +1,88 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import threading
+import time
+import numpy as np
+from dali_backend.test_utils.loader import iter_samples, list_samples, load_samples
+
+
+def write_samples(dir_path, n):
+  paths = []
+  for i in range(n):
+    path = os.path.join(str(dir_path), 'sample_{:03d}.bin'.format(i))
+    np.full(i + 1, i, dtype=np.uint8).tofile(path)
+    paths.append(path)
+  return paths
+
+
+def test_list_samples(tmp_path):
+  paths = write_samples(tmp_path, 5)
+  os.mkdir(os.path.join(str(tmp_path), 'sample_dir'))
+  assert sorted(list_samples(str(tmp_path))) == paths
+  assert sorted(list_samples(str(tmp_path), exclude=['sample_000.bin'])) == paths[1:]
+  assert list_samples(str(tmp_path), name_pattern='_004') == paths[4:]
+  assert len(list_samples(str(tmp_path), max_samples=2)) == 2
+  assert list_samples(paths[3]) == [paths[3]]
+
+
+def test_iter_samples_order(tmp_path, monkeypatch):
+  paths = write_samples(tmp_path, 20)
+  # The loads of the first samples finish last, the samples must be yielded in order anyway
+  from dali_backend.test_utils import loader
+  load_sample = loader.load_sample
+
+  def slow_load(path, mmap=False):
+    time.sleep(0.001 * (20 - int(path[-7:-4])))
+    return load_sample(path, mmap)
+
+  monkeypatch.setattr(loader, 'load_sample', slow_load)
+  for mmap in (False, True):
+    samples = list(iter_samples(paths, num_workers=8, prefetch=8, mmap=mmap))
+    assert len(samples) == len(paths)
+    for i, sample in enumerate(samples):
+      np.testing.assert_array_equal(sample, np.full(i + 1, i, dtype=np.uint8))
+  samples = load_samples(str(tmp_path), num_workers=4)
+  assert sorted(len(s) for s in samples) == list(range(1, 21))
+
+
+def test_iter_samples_prefetch_bound(tmp_path):
+  paths = write_samples(tmp_path, 50)
+  prefetch = 4
+  lock = threading.Lock()
+  consumed = [0]
+
+  def counting_paths():
+    for path in paths:
+      with lock:
+        consumed[0] += 1
+      yield path
+
+  it = iter_samples(counting_paths(), num_workers=2, prefetch=prefetch)
+  for i in range(len(paths)):
+    next(it)
+    with lock:
+      # The samples taken so far and at most `prefetch` samples read ahead
+      assert consumed[0] <= i + 1 + prefetch
+  assert consumed[0] == len(paths)
+  assert next(it, None) is None
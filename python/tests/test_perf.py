@@ -0,0 +1,78 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import numpy as np
+import pytest
+from dali_backend.test_utils.perf import PerfRecorder, latency_summary
+
+
+def test_latency_summary():
+  assert latency_summary([]) == {}
+  # 1..100 ms
+  summary = latency_summary(np.arange(1, 101) * 1000000)
+  assert summary['p50'] == pytest.approx(50.5)
+  assert summary['p90'] == pytest.approx(90.1)
+  assert summary['p99'] == pytest.approx(99.01)
+  assert summary['mean'] == pytest.approx(50.5)
+  assert summary['max'] == pytest.approx(100.)
+
+
+class FakeStatsClient:
+  def __init__(self):
+    self.queue_ns = 0
+    self.count = 0
+
+  def get_inference_statistics(self, model_name, as_json=False):
+    stats = {stage: {'count': self.count, 'ns': 0} for stage in
+             ['success', 'fail', 'compute_input', 'compute_infer', 'compute_output']}
+    stats['queue'] = {'count': self.count, 'ns': self.queue_ns}
+    return {'model_stats': [{'name': model_name, 'inference_stats': stats}]}
+
+
+def test_perf_recorder(tmp_path):
+  client = FakeStatsClient()
+  perf = PerfRecorder(client, 'model')
+  assert perf.summary() == {'requests': 0}
+  perf.start()
+  # Two requests of 2 and 4 samples, 10 ms and 30 ms, within 1 s
+  perf.record(0, 10000000, 2, 100, 200)
+  perf.record(970000000, 1000000000, 4, 300, 400)
+  client.count, client.queue_ns = 2, 8000000
+  perf.stop()
+  summary = perf.summary()
+  assert summary['requests'] == 2
+  assert summary['samples'] == 6
+  assert summary['duration_s'] == pytest.approx(1.)
+  assert summary['samples_per_s'] == pytest.approx(6.)
+  assert summary['input_bytes'] == 400
+  assert summary['output_bytes'] == 600
+  assert summary['latency_ms']['mean'] == pytest.approx(20.)
+  assert summary['server']['queue'] == {'count': 2, 'avg_ms': pytest.approx(4.)}
+  assert summary['client_overhead_ms'] == pytest.approx(16.)
+
+  perf.dump(str(tmp_path / 'report.json'))
+  with open(str(tmp_path / 'report.json')) as f:
+    assert len(json.load(f)['records']) == 2
+  perf.dump(str(tmp_path / 'report.csv'))
+  with open(str(tmp_path / 'report.csv')) as f:
+    assert len(f.readlines()) == 3
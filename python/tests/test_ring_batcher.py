@@ -0,0 +1,52 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import importlib.util
+import os
+import numpy as np
+import pytest
+
+_CLIENT_UTILS = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, 'client', 'utils.py')
+_spec = importlib.util.spec_from_file_location('client_utils', _CLIENT_UTILS)
+client_utils = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(client_utils)
+
+
+def batch_sizes(provider):
+  # Generators are consumed by a single batcher, so each one gets a fresh copy
+  if provider == 'generator':
+    return (bs for bs in [3, 7, 1, 12, 5, 25, 2])
+  return provider
+
+
+@pytest.mark.parametrize('provider', [1, 4, 9, 10, 23, [3, 7, 1, 12, 5, 25, 2], 'generator'])
+@pytest.mark.parametrize('n_iterations', [-1, 1, 17])
+@pytest.mark.parametrize('prefetch', [False, True])
+def test_ring_batcher_matches_batcher(provider, n_iterations, prefetch):
+  dataset = np.arange(10 * 3, dtype=np.int32).reshape(10, 3)
+  expected = list(client_utils.batcher(dataset, batch_sizes(provider), n_iterations))
+  # The ring batches are valid only until the next one is requested
+  actual = [batch.copy() for batch in
+            client_utils.ring_batcher(dataset, batch_sizes(provider), n_iterations, prefetch)]
+  assert len(actual) == len(expected)
+  for a, e in zip(actual, expected):
+    np.testing.assert_array_equal(a, e)
@@ -0,0 +1,160 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import numpy as np
+import pytest
+import tritonclient.grpc
+import tritonclient.utils.shared_memory as shm
+from dali_backend.test_utils.shm import SystemShmIO, SystemShmRegion
+from tritonclient.utils import InferenceServerException
+
+
+class FakeResult:
+  def __init__(self, outputs):
+    self.outputs = outputs
+
+  def get_output(self, name):
+    return self.outputs[name]
+
+
+class FakeClient:
+  """
+  Registers the regions like the server does and answers the inference requests
+  with ``OUTPUT0``, which is ``output_size`` bytes long.
+  """
+  def __init__(self, output_size, max_batch_size=0):
+    self.output_size = output_size
+    self.max_batch_size = max_batch_size
+    self.registered = {}
+    self.infer_calls = 0
+    self.slot = None
+
+  def get_model_config(self, model_name, as_json=False):
+    return {'config': {
+      'max_batch_size': self.max_batch_size,
+      'input': [{'name': 'INPUT0', 'data_type': 'TYPE_UINT8', 'dims': ['-1']}],
+      'output': [{'name': 'OUTPUT0', 'data_type': 'TYPE_UINT8', 'dims': ['16']}],
+    }}
+
+  def register_system_shared_memory(self, name, key, byte_size):
+    assert name not in self.registered
+    self.registered[name] = (key, byte_size)
+
+  def unregister_system_shared_memory(self, name):
+    del self.registered[name]
+
+  def infer(self, model_name, inputs, outputs):
+    self.infer_calls += 1
+    params = outputs[0]._get_tensor().parameters
+    region = params['shared_memory_region'].string_param
+    byte_size = params['shared_memory_byte_size'].int64_param
+    assert self.registered[region][1] == byte_size
+    if byte_size < self.output_size:
+      raise InferenceServerException(
+        "shared memory size specified with the request for output 'OUTPUT0' ({} bytes) should "
+        "be at least {} bytes to hold the results".format(byte_size, self.output_size),
+        status='StatusCode.INVALID_ARGUMENT')
+    data = np.arange(self.output_size, dtype=np.uint8)
+    shm.set_shared_memory_region(self.slot['OUTPUT0'].handle, [data])
+    return FakeResult({'OUTPUT0': {'shape': [self.output_size], 'datatype': 'UINT8'}})
+
+
+def make_io(client, **kwargs):
+  io = SystemShmIO(client, 'model', ['INPUT0'], ['OUTPUT0'], **kwargs)
+  # The fake server writes the outputs through the handles of the only slot
+  client.slot = io._create_slot()
+  io._free_slots.put(client.slot)
+  return io
+
+
+def test_region_growth():
+  client = FakeClient(0)
+  region = SystemShmRegion(client, 'test_region_growth', 100)
+  try:
+    assert region.byte_size == 100
+    region.ensure(50)
+    assert region.byte_size == 100
+    # Grows at least twice, so that slightly bigger batches don't re-register the region
+    region.ensure(120)
+    assert region.byte_size == 200
+    region.ensure(1000)
+    assert region.byte_size == 1000
+    assert client.registered == {'test_region_growth': ('/test_region_growth', 1000)}
+  finally:
+    region.destroy()
+  assert client.registered == {}
+  assert region.byte_size == 0
+
+
+def test_initial_sizes_from_config():
+  client = FakeClient(0, max_batch_size=4)
+  with make_io(client, default_byte_size=1000) as io:
+    assert io._sizes == {'INPUT0': 1000, 'OUTPUT0': 64}
+
+
+def test_output_regrow():
+  client = FakeClient(5000)
+  with make_io(client, default_byte_size=1000) as io:
+    out, = io.infer([np.zeros(10, dtype=np.uint8)])
+    np.testing.assert_array_equal(out, np.arange(5000, dtype=np.uint8))
+    assert client.infer_calls == 2
+    assert client.slot['OUTPUT0'].byte_size >= 5000
+    # The grown region is reused by the next request
+    io.infer([np.zeros(10, dtype=np.uint8)])
+    assert client.infer_calls == 3
+  assert client.registered == {}
+
+
+def test_other_errors_not_retried():
+  class FailingClient(FakeClient):
+    def infer(self, model_name, inputs, outputs):
+      self.infer_calls += 1
+      raise InferenceServerException("unable to find system shared memory region: 'x'",
+                                     status='StatusCode.INVALID_ARGUMENT')
+
+  client = FailingClient(0)
+  with make_io(client) as io:
+    with pytest.raises(InferenceServerException):
+      io.infer([np.zeros(10, dtype=np.uint8)])
+  assert client.infer_calls == 1
+
+
+def test_outputs_outlive_slot_reuse():
+  class CountingClient(FakeClient):
+    def infer(self, model_name, inputs, outputs):
+      super().infer(model_name, inputs, outputs)
+      data = np.full(self.output_size, self.infer_calls, dtype=np.uint8)
+      shm.set_shared_memory_region(self.slot['OUTPUT0'].handle, [data])
+      return FakeResult({'OUTPUT0': {'shape': [self.output_size], 'datatype': 'UINT8'}})
+
+  client = CountingClient(16)
+  with make_io(client, default_byte_size=16) as io:
+    first, = io.infer([np.zeros(10, dtype=np.uint8)])
+    # The only slot is reused by the next request, while the first outputs are still held
+    second, = io.infer([np.zeros(10, dtype=np.uint8)])
+    np.testing.assert_array_equal(first, np.full(16, 1, dtype=np.uint8))
+    np.testing.assert_array_equal(second, np.full(16, 2, dtype=np.uint8))
+    # Regrowing the region doesn't invalidate the outputs either
+    client.output_size = 64
+    third, = io.infer([np.zeros(10, dtype=np.uint8)])
+    np.testing.assert_array_equal(second, np.full(16, 2, dtype=np.uint8))
+    np.testing.assert_array_equal(third, np.full(64, 4, dtype=np.uint8))
@@ -0,0 +1,41 @@
+#!/bin/bash -ex
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# The worker is a backend-wide option, so this test runs its own server instance
+: ${GRPC_PORT:=8101}
+: ${HTTP_PORT:=8100}
+GRPC_ADDR="localhost:$GRPC_PORT"
+
+tritonserver --model-repository=model_repository --backend-config=dali,autoserialize_worker=true \
+  --grpc-port=$GRPC_PORT --http-port=$HTTP_PORT --metrics-port=8102 &
+SERVER_PID=$!
+trap "kill $SERVER_PID; wait $SERVER_PID" EXIT
+
+for i in $(seq 60); do
+  if curl -sf "localhost:$HTTP_PORT/v2/health/ready"; then
+    break
+  fi
+  sleep 1
+done
+
+python client.py -u $GRPC_ADDR -b 16 -n 20
@@ -27,6 +27,7 @@ from numpy.random import randint
 import tritongrpcclient
 from PIL import Image
 import math
+from dali_backend.test_utils.batch import BatchBuilder
 
 np.random.seed(100019)
 
@@ -45,18 +46,6 @@ def parse_args():
     return parser.parse_args()
 
 
-def array_from_list(arrays):
-    """
-    Convert list of ndarrays to single ndarray with ndims+=1
-    """
-    lengths = list(map(lambda x, arr=arrays: arr[x].shape[0], [x for x in range(len(arrays))]))
-    max_len = max(lengths)
-    arrays = list(map(lambda arr, ml=max_len: np.pad(arr, ((0, ml - arr.shape[0]))), arrays))
-    for arr in arrays:
-        assert arr.shape == arrays[0].shape, "Arrays must have the same shape"
-    return np.stack(arrays)
-
-
 def batcher(dataset, max_batch_size, n_iterations=-1):
     """
     Generator, that splits dataset into batches with given batch size
@@ -93,20 +82,20 @@ def main():
 
     input_data = [randint(0, 255, size=randint(100), dtype='uint8') for _ in
                   range(randint(100) * FLAGS.batch_size)]
-    input_data = array_from_list(input_data)
+    # Every batch is padded only to its own longest sample, in the memory of the previous one
+    build_batch = BatchBuilder()
 
     # Infer
     outputs = []
     input_name = "DALI_INPUT_0"
     output_name = "DALI_OUTPUT_0"
-    input_shape = list(input_data.shape)
     outputs.append(tritongrpcclient.InferRequestedOutput(output_name))
 
-    for batch in batcher(input_data, FLAGS.batch_size):
+    for samples in batcher(input_data, FLAGS.batch_size):
+        batch, _ = build_batch(samples)
         print("Input mean before backend processing:", np.mean(batch))
-        input_shape[0] = np.shape(batch)[0]
-        print("Batch size: ", input_shape[0])
-        inputs = [tritongrpcclient.InferInput(input_name, input_shape, "UINT8")]
+        print("Batch size: ", np.shape(batch)[0])
+        inputs = [tritongrpcclient.InferInput(input_name, list(batch.shape), "UINT8")]
         # Initialize the data
         inputs[0].set_data_from_numpy(batch)
 
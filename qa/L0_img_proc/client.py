@@ -51,7 +51,7 @@ def main():
   client = TestClient('img_proc.dali', ['DALI_INPUT_0'], ['DALI_OUTPUT_0',], args.url,
                       concurrency=args.concurrency)
   client.run_tests(random_gen(args.max_batch_size), ref_func,
-                   n_infers=args.n_iters, eps=1e-4)
+                   n_infers=args.n_iters, eps=1e-4, pipelined=True)
 
 if __name__ == '__main__':
   main()
@@ -25,6 +25,8 @@ import argparse, os, sys
 import numpy as np
 from numpy.random import randint
 import tritongrpcclient
+from dali_backend.test_utils.batch import pad_batch
+from dali_backend.test_utils.loader import iter_samples, list_samples
 from PIL import Image
 
 np.random.seed(100019)
@@ -50,16 +52,6 @@ def parse_args():
     return parser.parse_args()
 
 
-def load_image(img_path: str):
-    """
-    Loads image as an encoded array of bytes.
-    This is a typical approach you want to use in DALI backend
-    """
-    with open(img_path, "rb") as f:
-        img = f.read()
-        return np.array(list(img)).astype(np.uint8)
-
-
 def load_images(dir_path: str):
     """
     Loads all files in given dir_path. Treats them as images
@@ -68,33 +60,18 @@ def load_images(dir_path: str):
     labels = []
     labels_fname = 'labels.txt'
 
-    # Traverses directory for files (not dirs) and returns full paths to them
-    path_generator = (os.path.join(dir_path, f) for f in os.listdir(dir_path) if
-                      os.path.isfile(os.path.join(dir_path, f)) and f != labels_fname)
-    img_paths = [dir_path] if os.path.isfile(dir_path) else list(path_generator)
+    img_paths = list_samples(dir_path, exclude=[labels_fname])
 
     # File to dictionary
     with open(os.path.join(dir_path, labels_fname)) as f:
         labels_dict = {k: int(v) for line in f for (k, v) in [line.strip().split(None, 1)]}
 
-    for img in img_paths:
-        images.append(load_image(img))
+    for img, img_data in zip(img_paths, iter_samples(img_paths)):
+        images.append(img_data)
         labels.append(labels_dict[os.path.basename(img)])
     return images, labels
 
 
-def array_from_list(arrays):
-    """
-    Convert list of ndarrays to single ndarray with ndims+=1
-    """
-    lengths = list(map(lambda x, arr=arrays: arr[x].shape[0], [x for x in range(len(arrays))]))
-    max_len = max(lengths)
-    arrays = list(map(lambda arr, ml=max_len: np.pad(arr, ((0, ml - arr.shape[0]))), arrays))
-    for arr in arrays:
-        assert arr.shape == arrays[0].shape, "Arrays must have the same shape"
-    return np.stack(arrays)
-
-
 def batcher(dataset, max_batch_size, n_iterations=-1):
     """
     Generator, that splits dataset into batches with given batch size
@@ -132,7 +109,7 @@ def main():
     print("Loading images")
 
     image_data, labels = load_images(FLAGS.img_dir if FLAGS.img_dir is not None else FLAGS.img)
-    image_data = array_from_list(image_data)
+    image_data, _ = pad_batch(image_data)
 
     print("Images loaded, inferring")
 
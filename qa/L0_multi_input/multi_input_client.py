@@ -27,6 +27,7 @@ from numpy.random import randint
 import tritonclient.grpc
 from PIL import Image
 import math
+from dali_backend.test_utils.batch import BatchBuilder
 
 np.random.seed(100019)
 
@@ -45,18 +46,6 @@ def parse_args():
     return parser.parse_args()
 
 
-def array_from_list(arrays):
-    """
-    Convert list of ndarrays to single ndarray with ndims+=1
-    """
-    lengths = list(map(lambda x, arr=arrays: arr[x].shape[0], [x for x in range(len(arrays))]))
-    max_len = max(lengths)
-    arrays = list(map(lambda arr, ml=max_len: np.pad(arr, ((0, ml - arr.shape[0]))), arrays))
-    for arr in arrays:
-        assert arr.shape == arrays[0].shape, "Arrays must have the same shape"
-    return np.stack(arrays)
-
-
 def batcher(dataset, max_batch_size, n_iterations=-1):
     """
     Generator, that splits dataset into batches with given batch size
@@ -85,7 +74,8 @@ def main():
 
     input_data = [randint(0, 255, size=randint(100), dtype='uint8') for _ in
                   range(randint(100) * FLAGS.batch_size)]
-    input_data = array_from_list(input_data)
+    # Every batch is padded only to its own longest sample, in the memory of the previous one
+    build_batch = BatchBuilder()
 
     # Infer
     outputs = []
@@ -93,18 +83,17 @@ def main():
     scalars_name = "DALI_SCALAR"
     output_names = ["DALI_unchanged", "DALI_changed"]
 
-    input_shape = list(input_data.shape)
-
     for oname in output_names:
         outputs.append(tritonclient.grpc.InferRequestedOutput(oname))
 
-    for batch in batcher(input_data, FLAGS.batch_size):
+    for samples in batcher(input_data, FLAGS.batch_size):
+        batch, _ = build_batch(samples)
         print("Input mean before backend processing:", np.mean(batch))
         batch_size = np.shape(batch)[0]
         print("Batch size: ", batch_size)
 
         # Initialize the data
-        input_shape[0] = batch_size
+        input_shape = list(batch.shape)
         scalars = randint(0, 1024, size=(batch_size, 1), dtype=np.int32)
         inputs = [tritonclient.grpc.InferInput(iname, input_shape, "UINT8") for iname in
                   input_names]
@@ -29,6 +29,7 @@ import nvidia.dali.experimental.eager as eager
 from glob import glob
 from os import environ
 from itertools import cycle
+from functools import partial
 
 def get_dali_extra_path():
   return environ['DALI_EXTRA_PATH']
@@ -88,14 +89,18 @@ def parse_args():
     parser.add_argument('-c', '--concurrency', type=int, required=False, default=1,
                         help='Request concurrency level')
     parser.add_argument('-b', '--max_batch_size', type=int, required=False, default=2)
+    parser.add_argument('--ref_workers', type=int, required=False, default=0,
+                        help='Number of processes computing the reference outputs')
     return parser.parse_args()
 
 def main():
   args = parse_args()
   client = TestClient('model.dali', ['INPUT'], ['OUTPUT', 'OUTPUT_images', 'INPUT'], args.url,
                       concurrency=args.concurrency)
-  client.run_tests(input_gen(args.max_batch_size), RefFunc(args.max_batch_size),
-                   n_infers=args.n_iters, eps=1e-4)
+  # With the reference workers, each worker process builds its own pipeline
+  ref_func = RefFunc(args.max_batch_size) if args.ref_workers == 0 else None
+  client.run_tests(input_gen(args.max_batch_size), ref_func, n_infers=args.n_iters, eps=1e-4,
+                   ref_workers=args.ref_workers, ref_factory=partial(RefFunc, args.max_batch_size))
 
 if __name__ == '__main__':
   main()
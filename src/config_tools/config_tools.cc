@@ -26,6 +26,8 @@
 
 namespace triton { namespace backend { namespace dali {
 
+constexpr char bytes_data_type[] = "TYPE_STRING";
+
 
 /**
  * @brief convert DALI data type to type string used in Triton model config
@@ -108,6 +110,62 @@ std::vector<int64_t> ReadShape(TritonJson::Value &dims_array) {
 }
 
 
+std::vector<IOConfig> ReadInputsConfig(TritonJson::Value &config, bool batched_model) {
+  std::vector<IOConfig> result;
+  TritonJson::Value inputs;
+  if (!config.Find("input", &inputs)) {
+    return result;
+  }
+  TRITON_CALL(inputs.AssertType(TritonJson::ValueType::ARRAY));
+  for (size_t i = 0; i < inputs.ArraySize(); ++i) {
+    TritonJson::Value input;
+    TRITON_CALL(inputs.IndexAsObject(i, &input));
+    std::string name, data_type;
+    TRITON_CALL(input.MemberAsString("name", &name));
+    TRITON_CALL(input.MemberAsString("data_type", &data_type));
+    TritonJson::Value dims;
+    TRITON_CALL(input.MemberAsArray("dims", &dims));
+    auto shape = ReadShape(dims);
+    if (data_type == bytes_data_type) {
+      // Every element of the BYTES input is a 1D UINT8 sample of its own length
+      int64_t batch_dim = shape.empty() ? -1 : shape[0];
+      shape = batched_model ? std::vector<int64_t>{-1} : std::vector<int64_t>{batch_dim, -1};
+      result.emplace_back(name, DALI_UINT8, shape);
+      continue;
+    }
+    result.emplace_back(name, to_dali(ModelConfigDataTypeToTritonServerDataType(data_type)),
+                        shape);
+  }
+  return result;
+}
+
+
+bool IsBytesConfig(TritonJson::Value &io_object) {
+  std::string data_type;
+  TritonError err{io_object.MemberAsString("data_type", &data_type)};
+  return !err && data_type == bytes_data_type;
+}
+
+
+IOConfig BytesInputConfig(const IOConfig &model_in, bool batched_model) {
+  if (model_in.dtype != DALI_NO_TYPE && model_in.dtype != DALI_UINT8) {
+    throw TritonError::InvalidArg(make_string(
+      "Mismatch of data_type config for \"", model_in.name, "\".\n"
+      "The BYTES (TYPE_STRING) input can be used only with UINT8 data in the pipeline.\n"
+      "Data type defined in pipeline: ", to_triton_config(model_in.dtype)));
+  }
+  if (model_in.shape && model_in.shape->size() != 1) {
+    throw TritonError::InvalidArg(make_string(
+      "Mismatch in number of dimensions for \"", model_in.name, "\".\n"
+      "The BYTES (TYPE_STRING) input can be used only with 1-dimensional data in the pipeline.\n"
+      "Number of dimensions defined in pipeline: ", model_in.shape->size()));
+  }
+  // A single element per sample
+  return IOConfig(model_in.name, DALI_NO_TYPE,
+                  batched_model ? std::vector<int64_t>{1} : std::vector<int64_t>{});
+}
+
+
 std::vector<int64_t> MatchShapes(const std::string &name,
                                  const std::vector<int64_t> &config_shape,
                                  const std::vector<int64_t> &pipeline_shape) {
@@ -283,7 +341,12 @@ void AutofillInputsConfig(TritonJson::Value &config, TritonJson::Value &config_i
   for (const auto &model_in: model_ins) {
     TritonJson::Value config_in(config, TritonJson::ValueType::OBJECT);
     auto found = FindObjectByName(config_ins, model_in.name, &config_in);
-    AutofillIOConfig(config, config_in, model_in, batched_model);
+    if (IsBytesConfig(config_in)) {
+      AutofillIOConfig(config, config_in, BytesInputConfig(model_in, batched_model),
+                       batched_model);
+    } else {
+      AutofillIOConfig(config, config_in, model_in, batched_model);
+    }
     if (!config_in.Find("allow_ragged_batch")) {
       config_in.AddBool("allow_ragged_batch", true);
     }
@@ -375,7 +438,11 @@ void ValidateInputs(TritonJson::Value &ins, const std::vector<IOConfig> &in_conf
       throw TritonError::InvalidArg(
         make_string("Missing config for \"", in_config.name, "\" input."));
     }
-    ValidateIOConfig(in_object, in_config, batched_model);
+    if (IsBytesConfig(in_object)) {
+      ValidateIOConfig(in_object, BytesInputConfig(in_config, batched_model), batched_model);
+    } else {
+      ValidateIOConfig(in_object, in_config, batched_model);
+    }
   }
 }
 
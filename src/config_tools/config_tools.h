@@ -77,6 +77,31 @@ std::optional<size_t> FindObjectByName(TritonJson::Value &array, const std::stri
 std::vector<int64_t> ReadShape(TritonJson::Value &dims_array);
 
 
+/**
+ * @brief Read the name, data type and dims of every input declared in the model configuration.
+ *
+ * The BYTES (TYPE_STRING) inputs are described as the UINT8 inputs of 1D samples,
+ * which the pipeline receives.
+ */
+std::vector<IOConfig> ReadInputsConfig(TritonJson::Value &config, bool batched_model = true);
+
+
+/**
+ * @brief Check, if the IO object is declared with the BYTES (TYPE_STRING) data type.
+ */
+bool IsBytesConfig(TritonJson::Value &io_object);
+
+
+/**
+ * @brief Get the model configuration of the BYTES input, that feeds the pipeline input
+ *        described by `model_in`.
+ *
+ * Every element of the BYTES input becomes a separate sample, so the input has a single element
+ * per sample. Throws an error, if the pipeline input is not a 1D UINT8 input.
+ */
+IOConfig BytesInputConfig(const IOConfig &model_in, bool batched_model = true);
+
+
 /**
  * @brief Match shapes from config file and pipeline and return the result of matching.
  *
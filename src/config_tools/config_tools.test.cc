@@ -80,6 +80,58 @@ TEST_CASE("ReadShape test") {
   }
 }
 
+TEST_CASE("Read inputs config") {
+  TritonJson::Value config;
+  TRITON_CALL(config.Parse(R"json({
+    "input": [
+      {
+        "name": "i1",
+        "data_type": "TYPE_UINT8",
+        "dims": [-1]
+      },
+      {
+        "name": "i2",
+        "data_type": "TYPE_FP32",
+        "dims": [2, 3]
+      }
+    ]
+  })json"));
+  auto inputs = ReadInputsConfig(config);
+  REQUIRE(inputs.size() == 2);
+  CHECK(inputs[0].name == "i1");
+  CHECK(inputs[0].dtype == DALI_UINT8);
+  CHECK(*inputs[0].shape == std::vector<int64_t>{-1});
+  CHECK(inputs[1].name == "i2");
+  CHECK(inputs[1].dtype == DALI_FLOAT);
+  CHECK(*inputs[1].shape == std::vector<int64_t>{2, 3});
+
+  TritonJson::Value empty_config;
+  TRITON_CALL(empty_config.Parse(R"json({})json"));
+  CHECK(ReadInputsConfig(empty_config).empty());
+}
+
+TEST_CASE("Read BYTES inputs config") {
+  TritonJson::Value config;
+  TRITON_CALL(config.Parse(R"json({
+    "input": [
+      {
+        "name": "i1",
+        "data_type": "TYPE_STRING",
+        "dims": [1]
+      }
+    ]
+  })json"));
+  auto inputs = ReadInputsConfig(config);
+  REQUIRE(inputs.size() == 1);
+  CHECK(inputs[0].dtype == DALI_UINT8);
+  CHECK(*inputs[0].shape == std::vector<int64_t>{-1});
+
+  inputs = ReadInputsConfig(config, false);
+  REQUIRE(inputs.size() == 1);
+  CHECK(inputs[0].dtype == DALI_UINT8);
+  CHECK(*inputs[0].shape == std::vector<int64_t>{1, -1});
+}
+
 TEST_CASE("IO config validation") {
   bool batched_model = GENERATE(true, false);
 
@@ -156,6 +208,48 @@ TEST_CASE("Inputs validation") {
 }
 
 
+TEST_CASE("BYTES inputs") {
+  TritonJson::Value ios(TritonJson::ValueType::ARRAY);
+  TRITON_CALL(ios.Parse(R"json([
+  {
+    "name": "encoded",
+    "data_type": "TYPE_STRING"
+  }
+  ])json"));
+
+  SECTION("Auto-config") {
+    AutofillInputsConfig(ios, ios, {IOConfig("encoded", DALI_UINT8, {{-1}})});
+    TritonJson::Value inp_object;
+    REQUIRE(ios.IndexAsObject(0, &inp_object) == TRITONJSON_STATUSSUCCESS);
+    std::string data_type;
+    REQUIRE(inp_object.MemberAsString("data_type", &data_type) == TRITONJSON_STATUSSUCCESS);
+    CHECK(data_type == "TYPE_STRING");
+    TritonJson::Value dims;
+    REQUIRE(inp_object.MemberAsArray("dims", &dims) == TRITONJSON_STATUSSUCCESS);
+    CHECK(ReadShape(dims) == std::vector<int64_t>{1});
+
+    ValidateInputs(ios, {IOConfig("encoded", DALI_UINT8, {{-1}})});
+  }
+
+  SECTION("Auto-config [unbatched]") {
+    AutofillInputsConfig(ios, ios, {IOConfig("encoded", DALI_UINT8, {{-1}})}, false);
+    TritonJson::Value inp_object;
+    REQUIRE(ios.IndexAsObject(0, &inp_object) == TRITONJSON_STATUSSUCCESS);
+    TritonJson::Value dims;
+    REQUIRE(inp_object.MemberAsArray("dims", &dims) == TRITONJSON_STATUSSUCCESS);
+    CHECK(ReadShape(dims) == std::vector<int64_t>{-1});
+  }
+
+  SECTION("Mismatching pipeline input") {
+    REQUIRE_THROWS_WITH(AutofillInputsConfig(ios, ios, {IOConfig("encoded", DALI_FLOAT, {{-1}})}),
+                        Contains("UINT8"));
+    REQUIRE_THROWS_WITH(
+        AutofillInputsConfig(ios, ios, {IOConfig("encoded", DALI_UINT8, {{-1, -1}})}),
+        Contains("1-dimensional"));
+  }
+}
+
+
 TEST_CASE("Outputs validation") {
   TritonJson::Value ios(TritonJson::ValueType::ARRAY);
   TRITON_CALL(ios.Parse(R"json([
@@ -24,11 +24,19 @@
 
 #include "src/dali_model.h"
 #include "src/dali_model_instance.h"
+#include "src/metrics.h"
 #include "src/utils/triton.h"
 #include "triton/backend/backend_common.h"
 
 namespace triton { namespace backend { namespace dali {
 
+namespace {
+
+std::unique_ptr<HostPoolMetrics> host_pool_metrics;
+std::unique_ptr<ExecutionMetricFamilies> execution_metrics;
+
+}  // namespace
+
 extern "C" {
 
 // Implementing TRITONBACKEND_Initialize is optional. The backend
@@ -72,6 +80,39 @@ TRITONSERVER_Error* TRITONBACKEND_Initialize(TRITONBACKEND_Backend* backend) {
                 make_string("Failed to load plugin libs: ", e.what()).c_str());
   }
 
+  try {
+    HostMemoryPool::Instance().Configure(backend_params.GetHostPoolOptions());
+  } catch (const DaliBackendException& e) {
+    LOG_MESSAGE(TRITONSERVER_LOG_ERROR,
+                make_string("Failed to configure the host memory pool: ", e.what()).c_str());
+  }
+
+  try {
+    AutoserializeWorker::Instance().SetTimeout(
+        std::chrono::seconds(backend_params.GetAutoserializeTimeout()));
+  } catch (const std::exception& e) {
+    LOG_MESSAGE(TRITONSERVER_LOG_ERROR,
+                make_string("Invalid autoserialization timeout: ", e.what()).c_str());
+  }
+
+  try {
+    host_pool_metrics = std::make_unique<HostPoolMetrics>();
+    HostMemoryPool::Instance().SetStatsListener(
+        [metrics = host_pool_metrics.get()](const HostPoolStats& stats) {
+          metrics->Report(stats);
+        });
+  } catch (const TritonError& e) {
+    LOG_MESSAGE(TRITONSERVER_LOG_WARN,
+                make_string("Host memory pool metrics are not available: ", e.what()).c_str());
+  }
+
+  try {
+    execution_metrics = std::make_unique<ExecutionMetricFamilies>();
+  } catch (const TritonError& e) {
+    LOG_MESSAGE(TRITONSERVER_LOG_WARN,
+                make_string("Execution metrics are not available: ", e.what()).c_str());
+  }
+
   // If we have any global backend state we create and set it here. We
   // don't need anything for this backend but for demonstration
   // purposes we just create something...
@@ -95,6 +136,11 @@ TRITONSERVER_Error* TRITONBACKEND_Finalize(TRITONBACKEND_Backend* backend) {
 
   delete state;
 
+  AutoserializeWorker::Instance().Stop();
+  HostMemoryPool::Instance().SetStatsListener({});
+  host_pool_metrics.reset();
+  execution_metrics.reset();
+
   return nullptr;  // success
 }
 
@@ -142,6 +188,16 @@ TRITONSERVER_Error* TRITONBACKEND_ModelInitialize(TRITONBACKEND_Model* model) {
   RETURN_IF_ERROR(DaliModel::Create(model, &model_state));
   RETURN_IF_ERROR(TRITONBACKEND_ModelSetState(model, reinterpret_cast<void*>(model_state)));
 
+  if (execution_metrics) {
+    try {
+      model_state->SetMetrics(std::make_unique<ModelMetrics>(*execution_metrics, name, version));
+    } catch (const TritonError& e) {
+      LOG_MESSAGE(TRITONSERVER_LOG_WARN,
+                  make_string("Execution metrics of ", name, " are not available: ", e.what())
+                      .c_str());
+    }
+  }
+
   if (model_state->ShouldAutoCompleteConfig()) {
     RETURN_IF_ERROR(model_state->AutoCompleteConfig());
   }
@@ -236,7 +292,7 @@ TRITONSERVER_Error* TRITONBACKEND_ModelInstanceExecute(TRITONBACKEND_ModelInstan
   std::vector<TRITONBACKEND_Response*> responses(request_count);
 
   try {
-    dali_instance->Execute(requests);
+    dali_instance->Execute(std::move(requests));
   } catch (TritonError& err) { return err.release(); }
 
   return nullptr;
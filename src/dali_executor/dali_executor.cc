@@ -21,63 +21,131 @@
 // SOFTWARE.
 
 #include "src/dali_executor/dali_executor.h"
+#include <algorithm>
+#include <chrono>
 #include <cstring>
+#include <numeric>
 #include "src/dali_executor/utils/dali.h"
 
 namespace triton::backend::dali {
 
 void DaliExecutor::SetupInputs(const std::vector<IDescr>& inputs) {
+  FeedInputs(StageInputs(inputs));
+}
+
+
+std::vector<StagedInput> DaliExecutor::StageInputs(const std::vector<IDescr>& inputs) {
   assert(!inputs.empty());
-  int batch_size = inputs[0].meta.shape.num_samples();
-  std::vector<IDescr> c_inputs{};
+  std::vector<StagedInput> c_inputs{};
+  input_copy_stats_ = {};
+  auto copy_start = std::chrono::steady_clock::now();
   for (auto& inp : inputs) {
     size_t inp_size = inp.meta.shape.num_elements() * dali_type_size(inp.meta.type);
-    auto es_device = pipeline_.GetInputDevice(inp.meta.name);
+    input_copy_stats_.fed_bytes += inp_size;
+    auto es_device = GetInputDevice(inp.meta.name);
     if (IsNoCopy(es_device, inp)) {
       assert(inp_size <= inp.buffers[0].size);
-      c_inputs.push_back(inp);
+      c_inputs.push_back({inp, {}});
+      input_copy_stats_.no_copy_inputs++;
+      continue;
+    }
+    auto sample_ptrs = SamplePointers(es_device, inp);
+    if (!sample_ptrs.empty()) {
+      c_inputs.push_back({inp, std::move(sample_ptrs)});
+      input_copy_stats_.per_sample_inputs++;
     } else {
       // Copy buffers to a contiguous buffer on the proper device
-      c_inputs.push_back(ScheduleInputCopy(inp));
-      assert(inp_size <= c_inputs.back().buffers[0].size);
+      c_inputs.push_back({ScheduleInputCopy(inp), {}});
+      input_copy_stats_.copied_inputs++;
+      assert(inp_size <= c_inputs.back().descr.buffers[0].size);
     }
   }
   WaitForCopies();
+  if (input_copy_stats_.bytes > 0) {
+    input_copy_stats_.ns = std::chrono::duration_cast<std::chrono::nanoseconds>(
+                               std::chrono::steady_clock::now() - copy_start)
+                               .count();
+  }
+  return c_inputs;
+}
+
+
+void DaliExecutor::FeedInputs(const std::vector<StagedInput>& c_inputs) {
   input_names_.clear();
   request_id_++;
   for (auto& inp : c_inputs) {
-    input_names_.push_back(inp.meta.name);
-    pipeline_.SetInput(inp, {request_id_.str()});
+    input_names_.push_back(inp.descr.meta.name);
+    if (inp.sample_ptrs.empty()) {
+      pipeline_.SetInput(inp.descr, {request_id_.str()});
+    } else {
+      pipeline_.SetInputSamples(inp.sample_ptrs.data(), inp.descr.meta, inp.descr.buffers[0].device,
+                                {request_id_.str()});
+    }
   }
 }
 
 
-IOBufferI* DaliExecutor::GetInputBuffer(const std::string& name, device_type_t device) {
-  IOBufferI* buffer;
-  if (device == device_type_t::CPU) {
-    buffer = &cpu_buffers_[name + "_inp"];
-  } else {
-    buffer = &gpu_buffers_[name + "_inp"];
+std::vector<const void*> DaliExecutor::SamplePointers(device_type_t es_device,
+                                                      const IDescr& input) {
+  for (auto& buffer : input.buffers) {
+    if (buffer.device != es_device ||
+        (buffer.device == device_type_t::GPU && buffer.device_id != pipeline_.DeviceId())) {
+      return {};
+    }
   }
-  return buffer;
+  const auto& shape = input.meta.shape;
+  auto type_size = dali_type_size(input.meta.type);
+  std::vector<const void*> ptrs(shape.num_samples());
+  size_t buffer_idx = 0;
+  size_t offset = 0;
+  for (int sample_idx = 0; sample_idx < shape.num_samples(); ++sample_idx) {
+    size_t sample_size = volume(shape[sample_idx]) * type_size;
+    while (sample_size > 0 && buffer_idx < input.buffers.size() &&
+           offset == input.buffers[buffer_idx].size) {
+      buffer_idx++;
+      offset = 0;
+    }
+    if (buffer_idx >= input.buffers.size() ||
+        offset + sample_size > input.buffers[buffer_idx].size) {
+      // The sample spans over many buffers
+      return {};
+    }
+    ptrs[sample_idx] = static_cast<const char*>(input.buffers[buffer_idx].data) + offset;
+    offset += sample_size;
+  }
+  return ptrs;
 }
 
 
-IOBufferI* DaliExecutor::GetOutputBuffer(const std::string& name, device_type_t device) {
+IOBufferI* DaliExecutor::GetInputBuffer(const std::string& name, device_type_t device) {
+  // The pipeline may still read from the buffers of the previously scheduled iterations
+  auto key = Pipelined() ? make_string(name, "_", input_slot_) : name;
   IOBufferI* buffer;
   if (device == device_type_t::CPU) {
-    buffer = &cpu_buffers_[name + "_out"];
+    buffer = &cpu_input_buffers_[key];
   } else {
-    buffer = &gpu_buffers_[name + "_out"];
+    buffer = &gpu_input_buffers_[key];
   }
   return buffer;
 }
 
 
+device_type_t DaliExecutor::GetInputDevice(const std::string& name) {
+  // The map is filled lazily, by the staging and the pipeline's thread alike
+  std::lock_guard<std::mutex> lock(pipeline_mutex_);
+  auto it = input_devices_.find(name);
+  if (it != input_devices_.end())
+    return it->second;
+  auto device = pipeline_.GetInputDevice(name);
+  input_devices_[name] = device;
+  return device;
+}
+
+
 IDescr DaliExecutor::ScheduleInputCopy(const IDescr& input) {
   assert(input.buffers.size() > 0);
   auto input_name = input.meta.name;
-  auto input_device = pipeline_.GetInputDevice(input_name);
+  auto input_device = GetInputDevice(input_name);
   IOBufferI* buffer = GetInputBuffer(input_name, input_device);
   size_t size = 0;
   for (auto& buf : input.buffers)
@@ -87,46 +155,95 @@ IDescr DaliExecutor::ScheduleInputCopy(const IDescr& input) {
   char* dst = reinterpret_cast<char*>(descriptor.data);
   auto stream = pipeline_.CopyStream();
   for (auto& buf : input.buffers) {
-    thread_pool_.AddWork(
-        [stream, descriptor, dst, buf](int) {
-          MemCopy(descriptor.device, dst, buf.device, buf.data, buf.size, stream);
-        },
-        buf.size, true);
+    input_copy_stats_.chunks += ScheduleCopy(descriptor.device, dst, buf, stream);
     dst += buf.size;
   }
+  input_copy_stats_.bytes += size;
   return IDescr{input.meta, {descriptor}};
 }
 
 
-void DaliExecutor::ScheduleOutputCopy(const ODescr& output, int output_idx) {
-  const auto& name = output.meta.name;
-  const auto& out_buffers = output.buffers;
-  size_t size = 0;
-  for (auto& out_buff : out_buffers) {
-    size += out_buff.size;
-  }
-  IOBufferI* interm_buffer = GetOutputBuffer(name, pipeline_.GetOutputDevice(output_idx));
-  interm_buffer->resize(size);
-  auto interm_descr = interm_buffer->get_descr();
-  pipeline_.PutOutput(interm_descr.data, output_idx, interm_descr.device);
-  char* src = reinterpret_cast<char*>(interm_descr.data);
-  auto stream = pipeline_.CopyStream();
-  for (auto& buf : out_buffers) {
+size_t DaliExecutor::ScheduleCopy(device_type_t dst_device, char* dst, const IBufferDescr& src,
+                                  cudaStream_t stream) {
+  // The copies involving the GPU are serialized on the stream,
+  // so there's no point in splitting them
+  bool split = copy_chunk_size_ > 0 && dst_device == device_type_t::CPU &&
+               src.device == device_type_t::CPU;
+  size_t chunk_size = split ? copy_chunk_size_ : src.size;
+  auto src_c = static_cast<const char*>(src.data);
+  size_t n_chunks = 0;
+  for (size_t offset = 0; offset < src.size; offset += chunk_size, ++n_chunks) {
+    size_t size = std::min(chunk_size, src.size - offset);
     thread_pool_.AddWork(
-        [stream, src, buf, interm_descr](int) {
-          MemCopy(buf.device, buf.data, interm_descr.device, src, buf.size, stream);
+        [=](int) {
+          MemCopy(dst_device, dst + offset, src.device, src_c + offset, size, stream);
         },
-        buf.size);
-    src += buf.size;
+        size, true);
+  }
+  return n_chunks;
+}
+
+
+std::vector<SampleDestination> DaliExecutor::SampleDestinations(const ODescr& output,
+                                                                int output_idx) {
+  auto shape = pipeline_.GetOutputShapeAt(output_idx);
+  auto type_size = dali_type_size(pipeline_.GetOutputType(output_idx));
+  const auto& buffers = output.buffers;
+  std::vector<SampleDestination> dsts(shape.num_samples());
+  size_t buffer_idx = 0;
+  size_t offset = 0;
+  for (int sample_idx = 0; sample_idx < shape.num_samples(); ++sample_idx) {
+    size_t sample_size = volume(shape[sample_idx]) * type_size;
+    while (sample_size > 0 && buffer_idx < buffers.size() &&
+           offset == buffers[buffer_idx].size) {
+      buffer_idx++;
+      offset = 0;
+    }
+    ENFORCE(buffer_idx < buffers.size() && offset + sample_size <= buffers[buffer_idx].size,
+            make_string("The buffers provided for the output ", output.meta.name,
+                        " are too small or not split at the sample boundaries."));
+    dsts[sample_idx].data = static_cast<char*>(buffers[buffer_idx].data) + offset;
+    dsts[sample_idx].buffer_idx = buffer_idx;
+    offset += sample_size;
   }
+  return dsts;
 }
 
+
+void DaliExecutor::ScatterOutput(const ODescr& output, int output_idx,
+                                 const std::vector<SampleDestination>& dsts, int buffer_idx) {
+  // Samples outside of the selected buffers (nullptr destination) are skipped by DALI
+  std::vector<void*> sample_ptrs(dsts.size());
+  for (auto device : {device_type_t::CPU, device_type_t::GPU}) {
+    bool any = false;
+    for (size_t i = 0; i < dsts.size(); ++i) {
+      auto& buffer = output.buffers[dsts[i].buffer_idx];
+      bool selected = (buffer_idx < 0 || dsts[i].buffer_idx == buffer_idx) &&
+                      buffer.device == device;
+      sample_ptrs[i] = selected ? dsts[i].data : nullptr;
+      any |= selected;
+    }
+    if (any) {
+      pipeline_.PutOutputSamples(sample_ptrs.data(), output_idx, device);
+    }
+  }
+}
+
+
 void DaliExecutor::WaitForCopies() {
   thread_pool_.RunAll();
   pipeline_.SyncStream();
 }
 
 
+void DaliExecutor::ResetPipeline() {
+  pipeline_.Reset();
+  outputs_acquired_ = false;
+  inputs_consumed_ = true;
+  ++generation_;
+}
+
+
 bool DaliExecutor::IsNoCopy(device_type_t es_device, const IDescr& input) {
   return input.buffers.size() == 1 && input.buffers[0].device == es_device &&
          (input.buffers[0].device == device_type_t::CPU ||
@@ -164,13 +281,14 @@ std::vector<OutputInfo> DaliExecutor::Run(const std::vector<IDescr>& inputs) {
   if (inputs_consumed_) {
     SetupInputs(inputs);
     inputs_consumed_ = false;
+  } else {
+    input_copy_stats_ = {};
   }
   try {
     pipeline_.Run();
     pipeline_.Output();
   } catch (std::runtime_error& e) {
-    pipeline_.Reset();
-    inputs_consumed_ = true;
+    ResetPipeline();
     throw e;
   }
   std::vector<OutputInfo> ret(pipeline_.GetNumOutput());
@@ -186,15 +304,152 @@ std::vector<OutputInfo> DaliExecutor::Run(const std::vector<IDescr>& inputs) {
 }
 
 void DaliExecutor::PutOutputs(const std::vector<ODescr>& outputs) {
+  std::lock_guard<std::mutex> lock(pipeline_mutex_);
   for (uint32_t output_idx = 0; output_idx < outputs.size(); ++output_idx) {
     if (outputs[output_idx].buffers.size() == 1) {
       auto buffer = outputs[output_idx].buffers[0];
       pipeline_.PutOutput(buffer.data, output_idx, buffer.device);
     } else {
-      ScheduleOutputCopy(outputs[output_idx], output_idx);
+      ScatterOutput(outputs[output_idx], output_idx,
+                    SampleDestinations(outputs[output_idx], output_idx));
+    }
+  }
+  pipeline_.SyncStream();
+}
+
+
+void DaliExecutor::PutOutputs(const std::vector<ODescr>& outputs,
+                              const std::function<void(int)>& on_buffer_ready) {
+  if (outputs.empty())
+    return;
+  size_t n_buffers = outputs[0].buffers.size();
+  for (auto& output : outputs) {
+    ENFORCE(output.buffers.size() == n_buffers,
+            "Every output has to be split into the same number of buffers.");
+  }
+  if (n_buffers == 1) {
+    PutOutputs(outputs);
+    on_buffer_ready(0);
+    return;
+  }
+
+  std::vector<std::vector<SampleDestination>> dsts(outputs.size());
+  std::vector<size_t> buffer_sizes(n_buffers, 0);
+  {
+    std::lock_guard<std::mutex> lock(pipeline_mutex_);
+    for (size_t output_idx = 0; output_idx < outputs.size(); ++output_idx) {
+      dsts[output_idx] = SampleDestinations(outputs[output_idx], output_idx);
+      for (size_t i = 0; i < n_buffers; ++i) {
+        buffer_sizes[i] += outputs[output_idx].buffers[i].size;
+      }
     }
   }
+  std::vector<int> order(n_buffers);
+  std::iota(order.begin(), order.end(), 0);
+  std::stable_sort(order.begin(), order.end(),
+                   [&](int lhs, int rhs) { return buffer_sizes[lhs] < buffer_sizes[rhs]; });
+  // All the copies are issued at once; the event recorded after each buffer tells when it's filled
+  std::vector<CUDAEvent> filled(n_buffers);
+  {
+    std::lock_guard<std::mutex> lock(pipeline_mutex_);
+    for (int i : order) {
+      for (size_t output_idx = 0; output_idx < outputs.size(); ++output_idx) {
+        ScatterOutput(outputs[output_idx], output_idx, dsts[output_idx], i);
+      }
+      filled[i] = pipeline_.RecordCopies();
+    }
+  }
+  for (int i : order) {
+    pipeline_.SyncCopies(std::move(filled[i]));
+    on_buffer_ready(i);
+  }
+}
+
+
+uint64_t DaliExecutor::Schedule(const std::vector<IDescr>& inputs) {
+  assert(Pipelined());
+  // Staging doesn't touch the pipeline, so it overlaps with the previous iterations.
+  // The concurrent calls are serialized, as they would share the staging buffers of the slot.
+  std::lock_guard<std::mutex> staging_lock(staging_mutex_);
+  auto c_inputs = StageInputs(inputs);
+  std::lock_guard<std::mutex> lock(pipeline_mutex_);
+  try {
+    FeedInputs(c_inputs);
+    pipeline_.Schedule();
+  } catch (std::runtime_error& e) {
+    ResetPipeline();
+    throw e;
+  }
+  input_slot_ = (input_slot_ + 1) % pipeline_depth_;
+  return generation_;
+}
+
+
+std::vector<OutputInfo> DaliExecutor::WaitForOutputs(uint64_t generation) {
+  std::lock_guard<std::mutex> lock(pipeline_mutex_);
+  if (generation != generation_) {
+    throw DaliBackendException(
+        "DALI pipeline has been reset due to an error in one of the preceding iterations.");
+  }
+  try {
+    // The outputs are released only by ReleaseOutputs
+    pipeline_.ShareOutput();
+  } catch (std::runtime_error& e) {
+    ResetPipeline();
+    throw e;
+  }
+  outputs_acquired_ = true;
+  std::vector<OutputInfo> ret(pipeline_.GetNumOutput());
+  auto outputs_shapes = pipeline_.GetOutputShapes();
+  for (size_t out_idx = 0; out_idx < ret.size(); out_idx++) {
+    ret[out_idx] = {outputs_shapes[out_idx], pipeline_.GetOutputType(out_idx),
+                    pipeline_.GetOutputDevice(out_idx)};
+  }
+  return ret;
+}
+
+
+void DaliExecutor::ReleaseOutputs() {
+  std::lock_guard<std::mutex> lock(pipeline_mutex_);
+  if (outputs_acquired_) {
+    pipeline_.ReleaseOutput();
+    outputs_acquired_ = false;
+  }
+}
+
+
+void DaliExecutor::CopyBuffers(const std::vector<std::pair<OBufferDescr, IBufferDescr>>& copies) {
+  // The copies are run by the thread pool used for staging the inputs
+  std::lock_guard<std::mutex> staging_lock(staging_mutex_);
+  auto stream = pipeline_.CopyStream();
+  for (auto& copy : copies) {
+    assert(copy.first.size == copy.second.size);
+    ScheduleCopy(copy.first.device, static_cast<char*>(copy.first.data), copy.second, stream);
+  }
   WaitForCopies();
 }
 
+
+void DaliExecutor::Warmup(const std::vector<IDescr>& inputs, int iterations) {
+  if (Pipelined()) {
+    for (int done = 0; done < iterations;) {
+      int n = std::min(iterations - done, pipeline_depth_);
+      std::vector<uint64_t> generations(n);
+      for (auto& gen : generations)
+        gen = Schedule(inputs);
+      for (auto gen : generations) {
+        WaitForOutputs(gen);
+        ReleaseOutputs();
+      }
+      done += n;
+    }
+  } else {
+    for (int i = 0; i < iterations; i++)
+      Run(inputs);
+    while (!inputs_consumed_ && !input_names_.empty())
+      Run(inputs);
+  }
+  input_copy_stats_ = {};
+}
+
 }  // namespace triton::backend::dali
@@ -23,7 +23,10 @@
 #ifndef DALI_BACKEND_DALI_EXECUTOR_DALI_EXECUTOR_H_
 #define DALI_BACKEND_DALI_EXECUTOR_DALI_EXECUTOR_H_
 
+#include <functional>
 #include <map>
+#include <memory>
+#include <mutex>
 #include <string>
 #include <utility>
 
@@ -41,11 +44,56 @@ struct OutputInfo {
   device_type_t device;
 };
 
+/**
+ * @brief Input ready to be passed to the pipeline.
+ *
+ * Either a single continuous buffer, or, if `sample_ptrs` is not empty, the location of every
+ * sample of the input within its (non-continuous) buffers.
+ */
+struct StagedInput {
+  IDescr descr;
+  std::vector<const void*> sample_ptrs;
+};
+
+/**
+ * @brief Amount and duration of the input copies done for a single iteration.
+ */
+struct CopyStats {
+  size_t bytes = 0;
+  size_t chunks = 0;
+  int64_t ns = 0;
+  size_t fed_bytes = 0;           // total size of the inputs fed to the pipeline
+  size_t no_copy_inputs = 0;      // inputs passed as they are (see IsNoCopy)
+  size_t per_sample_inputs = 0;   // inputs passed sample by sample, without a copy
+  size_t copied_inputs = 0;       // inputs copied to a continuous buffer
+};
+
+/**
+ * @brief Location of an output sample within the external output buffers.
+ */
+struct SampleDestination {
+  void* data = nullptr;
+  int buffer_idx = 0;
+};
+
 class DaliExecutor {
  public:
-  DaliExecutor(DaliPipeline pipeline) :
+  static constexpr size_t kDefaultCopyChunkSize = 4 << 20;
+
+  /**
+   * @param pipeline_depth Number of iterations, that can be scheduled at once in the pipelined
+   *                       mode (see Schedule). The pipeline's prefetch queue depth must be at
+   *                       least this big.
+   * @param copy_chunk_size Host-to-host input copies are split into chunks of this size,
+   *                        which are copied in parallel. 0 disables the splitting.
+   */
+  DaliExecutor(DaliPipeline pipeline, int pipeline_depth = 1,
+               size_t copy_chunk_size = kDefaultCopyChunkSize) :
       pipeline_(std::move(pipeline)),
-      thread_pool_(GetNumThreads(), pipeline_.DeviceId(), false, "[DALI Backend][Executor ThreadPool]") {}
+      thread_pool_(GetNumThreads(), pipeline_.DeviceId(), false,
+                   "[DALI Backend][Executor ThreadPool]"),
+      pipeline_depth_(pipeline_depth < 1 ? 1 : pipeline_depth),
+      copy_chunk_size_(copy_chunk_size) {}
 
   /**
    * @brief Run DALI pipeline.
@@ -58,6 +106,74 @@ class DaliExecutor {
    */
   void PutOutputs(const std::vector<ODescr>& outputs);
 
+  /**
+   * @brief Copy pipeline outputs to the external buffers and report each completed buffer.
+   *
+   * Every output has to be split into the same number of buffers (e.g. one per request).
+   * \p on_buffer_ready(i) is called as soon as the i-th buffer of every output is filled.
+   * The smaller buffers are filled first.
+   */
+  void PutOutputs(const std::vector<ODescr>& outputs,
+                  const std::function<void(int)>& on_buffer_ready);
+
+  /**
+   * @brief Feed the inputs and schedule a pipeline iteration without waiting for its outputs.
+   *
+   * Pipelined counterpart of Run. The outputs of the iterations are returned in the order of
+   * scheduling by WaitForOutputs. Up to `pipeline_depth` iterations can be scheduled at once;
+   * the outputs of each of them have to be released with ReleaseOutputs.
+   * Schedule can be called concurrently with WaitForOutputs, PutOutputs and ReleaseOutputs.
+   * The concurrent calls of Schedule are serialized. Every scheduled iteration stages its inputs
+   * in the buffers of its own slot, which are reused `pipeline_depth` iterations later, so
+   * the outputs of that earlier iteration have to be released before.
+   * @return Generation of the pipeline, that the iteration was scheduled in.
+   */
+  uint64_t Schedule(const std::vector<IDescr>& inputs);
+
+  /**
+   * @brief Wait for the outputs of the oldest scheduled iteration.
+   *
+   * Throws, if the pipeline has been reset since the iteration was scheduled in \p generation.
+   * @return Outputs descriptors.
+   */
+  std::vector<OutputInfo> WaitForOutputs(uint64_t generation);
+
+  /**
+   * @brief Release the outputs acquired with WaitForOutputs, if any.
+   */
+  void ReleaseOutputs();
+
+  /**
+   * @brief Run \p iterations of the pipeline on the \p inputs and discard the outputs.
+   *
+   * Used to perform the one-time initialization (memory allocations, kernel selection, etc.)
+   * before the first request is served. The inputs are fed until the pipeline consumes them,
+   * so that no leftovers of the warm-up data are returned for the subsequent requests.
+   */
+  void Warmup(const std::vector<IDescr>& inputs, int iterations);
+
+  /**
+   * @brief Copy the buffers, using the executor's threads and stream, and wait for the copies.
+   *
+   * Each copy is a (destination, source) pair of buffers of the same size.
+   */
+  void CopyBuffers(const std::vector<std::pair<OBufferDescr, IBufferDescr>>& copies);
+
+  bool Pipelined() const {
+    return pipeline_depth_ > 1;
+  }
+
+  int PipelineDepth() const {
+    return pipeline_depth_;
+  }
+
+  /**
+   * @brief Statistics of the input copies done while feeding the most recent inputs.
+   */
+  const CopyStats& LastInputCopyStats() const {
+    return input_copy_stats_;
+  }
+
   /**
    * @brief Returns true if any of the inputs consumed its data and requires providing next batch
    */
@@ -65,9 +181,38 @@ class DaliExecutor {
     return inputs_consumed_;
   }
 
+  /**
+   * @brief Drop the state of the pipeline, including the inputs, that haven't been consumed yet.
+   */
+  void Reset() {
+    ResetPipeline();
+  }
+
  private:
   void SetupInputs(const std::vector<IDescr>& inputs);
 
+  /**
+   * @brief Copy the inputs, which can't be passed to the pipeline directly, to continuous buffers.
+   *
+   * The inputs split into many buffers (e.g. coming from many requests) are passed to the pipeline
+   * sample by sample, without a copy, whenever possible.
+   * The memory of the inputs passed without a copy must stay valid until the pipeline produces
+   * the outputs of the iteration.
+   */
+  std::vector<StagedInput> StageInputs(const std::vector<IDescr>& inputs);
+
+  /**
+   * @brief Pass the staged inputs to the pipeline.
+   */
+  void FeedInputs(const std::vector<StagedInput>& c_inputs);
+
+  /**
+   * @brief Get a pointer to each sample of the \p input, if every sample is placed
+   *        within a single buffer available to the pipeline on the \p es_device.
+   * @return Pointers to the samples, or an empty vector, if the input has to be copied.
+   */
+  std::vector<const void*> SamplePointers(device_type_t es_device, const IDescr& input);
+
   /**
    * @brief Schedule a copy of all buffers within input IDescr to a continuous buffer.
    *        Call WaitForCopies() to wait for the copy to finish.
@@ -76,17 +221,38 @@ class DaliExecutor {
   IDescr ScheduleInputCopy(const IDescr& buffers);
 
   /**
-   * @brief Schedule a copy to a chunked output through an intermediate buffer.
-   *        Call WaitForCopies() to wait for the copy to finish.
+   * @brief Schedule a copy of a single buffer. Large host-to-host copies are split into chunks
+   *        of `copy_chunk_size_` bytes, so that they are spread across the thread pool.
+   * @return Number of the scheduled tasks.
+   */
+  size_t ScheduleCopy(device_type_t dst_device, char* dst, const IBufferDescr& src,
+                      cudaStream_t stream);
+
+  /**
+   * @brief Assign each sample of the pipeline output to its place in a chunked output.
+   *
+   * The buffers of the chunked output must be split at the sample boundaries.
    */
-  void ScheduleOutputCopy(const ODescr& output, int output_idx);
+  std::vector<SampleDestination> SampleDestinations(const ODescr& output, int output_idx);
 
   /**
-   * @brief Wait for the copies scheduled by ScheduleInputCopy or ScheduleOutputCopy
+   * @brief Copy the samples of a pipeline output directly to a chunked output,
+   *        without an intermediate buffer.
+   *        Call SyncStream() on the pipeline, or SyncCopies() on an event recorded
+   *        after it, to wait for the copy to finish.
+   * @param buffer_idx If non-negative, only this buffer of the chunked output is filled.
+   */
+  void ScatterOutput(const ODescr& output, int output_idx,
+                     const std::vector<SampleDestination>& dsts, int buffer_idx = -1);
+
+  /**
+   * @brief Wait for the copies scheduled by ScheduleInputCopy
    *        and wait for them to finish.
    */
   void WaitForCopies();
 
+  void ResetPipeline();
+
   /**
    * @brief Check if an input can be used without a copy.
    */
@@ -99,13 +265,12 @@ class DaliExecutor {
 
   /**
    * @brief Get an intermediate buffer located on the \p device for an input with a given \p name
+   *
+   * In the pipelined mode, every scheduled iteration uses a different set of input buffers.
    */
   IOBufferI* GetInputBuffer(const std::string& name, device_type_t device);
 
-  /**
-   * @brief Get an intermediate buffer located on the \p device for an output with a given \p name
-   */
-  IOBufferI* GetOutputBuffer(const std::string& name, device_type_t device);
+  device_type_t GetInputDevice(const std::string& name);
 
   /**
    * @brief Checks if current input has been consumed by current iteration.
@@ -119,11 +284,25 @@ class DaliExecutor {
 
   DaliPipeline pipeline_;
   ThreadPool thread_pool_;
-  std::map<std::string, IOBuffer<CPU>> cpu_buffers_;
-  std::map<std::string, IOBuffer<GPU>> gpu_buffers_;
+  std::map<std::string, IOBuffer<CPU>> cpu_input_buffers_;
+  std::map<std::string, IOBuffer<GPU>> gpu_input_buffers_;
+  std::map<std::string, device_type_t> input_devices_;
   bool inputs_consumed_ = true;
   std::vector<std::string> input_names_;
   RequestId<uint64_t> request_id_;
+
+  int pipeline_depth_ = 1;
+  size_t copy_chunk_size_ = kDefaultCopyChunkSize;
+  CopyStats input_copy_stats_{};
+  int input_slot_ = 0;
+  uint64_t generation_ = 0;
+  bool outputs_acquired_ = false;
+  // Guards the pipeline in the pipelined mode, where the inputs and outputs
+  // are handled by different threads
+  std::mutex pipeline_mutex_;
+  // Guards the staging of the inputs (the input buffers, the input_slot_ and the thread_pool_),
+  // which happens outside of the pipeline_mutex_. Taken before the pipeline_mutex_.
+  std::mutex staging_mutex_;
 };
 
 }  // namespace triton::backend::dali
@@ -88,6 +88,23 @@ void DaliPipeline::SetInput(const IDescr& io_descr, std::optional<std::string_vi
            data_id, force_no_copy);
 }
 
+void DaliPipeline::SetInputSamples(const void* const* sample_ptrs, const IOMeta& meta,
+                                   device_type_t source_device,
+                                   std::optional<std::string_view> data_id, bool force_no_copy) {
+  unsigned int flags = DALI_ext_default;
+  if (force_no_copy) {
+    flags |= DALI_ext_force_no_copy;
+  }
+  const char* name = meta.name.c_str();
+  if (data_id) {
+    daliSetExternalInputDataId(&handle_, name, data_id->data());
+  }
+  const char *layout = daliGetExternalInputLayout(&handle_, name);
+  daliSetExternalInputBatchSize(&handle_, name, meta.shape.num_samples());
+  daliSetExternalInputTensors(&handle_, name, source_device, sample_ptrs, meta.type,
+                              meta.shape.shapes.data(), meta.shape.sample_dim(), layout, flags);
+}
+
 void DaliPipeline::SyncStream() {
   if (NoGpu())
     return;
@@ -95,12 +112,35 @@ void DaliPipeline::SyncStream() {
   CUDA_CALL_GUARD(cudaStreamSynchronize(output_stream_));
 }
 
+CUDAEvent DaliPipeline::RecordCopies() {
+  if (NoGpu())
+    return {};
+  DeviceGuard dg(device_id_);
+  auto event = CUDAEventPool::instance().Get(device_id_);
+  CUDA_CALL_GUARD(cudaEventRecord(event, output_stream_));
+  return event;
+}
+
+void DaliPipeline::SyncCopies(CUDAEvent&& event) {
+  if (!event)
+    return;
+  CUDA_CALL_GUARD(cudaEventSynchronize(event));
+  CUDAEventPool::instance().Put(std::move(event), device_id_);
+}
+
 void DaliPipeline::PutOutput(void* destination, int output_idx, device_type_t destination_device) {
   assert(destination != nullptr);
   assert(output_idx >= 0);
   daliOutputCopy(&handle_, destination, output_idx, destination_device, output_stream_, 0);
 }
 
+void DaliPipeline::PutOutputSamples(void** destinations, int output_idx,
+                                    device_type_t destination_device) {
+  assert(destinations != nullptr);
+  assert(output_idx >= 0);
+  daliOutputCopySamples(&handle_, destinations, output_idx, destination_device, output_stream_, 0);
+}
+
 std::vector<std::string> DaliPipeline::ListInputs() {
   int num_inputs = daliGetNumExternalInput(&handle_);
   std::vector<std::string> result(num_inputs);
@@ -56,6 +56,7 @@ class DaliPipeline {
       max_batch_size_ = dp.max_batch_size_;
       num_threads_ = dp.num_threads_;
       device_id_ = dp.device_id_;
+      prefetch_depth_ = dp.prefetch_depth_;
       handle_ = dp.handle_;
       output_stream_ = dp.output_stream_;
 
@@ -70,12 +71,17 @@ class DaliPipeline {
     ReleaseStream();
   }
 
+  /**
+   * @param prefetch_depth Depth of the pipeline output queue, i.e. how many iterations
+   *                       can be scheduled before their outputs are released.
+   */
   DaliPipeline(const std::string& serialized_pipeline, int max_batch_size, int num_threads,
-               int device_id) :
+               int device_id, int prefetch_depth = 1) :
       serialized_pipeline_(serialized_pipeline),
       max_batch_size_(max_batch_size),
       num_threads_(num_threads),
-      device_id_(device_id) {
+      device_id_(device_id),
+      prefetch_depth_(prefetch_depth < 1 ? 1 : prefetch_depth) {
     DeviceGuard dg(device_id_);
     InitDali();
     InitStream();
@@ -91,6 +97,28 @@ class DaliPipeline {
     daliOutput(&handle_);
   }
 
+  /**
+   * @brief Schedule an iteration, keeping the outputs of the previous ones.
+   *
+   * Used in the pipelined mode. The outputs have to be acquired with ShareOutput
+   * and released with ReleaseOutput.
+   */
+  void Schedule() {
+    daliRun(&handle_);
+  }
+
+  /**
+   * @brief Wait for the outputs of the oldest scheduled iteration, without releasing
+   *        the previous ones (unlike Output).
+   */
+  void ShareOutput() {
+    daliShareOutput(&handle_);
+  }
+
+  void ReleaseOutput() {
+    daliOutputRelease(&handle_);
+  }
+
   int GetBatchSize() {
     return static_cast<int>(daliNumTensors(&handle_, 0));
   }
@@ -127,8 +155,25 @@ class DaliPipeline {
 
   void SetInput(const IDescr& io_descr, std::optional<std::string_view> data_id = {}, bool force_no_copy = true);
 
+  /**
+   * @brief Set the input from separate samples.
+   *
+   * @param sample_ptrs Pointer to each of the samples described by \p meta.
+   */
+  void SetInputSamples(const void* const* sample_ptrs, const IOMeta& meta,
+                       device_type_t source_device, std::optional<std::string_view> data_id = {},
+                       bool force_no_copy = true);
+
   void PutOutput(void* destination, int output_idx, device_type_t destination_device);
 
+  /**
+   * @brief Copy the samples of the output to separate locations.
+   *
+   * @param destinations Pointer to the destination of each sample. The samples with nullptr
+   *                     destination are not copied.
+   */
+  void PutOutputSamples(void** destinations, int output_idx, device_type_t destination_device);
+
   /**
    * @brief Get list of external inputs names in the pipeline.
    */
@@ -171,6 +216,19 @@ class DaliPipeline {
    */
   void SyncStream();
 
+  /**
+   * @brief Mark the copies scheduled on the copy stream so far.
+   *
+   * Wait for them with SyncCopies. For a CPU-only pipeline the copies are synchronous,
+   * so the returned event is empty.
+   */
+  CUDAEvent RecordCopies();
+
+  /**
+   * @brief Wait for the copies marked by the \p event and return the event to the pool.
+   */
+  void SyncCopies(CUDAEvent&& event);
+
   std::optional<std::string> TryGetOperatorTrace(std::string_view operator_name,
                                                  std::string_view trace_name);
 
@@ -179,6 +237,7 @@ class DaliPipeline {
   }
 
   void Reset() {
+    DeviceGuard dg(device_id_);
     ReleasePipeline();
     CreatePipeline();
   }
@@ -193,6 +252,11 @@ class DaliPipeline {
     return num_threads_;
   }
 
+
+  int PrefetchDepth() const {
+    return prefetch_depth_;
+  }
+
   static void LoadPluginLibs(const std::vector<std::string>& plugin_paths) {
     try {
       InitDali();
@@ -225,7 +289,7 @@ class DaliPipeline {
 
   void CreatePipeline() {
     daliCreatePipeline(&handle_, serialized_pipeline_.c_str(), serialized_pipeline_.length(),
-                       max_batch_size_, num_threads_, device_id_, 0, 1, 0, 0, 0);
+                       max_batch_size_, num_threads_, device_id_, 0, prefetch_depth_, 0, 0, 0);
   }
 
 
@@ -262,6 +326,7 @@ class DaliPipeline {
   int max_batch_size_ = 0;
   int num_threads_ = 0;
   int device_id_ = 0;
+  int prefetch_depth_ = 1;
 
   daliPipelineHandle handle_ = nullptr;
   ::cudaStream_t output_stream_ = nullptr;
@@ -22,6 +22,7 @@
 
 #include <algorithm>
 #include <catch2/catch.hpp>
+#include <thread>
 
 #include "src/dali_executor/dali_executor.h"
 #include "src/dali_executor/test/test_utils.h"
@@ -123,6 +124,326 @@ TEST_CASE("Scaling Pipeline") {
   }
 }
 
+TEST_CASE("Input buffers split inside samples") {
+  std::string pipeline_s((const char *)pipelines::scale_pipeline_str,
+                         pipelines::scale_pipeline_len);
+  DaliPipeline pipeline(pipeline_s, 256, 4, 0);
+  DaliExecutor executor(std::move(pipeline));
+  std::mt19937 rand(1217);
+  std::uniform_real_distribution<float> dist(-1.f, 1.f);
+  const int batch_size = 4, sample_size = 10;
+  std::vector<float> data(batch_size * sample_size);
+  std::generate(data.begin(), data.end(), [&]() { return dist(rand); });
+
+  IDescr input;
+  input.meta.name = "INPUT0";
+  input.meta.type = dali_data_type_t::DALI_FLOAT;
+  input.meta.shape = TensorListShape<>::make_uniform(batch_size, TensorShape<>(sample_size));
+  // The second sample is split between the first two buffers, so the input has to be copied
+  for (auto range : {std::make_pair(0, 15), std::make_pair(15, 20), std::make_pair(20, 40)}) {
+    IBufferDescr buffer;
+    buffer.device = device_type_t::CPU;
+    buffer.data = data.data() + range.first;
+    buffer.size = (range.second - range.first) * sizeof(float);
+    input.buffers.push_back(buffer);
+  }
+  auto output = executor.Run({input});
+  REQUIRE(output[0].shape == input.meta.shape);
+
+  std::vector<float> output_buffer(data.size());
+  std::vector<ODescr> output_vec(1);
+  OBufferDescr obuffer;
+  obuffer.device = device_type_t::CPU;
+  obuffer.data = output_buffer.data();
+  obuffer.size = output_buffer.size() * sizeof(float);
+  output_vec[0].buffers = {obuffer};
+  executor.PutOutputs(output_vec);
+  for (size_t i = 0; i < data.size(); ++i) {
+    REQUIRE(output_buffer[i] == data[i] * 2);
+  }
+}
+
+TEST_CASE("Chunked input copy") {
+  std::string pipeline_s((const char *)pipelines::scale_pipeline_str,
+                         pipelines::scale_pipeline_len);
+  DaliPipeline pipeline(pipeline_s, 256, 4, 0);
+  const size_t chunk_size = 12;
+  DaliExecutor executor(std::move(pipeline), 1, chunk_size);
+  std::mt19937 rand(1217);
+  std::uniform_real_distribution<float> dist(-1.f, 1.f);
+  const int batch_size = 4, sample_size = 10;
+  std::vector<float> data(batch_size * sample_size);
+  std::generate(data.begin(), data.end(), [&]() { return dist(rand); });
+
+  IDescr input;
+  input.meta.name = "INPUT0";
+  input.meta.type = dali_data_type_t::DALI_FLOAT;
+  input.meta.shape = TensorListShape<>::make_uniform(batch_size, TensorShape<>(sample_size));
+  size_t expected_chunks = 0;
+  for (auto range : {std::make_pair(0, 15), std::make_pair(15, 20), std::make_pair(20, 40)}) {
+    IBufferDescr buffer;
+    buffer.device = device_type_t::CPU;
+    buffer.data = data.data() + range.first;
+    buffer.size = (range.second - range.first) * sizeof(float);
+    input.buffers.push_back(buffer);
+    expected_chunks += (buffer.size + chunk_size - 1) / chunk_size;
+  }
+  auto output = executor.Run({input});
+  REQUIRE(output[0].shape == input.meta.shape);
+  auto copy_stats = executor.LastInputCopyStats();
+  REQUIRE(copy_stats.bytes == data.size() * sizeof(float));
+  REQUIRE(copy_stats.chunks == expected_chunks);
+  REQUIRE(copy_stats.fed_bytes == data.size() * sizeof(float));
+  REQUIRE(copy_stats.copied_inputs == 1);
+  REQUIRE(copy_stats.no_copy_inputs == 0);
+  REQUIRE(copy_stats.per_sample_inputs == 0);
+
+  std::vector<float> output_buffer(data.size());
+  std::vector<ODescr> output_vec(1);
+  OBufferDescr obuffer;
+  obuffer.device = device_type_t::CPU;
+  obuffer.data = output_buffer.data();
+  obuffer.size = output_buffer.size() * sizeof(float);
+  output_vec[0].buffers = {obuffer};
+  executor.PutOutputs(output_vec);
+  for (size_t i = 0; i < data.size(); ++i) {
+    REQUIRE(output_buffer[i] == data[i] * 2);
+  }
+}
+
+TEST_CASE("Warm-up") {
+  std::string pipeline_s((const char *)pipelines::scale_pipeline_str,
+                         pipelines::scale_pipeline_len);
+  DaliPipeline pipeline(pipeline_s, 256, 4, 0);
+  DaliExecutor executor(std::move(pipeline));
+  const int batch_size = 8, sample_size = 16;
+  std::vector<float> zeros(batch_size * sample_size, 0.f);
+  IDescr warmup_input;
+  warmup_input.meta.name = "INPUT0";
+  warmup_input.meta.type = dali_data_type_t::DALI_FLOAT;
+  warmup_input.meta.shape = TensorListShape<>::make_uniform(batch_size, TensorShape<>(sample_size));
+  IBufferDescr warmup_buffer;
+  warmup_buffer.device = device_type_t::CPU;
+  warmup_buffer.data = zeros.data();
+  warmup_buffer.size = zeros.size() * sizeof(float);
+  warmup_input.buffers.push_back(warmup_buffer);
+  REQUIRE_NOTHROW(executor.Warmup({warmup_input}, 3));
+  REQUIRE(executor.InputsConsumed());
+
+  // The warm-up data doesn't leak into the outputs of the subsequent iteration
+  std::vector<float> data = {1.f, 2.f, 3.f, 4.f};
+  IDescr input;
+  input.meta.name = "INPUT0";
+  input.meta.type = dali_data_type_t::DALI_FLOAT;
+  input.meta.shape = TensorListShape<>::make_uniform(1, TensorShape<>(data.size()));
+  IBufferDescr buffer;
+  buffer.device = device_type_t::CPU;
+  buffer.data = data.data();
+  buffer.size = data.size() * sizeof(float);
+  input.buffers.push_back(buffer);
+  auto output = executor.Run({input});
+  REQUIRE(output[0].shape == input.meta.shape);
+
+  std::vector<float> output_buffer(data.size());
+  std::vector<ODescr> output_vec(1);
+  OBufferDescr obuffer;
+  obuffer.device = device_type_t::CPU;
+  obuffer.data = output_buffer.data();
+  obuffer.size = output_buffer.size() * sizeof(float);
+  output_vec[0].buffers = {obuffer};
+  executor.PutOutputs(output_vec);
+  for (size_t i = 0; i < data.size(); ++i) {
+    REQUIRE(output_buffer[i] == data[i] * 2);
+  }
+}
+
+TEST_CASE("Interleaved executors") {
+  std::string pipeline_s((const char *)pipelines::scale_pipeline_str,
+                         pipelines::scale_pipeline_len);
+  std::vector<std::unique_ptr<DaliExecutor>> executors;
+  for (int i = 0; i < 2; i++) {
+    executors.push_back(std::make_unique<DaliExecutor>(DaliPipeline(pipeline_s, 256, 4, 0)));
+  }
+  std::vector<std::vector<float>> data = {{1.f, 2.f, 3.f}, {4.f, 5.f, 6.f, 7.f, 8.f}};
+  auto make_input = [](std::vector<float> &d) {
+    IDescr input;
+    input.meta.name = "INPUT0";
+    input.meta.type = dali_data_type_t::DALI_FLOAT;
+    input.meta.shape = TensorListShape<>::make_uniform(1, TensorShape<>(d.size()));
+    IBufferDescr buffer;
+    buffer.device = device_type_t::CPU;
+    buffer.data = d.data();
+    buffer.size = d.size() * sizeof(float);
+    input.buffers.push_back(buffer);
+    return input;
+  };
+  // The executor abandoned in the middle of a request can serve the next one
+  executors[1]->Run({make_input(data[0])});
+  executors[1]->Reset();
+  REQUIRE(executors[1]->InputsConsumed());
+
+  for (int iter = 0; iter < 3; iter++) {
+    for (size_t i = 0; i < executors.size(); i++) {
+      auto output = executors[i]->Run({make_input(data[i])});
+      REQUIRE(output[0].shape == TensorListShape<>::make_uniform(1, TensorShape<>(data[i].size())));
+      std::vector<float> output_buffer(data[i].size());
+      std::vector<ODescr> output_vec(1);
+      OBufferDescr obuffer;
+      obuffer.device = device_type_t::CPU;
+      obuffer.data = output_buffer.data();
+      obuffer.size = output_buffer.size() * sizeof(float);
+      output_vec[0].buffers = {obuffer};
+      executors[i]->PutOutputs(output_vec);
+      for (size_t j = 0; j < data[i].size(); ++j) {
+        REQUIRE(output_buffer[j] == data[i][j] * 2);
+      }
+    }
+  }
+}
+
+TEST_CASE("Executor replicas") {
+  std::string pipeline_s((const char *)pipelines::scale_pipeline_str,
+                         pipelines::scale_pipeline_len);
+  const int num_replicas = 2, num_batches = 4, batch_size = 8;
+  std::vector<std::unique_ptr<DaliExecutor>> executors;
+  for (int i = 0; i < num_replicas; i++) {
+    executors.push_back(std::make_unique<DaliExecutor>(DaliPipeline(pipeline_s, 256, 2, 0)));
+  }
+  std::vector<std::vector<float>> inputs(num_replicas * num_batches),
+                                  outputs(num_replicas * num_batches);
+  for (size_t b = 0; b < inputs.size(); b++) {
+    for (int i = 0; i < batch_size; i++) {
+      inputs[b].push_back(b * batch_size + i);
+    }
+    outputs[b].resize(batch_size);
+  }
+  // Catch2 assertions aren't thread-safe - the outputs are checked after the threads are joined
+  std::vector<std::thread> threads;
+  for (int r = 0; r < num_replicas; r++) {
+    threads.emplace_back([&, r]() {
+      for (int b = r; b < num_replicas * num_batches; b += num_replicas) {
+        IDescr input;
+        input.meta.name = "INPUT0";
+        input.meta.type = dali_data_type_t::DALI_FLOAT;
+        input.meta.shape = TensorListShape<>::make_uniform(batch_size, TensorShape<>(1));
+        IBufferDescr buffer;
+        buffer.device = device_type_t::CPU;
+        buffer.data = inputs[b].data();
+        buffer.size = batch_size * sizeof(float);
+        input.buffers.push_back(buffer);
+        executors[r]->Run({std::move(input)});
+        std::vector<ODescr> output_vec(1);
+        OBufferDescr obuffer;
+        obuffer.device = device_type_t::CPU;
+        obuffer.data = outputs[b].data();
+        obuffer.size = batch_size * sizeof(float);
+        output_vec[0].buffers = {obuffer};
+        executors[r]->PutOutputs(output_vec);
+      }
+    });
+  }
+  for (auto &thread : threads) {
+    thread.join();
+  }
+  for (size_t b = 0; b < inputs.size(); b++) {
+    for (int i = 0; i < batch_size; i++) {
+      REQUIRE(outputs[b][i] == inputs[b][i] * 2);
+    }
+  }
+}
+
+TEST_CASE("Per-buffer output completion") {
+  std::string pipeline_s((const char *)pipelines::scale_pipeline_str,
+                         pipelines::scale_pipeline_len);
+  DaliPipeline pipeline(pipeline_s, 256, 4, 0);
+  DaliExecutor executor(std::move(pipeline));
+  std::mt19937 rand(1217);
+  std::uniform_real_distribution<float> dist(-1.f, 1.f);
+  const std::vector<int> batch_sizes = {6, 1, 3};
+  std::vector<TensorListShape<>> shapes;
+  for (auto batch_size : batch_sizes) {
+    TensorListShape<> shape(batch_size, 2);
+    for (int i = 0; i < batch_size; ++i) {
+      shape.set_tensor_shape(i, TensorShape<>(i + 1, 50));
+    }
+    shapes.push_back(shape);
+  }
+  std::vector<std::vector<float>> input_buffers;
+  auto input = RandomInput(input_buffers, "INPUT0", shapes, [&]() { return dist(rand); });
+  auto output = executor.Run({input});
+
+  std::vector<std::vector<float>> output_buffers(batch_sizes.size());
+  std::vector<ODescr> output_vec(1);
+  for (size_t i = 0; i < batch_sizes.size(); ++i) {
+    output_buffers[i].resize(input_buffers[i].size());
+    OBufferDescr obuffer;
+    obuffer.device = device_type_t::CPU;
+    obuffer.data = output_buffers[i].data();
+    obuffer.size = output_buffers[i].size() * sizeof(float);
+    output_vec[0].buffers.push_back(obuffer);
+  }
+  std::vector<int> ready;
+  executor.PutOutputs(output_vec, [&](int i) {
+    // The buffer must be complete by the time it's reported
+    for (size_t j = 0; j < input_buffers[i].size(); ++j) {
+      REQUIRE(output_buffers[i][j] == input_buffers[i][j] * 2);
+    }
+    ready.push_back(i);
+  });
+  // Smaller buffers are completed first
+  REQUIRE(ready == std::vector<int>{1, 2, 0});
+}
+
+TEST_CASE("Pipelined execution") {
+  std::string pipeline_s((const char *)pipelines::scale_pipeline_str,
+                         pipelines::scale_pipeline_len);
+  const int depth = 2;
+  DaliPipeline pipeline(pipeline_s, 256, 4, 0, depth);
+  DaliExecutor executor(std::move(pipeline), depth);
+  REQUIRE(executor.Pipelined());
+  std::mt19937 rand(1217);
+  std::uniform_real_distribution<float> dist(-1.f, 1.f);
+  const std::string inp_name = "INPUT0";
+  const std::vector<int> batch_sizes = {3, 5, 4, 1};
+
+  std::vector<std::vector<std::vector<float>>> input_buffers(batch_sizes.size());
+  std::vector<uint64_t> generations;
+  std::vector<std::vector<float>> output_buffers;
+  auto complete = [&](size_t i) {
+    auto output = executor.WaitForOutputs(generations[i]);
+    REQUIRE(output[0].shape.num_samples() == batch_sizes[i]);
+    std::vector<float> output_buffer(output[0].shape.num_elements());
+    std::vector<ODescr> output_vec(1);
+    OBufferDescr obuffer;
+    obuffer.device = device_type_t::CPU;
+    obuffer.data = output_buffer.data();
+    obuffer.size = output_buffer.size() * sizeof(float);
+    output_vec[0].buffers = {obuffer};
+    executor.PutOutputs(output_vec);
+    executor.ReleaseOutputs();
+    size_t inp_size = 0;
+    for (auto &inp_buffer : input_buffers[i])
+      inp_size += inp_buffer.size();
+    coalesced_compare(output_vec[0].buffers, input_buffers[i], inp_size,
+                      [](float a) { return a * 2; });
+  };
+
+  for (size_t i = 0; i < batch_sizes.size(); ++i) {
+    TensorListShape<> shape(batch_sizes[i], 2);
+    for (int s = 0; s < batch_sizes[i]; ++s) {
+      shape.set_tensor_shape(s, TensorShape<>(s + 1, 50));
+    }
+    auto input = RandomInput(input_buffers[i], inp_name, {shape}, [&]() { return dist(rand); });
+    // Keep `depth` iterations in flight
+    if (i >= static_cast<size_t>(depth))
+      complete(i - depth);
+    generations.push_back(executor.Schedule({input}));
+  }
+  for (size_t i = batch_sizes.size() - depth; i < batch_sizes.size(); ++i) {
+    complete(i);
+  }
+}
+
 TEST_CASE("RN50 pipeline") {
   std::string pipeline_s((const char *)pipelines::rn50_gpu_dali_chr, pipelines::rn50_gpu_dali_len);
   DaliPipeline pipeline(pipeline_s, 1, 3, 0);
@@ -0,0 +1,259 @@
+// The MIT License (MIT)
+//
+// Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+
+#ifndef TRITONDALIBACKEND_EXECUTOR_POOL_H
+#define TRITONDALIBACKEND_EXECUTOR_POOL_H
+
+#include <algorithm>
+#include <condition_variable>
+#include <deque>
+#include <functional>
+#include <mutex>
+#include <thread>
+#include <utility>
+#include <vector>
+
+#include "src/error_handling.h"
+
+namespace triton { namespace backend { namespace dali {
+
+/**
+ * @brief Number of threads of each of the \p num_replicas pipelines, so that all of them
+ *        together use \p num_threads threads.
+ *
+ * Every replica gets at least one thread. A non-positive \p num_threads (DALI's default)
+ * is returned as is.
+ */
+inline int ThreadsPerReplica(int num_threads, int num_replicas) {
+  if (num_threads <= 0 || num_replicas <= 1)
+    return num_threads;
+  return std::max(num_threads / num_replicas, 1);
+}
+
+/**
+ * @brief Dispatches the batches to the replicas of a pipeline, so that many batches are
+ *        processed at once, each by an idle replica.
+ *
+ * Every replica processes the batches in a thread of its own.
+ */
+template <typename Executor, typename Batch>
+class ReplicaDispatcher {
+ public:
+  /**
+   * Processes a batch with the given executor. It must not throw, the failures of the batch
+   * have to be reported with its responses.
+   */
+  using ProcessFn = std::function<void(Executor&, Batch&)>;
+
+  ReplicaDispatcher(std::vector<Executor*> executors, ProcessFn process) :
+      idle_(std::move(executors)), process_(std::move(process)) {
+    ENFORCE(!idle_.empty(), "The dispatcher needs at least one executor.");
+    for (size_t i = 0; i < idle_.size(); i++)
+      threads_.emplace_back([this]() { Loop(); });
+  }
+
+  /**
+   * @brief Process the batches dispatched already and join the threads.
+   */
+  ~ReplicaDispatcher() {
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      stop_ = true;
+    }
+    cv_.notify_all();
+    for (auto& thread : threads_)
+      thread.join();
+  }
+
+  ReplicaDispatcher(const ReplicaDispatcher&) = delete;
+  ReplicaDispatcher& operator=(const ReplicaDispatcher&) = delete;
+
+  /**
+   * @brief Pass the \p batch to an idle replica and return without waiting for it to be processed.
+   *
+   * Blocks, while all of the replicas are busy.
+   */
+  void Dispatch(Batch batch) {
+    {
+      std::unique_lock<std::mutex> lock(mutex_);
+      cv_.wait(lock, [&]() { return !idle_.empty(); });
+      auto executor = idle_.back();
+      idle_.pop_back();
+      queue_.emplace_back(executor, std::move(batch));
+    }
+    cv_.notify_all();
+  }
+
+ private:
+  void Loop() {
+    while (true) {
+      std::pair<Executor*, Batch> item;
+      {
+        std::unique_lock<std::mutex> lock(mutex_);
+        cv_.wait(lock, [&]() { return stop_ || !queue_.empty(); });
+        if (queue_.empty())
+          return;
+        item = std::move(queue_.front());
+        queue_.pop_front();
+      }
+      process_(*item.first, item.second);
+      {
+        std::lock_guard<std::mutex> lock(mutex_);
+        idle_.push_back(item.first);
+      }
+      cv_.notify_all();
+    }
+  }
+
+  std::mutex mutex_;
+  std::condition_variable cv_;
+  std::vector<Executor*> idle_;
+  std::deque<std::pair<Executor*, Batch>> queue_;
+  bool stop_ = false;
+  ProcessFn process_;
+  std::vector<std::thread> threads_;
+};
+
+/**
+ * @brief Runs the iterations of many requests in the round-robin order, so that a request
+ *        processed in many iterations doesn't hold back the shorter ones.
+ *
+ * Every in-flight request has an executor of its own, until it's completed, so the number
+ * of the executors bounds the number of the in-flight requests. The iterations are run
+ * in a single thread.
+ */
+template <typename Executor, typename Request>
+class RequestInterleaver {
+ public:
+  /**
+   * Runs the next iteration of the request with the given executor.
+   * Returns true, if the request is completed.
+   */
+  using IterateFn = std::function<bool(Executor&, Request&)>;
+  /**
+   * Handles the failure of the request. Called in a catch block: once, when an iteration
+   * throws, and once more, if resetting the executor throws as well.
+   */
+  using FailFn = std::function<void(Request&)>;
+  /**
+   * Called, when the request is completed or has failed, before its executor is released.
+   */
+  using CompleteFn = std::function<void(Request&, bool success)>;
+
+  RequestInterleaver(std::vector<Executor*> executors, IterateFn iterate, FailFn fail,
+                     CompleteFn complete) :
+      idle_(std::move(executors)),
+      iterate_(std::move(iterate)),
+      fail_(std::move(fail)),
+      complete_(std::move(complete)) {
+    ENFORCE(!idle_.empty(), "The interleaver needs at least one executor.");
+    thread_ = std::thread([this]() { Loop(); });
+  }
+
+  /**
+   * @brief Complete the in-flight requests and join the thread.
+   */
+  ~RequestInterleaver() {
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      stop_ = true;
+    }
+    cv_.notify_all();
+    thread_.join();
+  }
+
+  RequestInterleaver(const RequestInterleaver&) = delete;
+  RequestInterleaver& operator=(const RequestInterleaver&) = delete;
+
+  /**
+   * @brief Start processing the \p request and return without waiting for its iterations.
+   *
+   * Blocks, while all of the executors are busy with the in-flight requests.
+   */
+  void Submit(Request request) {
+    {
+      std::unique_lock<std::mutex> lock(mutex_);
+      cv_.wait(lock, [&]() { return !idle_.empty(); });
+      auto executor = idle_.back();
+      idle_.pop_back();
+      in_flight_.emplace_back(executor, std::move(request));
+    }
+    cv_.notify_all();
+  }
+
+ private:
+  void Loop() {
+    while (true) {
+      std::pair<Executor*, Request> item;
+      {
+        std::unique_lock<std::mutex> lock(mutex_);
+        cv_.wait(lock, [&]() { return stop_ || !in_flight_.empty(); });
+        if (in_flight_.empty())
+          return;
+        item = std::move(in_flight_.front());
+        in_flight_.pop_front();
+      }
+      auto& executor = *item.first;
+      bool completed = false, failed = false;
+      try {
+        completed = iterate_(executor, item.second);
+      } catch (...) {
+        failed = true;
+        fail_(item.second);
+      }
+      if (failed && !executor.InputsConsumed()) {
+        // Drop the leftovers of the request, so that they are not returned for the next one
+        try {
+          executor.Reset();
+        } catch (...) { fail_(item.second); }
+      }
+      if (completed || failed) {
+        complete_(item.second, !failed);
+      }
+      {
+        std::lock_guard<std::mutex> lock(mutex_);
+        if (completed || failed) {
+          idle_.push_back(item.first);
+        } else {
+          // Go to the back of the queue, to let the other requests run their iterations
+          in_flight_.push_back(std::move(item));
+        }
+      }
+      cv_.notify_all();
+    }
+  }
+
+  std::mutex mutex_;
+  std::condition_variable cv_;
+  std::vector<Executor*> idle_;
+  std::deque<std::pair<Executor*, Request>> in_flight_;
+  bool stop_ = false;
+  IterateFn iterate_;
+  FailFn fail_;
+  CompleteFn complete_;
+  std::thread thread_;
+};
+
+}}}  // namespace triton::backend::dali
+
+#endif  // TRITONDALIBACKEND_EXECUTOR_POOL_H
@@ -0,0 +1,324 @@
+// The MIT License (MIT)
+//
+// Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+
+#include <catch2/catch.hpp>
+
+#include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <memory>
+#include <mutex>
+#include <stdexcept>
+#include <thread>
+#include <vector>
+
+#include "src/dali_executor/executor_pool.h"
+
+namespace triton { namespace backend { namespace dali { namespace test {
+
+namespace {
+
+/**
+ * @brief Executor keeping the leftovers of the request, until they are consumed or reset.
+ */
+struct FakeExecutor {
+  bool InputsConsumed() const {
+    return leftovers == 0;
+  }
+
+  void Reset() {
+    resets++;
+    if (fail_reset)
+      throw std::runtime_error("Reset failed");
+    leftovers = 0;
+  }
+
+  int leftovers = 0;
+  int owner = -1;  // the request, that the leftovers belong to
+  int resets = 0;
+  bool fail_reset = false;
+  std::atomic<int> busy{0};
+};
+
+/**
+ * @brief Blocks the threads until it's opened.
+ */
+class Gate {
+ public:
+  void Wait() {
+    std::unique_lock<std::mutex> lock(mutex_);
+    cv_.wait(lock, [&]() { return open_; });
+  }
+
+  void Open() {
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      open_ = true;
+    }
+    cv_.notify_all();
+  }
+
+ private:
+  std::mutex mutex_;
+  std::condition_variable cv_;
+  bool open_ = false;
+};
+
+std::vector<FakeExecutor*> Pointers(std::vector<std::unique_ptr<FakeExecutor>>& executors) {
+  std::vector<FakeExecutor*> ret;
+  for (auto& executor : executors)
+    ret.push_back(executor.get());
+  return ret;
+}
+
+std::vector<std::unique_ptr<FakeExecutor>> MakeExecutors(int n) {
+  std::vector<std::unique_ptr<FakeExecutor>> ret;
+  for (int i = 0; i < n; i++)
+    ret.push_back(std::make_unique<FakeExecutor>());
+  return ret;
+}
+
+}  // namespace
+
+TEST_CASE("Threads per replica") {
+  REQUIRE(ThreadsPerReplica(8, 1) == 8);
+  REQUIRE(ThreadsPerReplica(8, 2) == 4);
+  REQUIRE(ThreadsPerReplica(7, 2) == 3);
+  REQUIRE(ThreadsPerReplica(3, 4) == 1);
+  REQUIRE(ThreadsPerReplica(-1, 4) == -1);
+  REQUIRE(ThreadsPerReplica(0, 4) == 0);
+}
+
+TEST_CASE("Replica dispatcher") {
+  const int num_replicas = 3;
+  auto executors = MakeExecutors(num_replicas);
+  // Catch2 assertions aren't thread-safe - the results are checked after the threads are joined
+  std::mutex mutex;
+  std::vector<int> processed;
+  std::atomic<int> overlaps{0}, running{0}, max_running{0};
+  Gate gate;
+  auto process = [&](FakeExecutor& executor, int& batch) {
+    if (executor.busy++ != 0)
+      overlaps++;
+    int now = ++running;
+    int prev = max_running;
+    while (now > prev && !max_running.compare_exchange_weak(prev, now)) {}
+    gate.Wait();
+    running--;
+    executor.busy--;
+    std::lock_guard<std::mutex> lock(mutex);
+    processed.push_back(batch);
+  };
+
+  SECTION("Batches are processed at once, by different replicas") {
+    {
+      ReplicaDispatcher<FakeExecutor, int> dispatcher(Pointers(executors), process);
+      for (int b = 0; b < num_replicas; b++)
+        dispatcher.Dispatch(b);
+      // All of the replicas take their batches, while none of the batches is completed
+      while (running < num_replicas)
+        std::this_thread::yield();
+      gate.Open();
+      for (int b = num_replicas; b < 4 * num_replicas; b++)
+        dispatcher.Dispatch(b);
+    }
+    REQUIRE(max_running == num_replicas);
+    REQUIRE(overlaps == 0);
+    std::sort(processed.begin(), processed.end());
+    REQUIRE(processed.size() == 4 * num_replicas);
+    for (int b = 0; b < 4 * num_replicas; b++)
+      REQUIRE(processed[b] == b);
+  }
+
+  SECTION("Dispatch blocks, while all of the replicas are busy") {
+    ReplicaDispatcher<FakeExecutor, int> dispatcher(Pointers(executors), process);
+    for (int b = 0; b < num_replicas; b++)
+      dispatcher.Dispatch(b);
+    std::atomic<bool> dispatched{false};
+    std::thread producer([&]() {
+      dispatcher.Dispatch(num_replicas);
+      dispatched = true;
+    });
+    std::this_thread::sleep_for(std::chrono::milliseconds(50));
+    REQUIRE(!dispatched);
+    gate.Open();
+    producer.join();
+    REQUIRE(dispatched);
+  }
+
+  SECTION("Destruction processes the dispatched batches") {
+    std::thread opener;
+    {
+      ReplicaDispatcher<FakeExecutor, int> dispatcher(Pointers(executors), process);
+      for (int b = 0; b < num_replicas; b++)
+        dispatcher.Dispatch(b);
+      opener = std::thread([&]() {
+        std::this_thread::sleep_for(std::chrono::milliseconds(20));
+        gate.Open();
+      });
+    }
+    opener.join();
+    REQUIRE(processed.size() == num_replicas);
+  }
+}
+
+namespace {
+
+struct TestRequest {
+  int id = -1;
+  int iterations = 0;  // the request is completed after this many iterations
+  int fail_at = -1;    // the iteration, which throws
+};
+
+/**
+ * @brief Records the calls of the interleaver's callbacks.
+ */
+struct InterleaveLog {
+  void Iterate(FakeExecutor& executor, TestRequest& request) {
+    std::lock_guard<std::mutex> lock(mutex);
+    if (executor.busy++ != 0)
+      overlaps++;
+    if (!executor.InputsConsumed() && executor.owner != request.id)
+      leaks++;  // the executor would return the leftovers of another request
+    order.push_back(request.id);
+  }
+
+  std::mutex mutex;
+  std::vector<int> order, completed, failed, fail_calls;
+  int overlaps = 0, leaks = 0;
+};
+
+using Interleaver = RequestInterleaver<FakeExecutor, TestRequest>;
+
+std::unique_ptr<Interleaver> MakeInterleaver(
+    std::vector<std::unique_ptr<FakeExecutor>>& executors, InterleaveLog& log,
+    std::function<void(TestRequest&)> before_iteration = {}) {
+  auto iterate = [&log, before_iteration](FakeExecutor& executor, TestRequest& request) {
+    if (before_iteration)
+      before_iteration(request);
+    log.Iterate(executor, request);
+    if (executor.InputsConsumed()) {
+      executor.leftovers = request.iterations;
+      executor.owner = request.id;
+    }
+    bool fail = request.fail_at == request.iterations - executor.leftovers;
+    executor.leftovers--;
+    executor.busy--;
+    if (fail)
+      throw std::runtime_error("Iteration failed");
+    return executor.InputsConsumed();
+  };
+  auto fail = [&log](TestRequest& request) {
+    std::lock_guard<std::mutex> lock(log.mutex);
+    log.fail_calls.push_back(request.id);
+  };
+  auto complete = [&log](TestRequest& request, bool success) {
+    std::lock_guard<std::mutex> lock(log.mutex);
+    (success ? log.completed : log.failed).push_back(request.id);
+  };
+  return std::make_unique<Interleaver>(Pointers(executors), iterate, fail, complete);
+}
+
+}  // namespace
+
+TEST_CASE("Request interleaver") {
+  InterleaveLog log;
+
+  SECTION("Iterations are run in the round-robin order") {
+    auto executors = MakeExecutors(3);
+    Gate submitted;
+    auto interleaver = MakeInterleaver(executors, log, [&](TestRequest& request) {
+      if (request.id == 0)
+        submitted.Wait();
+    });
+    interleaver->Submit({0, 3});
+    interleaver->Submit({1, 1});
+    interleaver->Submit({2, 2});
+    submitted.Open();
+    interleaver.reset();
+    REQUIRE(log.order == std::vector<int>{0, 1, 2, 0, 2, 0});
+    REQUIRE(log.completed == std::vector<int>{1, 2, 0});
+    REQUIRE(log.failed.empty());
+    REQUIRE(log.overlaps == 0);
+    REQUIRE(log.leaks == 0);
+  }
+
+  SECTION("The number of the in-flight requests is bounded by the number of executors") {
+    auto executors = MakeExecutors(2);
+    Gate finish;
+    auto interleaver = MakeInterleaver(executors, log, [&](TestRequest&) { finish.Wait(); });
+    std::atomic<int> submitted{0};
+    std::thread producer([&]() {
+      for (int r = 0; r < 3; r++) {
+        interleaver->Submit({r, 2});
+        submitted++;
+      }
+    });
+    std::this_thread::sleep_for(std::chrono::milliseconds(50));
+    // The third request waits for an executor
+    REQUIRE(submitted == 2);
+    finish.Open();
+    producer.join();
+    interleaver.reset();
+    REQUIRE(submitted == 3);
+    REQUIRE(log.completed.size() == 3);
+    REQUIRE(log.overlaps == 0);
+    REQUIRE(log.leaks == 0);
+  }
+
+  SECTION("The executor of a failed request is reset and reused") {
+    auto executors = MakeExecutors(1);
+    auto interleaver = MakeInterleaver(executors, log);
+    interleaver->Submit({0, 3, 1});
+    interleaver->Submit({1, 2});
+    interleaver.reset();
+    REQUIRE(log.order == std::vector<int>{0, 0, 1, 1});
+    REQUIRE(log.failed == std::vector<int>{0});
+    REQUIRE(log.fail_calls == std::vector<int>{0});
+    REQUIRE(log.completed == std::vector<int>{1});
+    REQUIRE(executors[0]->resets == 1);
+    REQUIRE(log.leaks == 0);
+  }
+
+  SECTION("The executor isn't reset, when the failed request consumed its inputs") {
+    auto executors = MakeExecutors(1);
+    auto interleaver = MakeInterleaver(executors, log);
+    interleaver->Submit({0, 2, 1});
+    interleaver.reset();
+    REQUIRE(log.failed == std::vector<int>{0});
+    REQUIRE(executors[0]->resets == 0);
+  }
+
+  SECTION("Failure of the reset is reported") {
+    auto executors = MakeExecutors(1);
+    executors[0]->fail_reset = true;
+    auto interleaver = MakeInterleaver(executors, log);
+    interleaver->Submit({0, 3, 0});
+    interleaver.reset();
+    REQUIRE(log.fail_calls == std::vector<int>{0, 0});
+    REQUIRE(log.failed == std::vector<int>{0});
+    REQUIRE(executors[0]->resets == 1);
+  }
+}
+
+}}}}  // namespace triton::backend::dali::test
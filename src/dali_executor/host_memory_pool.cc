@@ -0,0 +1,240 @@
+// The MIT License (MIT)
+//
+// Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+#include "src/dali_executor/host_memory_pool.h"
+
+#include <sys/mman.h>
+
+#include <algorithm>
+#include <cstdlib>
+
+#include "src/error_handling.h"
+
+namespace triton { namespace backend { namespace dali {
+
+namespace {
+
+constexpr size_t kHugePageSize = 2 << 20;
+
+size_t align_up(size_t size, size_t alignment) {
+  return (size + alignment - 1) / alignment * alignment;
+}
+
+}  // namespace
+
+HostMemoryPool &HostMemoryPool::Instance() {
+  static HostMemoryPool pool;
+  return pool;
+}
+
+HostMemoryPool::HostMemoryPool(const HostPoolOptions &options) : options_(options) {
+  ENFORCE(options_.alignment > 0 && (options_.alignment & (options_.alignment - 1)) == 0,
+          make_string("Alignment of the host memory pool has to be a power of 2. Got: ",
+                      options_.alignment));
+  trimmer_ = std::thread([this]() { TrimLoop(); });
+}
+
+HostMemoryPool::~HostMemoryPool() {
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    stop_ = true;
+  }
+  cv_.notify_all();
+  trimmer_.join();
+  ReleaseAll();
+}
+
+void HostMemoryPool::Configure(const HostPoolOptions &options) {
+  ENFORCE(options.alignment > 0 && (options.alignment & (options.alignment - 1)) == 0,
+          make_string("Alignment of the host memory pool has to be a power of 2. Got: ",
+                      options.alignment));
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    // The cached blocks might not satisfy the new options.
+    ReleaseCached(clock::time_point::max());
+    options_ = options;
+  }
+  cv_.notify_all();
+}
+
+HostPoolOptions HostMemoryPool::Options() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return options_;
+}
+
+size_t HostMemoryPool::BlockSize(size_t size) const {
+  if (options_.hugepages && size >= kHugePageSize) {
+    return align_up(size, std::max(kHugePageSize, options_.alignment));
+  }
+  return align_up(size, options_.alignment);
+}
+
+void *HostMemoryPool::AllocateBlock(size_t capacity) {
+  size_t alignment = std::max(options_.alignment, sizeof(void *));
+  bool hugepages = options_.hugepages && capacity >= kHugePageSize;
+  if (hugepages) {
+    alignment = std::max(alignment, kHugePageSize);
+  }
+  void *ptr = nullptr;
+  if (posix_memalign(&ptr, alignment, capacity) != 0) {
+    // Give the memory cached for the other sizes back and try again.
+    ReleaseCached(clock::time_point::max());
+    ENFORCE(posix_memalign(&ptr, alignment, capacity) == 0,
+            make_string("Failed to allocate ", capacity, " bytes of host memory."));
+  }
+#ifdef MADV_HUGEPAGE
+  if (hugepages) {
+    // It's only a hint, the regular pages are used if the hugepages are not available.
+    madvise(ptr, capacity, MADV_HUGEPAGE);
+  }
+#endif
+  return ptr;
+}
+
+void *HostMemoryPool::Allocate(size_t size, size_t *capacity) {
+  *capacity = 0;
+  if (size == 0) {
+    return nullptr;
+  }
+  std::lock_guard<std::mutex> lock(mutex_);
+  size_t block_size = BlockSize(size);
+  auto it = free_blocks_.lower_bound(block_size);
+  // Blocks more than twice as large are not reused, so that a small buffer doesn't pin
+  // the memory, that a large one could use.
+  if (it != free_blocks_.end() && it->first / 2 <= block_size) {
+    void *ptr = it->second.ptr;
+    *capacity = it->first;
+    stats_.cached -= it->first;
+    stats_.in_use += it->first;
+    free_blocks_.erase(it);
+    return ptr;
+  }
+  void *ptr = AllocateBlock(block_size);
+  *capacity = block_size;
+  stats_.in_use += block_size;
+  stats_.high_water_mark = std::max(stats_.high_water_mark, stats_.in_use + stats_.cached);
+  return ptr;
+}
+
+void HostMemoryPool::Free(void *ptr, size_t capacity) {
+  if (!ptr) {
+    return;
+  }
+  std::lock_guard<std::mutex> lock(mutex_);
+  stats_.in_use -= capacity;
+  stats_.cached += capacity;
+  free_blocks_.emplace(capacity, Block{ptr, clock::now()});
+}
+
+void HostMemoryPool::ReleaseCached(clock::time_point unused_since) {
+  for (auto it = free_blocks_.begin(); it != free_blocks_.end();) {
+    if (it->second.last_used <= unused_since) {
+      std::free(it->second.ptr);
+      stats_.cached -= it->first;
+      it = free_blocks_.erase(it);
+    } else {
+      ++it;
+    }
+  }
+}
+
+void HostMemoryPool::ReleaseIdle() {
+  std::lock_guard<std::mutex> lock(mutex_);
+  if (options_.release_after_idle.count() > 0) {
+    ReleaseCached(clock::now() - options_.release_after_idle);
+  }
+}
+
+void HostMemoryPool::ReleaseAll() {
+  std::lock_guard<std::mutex> lock(mutex_);
+  ReleaseCached(clock::time_point::max());
+}
+
+HostPoolStats HostMemoryPool::Stats() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return stats_;
+}
+
+void HostMemoryPool::SetStatsListener(StatsListener listener, std::chrono::milliseconds period) {
+  ENFORCE(!listener || period.count() > 0,
+          make_string("The period of the host memory pool statistics has to be positive. Got: ",
+                      period.count(), " ms"));
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    listener_ = std::move(listener);
+    listener_period_ = listener_ ? period : std::chrono::milliseconds(0);
+  }
+  // Let the trimmer thread pick up the new period
+  cv_.notify_all();
+}
+
+std::chrono::milliseconds HostMemoryPool::TrimPeriod() const {
+  auto release_period = options_.release_after_idle;
+  if (release_period.count() == 0 || listener_period_.count() == 0) {
+    return std::max(release_period, listener_period_);
+  }
+  return std::min(release_period, listener_period_);
+}
+
+void HostMemoryPool::TrimLoop() {
+  std::unique_lock<std::mutex> lock(mutex_);
+  HostPoolStats reported{};
+  while (!stop_) {
+    auto period = TrimPeriod();
+    if (period.count() == 0) {
+      cv_.wait(lock);
+      continue;
+    }
+    cv_.wait_for(lock, period);
+    if (stop_) {
+      break;
+    }
+    if (options_.release_after_idle.count() > 0) {
+      ReleaseCached(clock::now() - options_.release_after_idle);
+    }
+    // The gauges are updated here, so that the allocations don't pay for it
+    if (listener_ && (stats_.in_use != reported.in_use || stats_.cached != reported.cached ||
+                      stats_.high_water_mark != reported.high_water_mark)) {
+      reported = stats_;
+      listener_(reported);
+    }
+  }
+}
+
+void HostBuffer::resize(size_t size) {
+  if (size > capacity_ || size < capacity_ / 4) {
+    reset();
+    data_ = static_cast<uint8_t *>(pool_->Allocate(size, &capacity_));
+  }
+  size_ = size;
+}
+
+void HostBuffer::reset() {
+  if (data_) {
+    pool_->Free(data_, capacity_);
+  }
+  data_ = nullptr;
+  size_ = 0;
+  capacity_ = 0;
+}
+
+}}}  // namespace triton::backend::dali
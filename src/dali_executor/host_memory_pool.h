@@ -0,0 +1,226 @@
+// The MIT License (MIT)
+//
+// Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+#ifndef TRITONDALIBACKEND_HOST_MEMORY_POOL_H
+#define TRITONDALIBACKEND_HOST_MEMORY_POOL_H
+
+#include <chrono>
+#include <condition_variable>
+#include <cstdint>
+#include <functional>
+#include <map>
+#include <mutex>
+#include <thread>
+#include <utility>
+
+namespace triton { namespace backend { namespace dali {
+
+struct HostPoolOptions {
+  /** Alignment of the allocated blocks. */
+  size_t alignment = 64;
+
+  /** Back the large blocks with transparent hugepages. */
+  bool hugepages = false;
+
+  /**
+   * The cached blocks, that were not reused for that long, are returned to the system.
+   * Zero means that the cached blocks are kept until the pool is destroyed.
+   */
+  std::chrono::milliseconds release_after_idle{10000};
+};
+
+struct HostPoolStats {
+  /** Bytes held by the buffers. */
+  size_t in_use = 0;
+
+  /** Bytes cached in the pool for reuse. */
+  size_t cached = 0;
+
+  /** The peak number of bytes held by the pool (in use + cached). */
+  size_t high_water_mark = 0;
+};
+
+/**
+ * @brief Pool of the host memory blocks.
+ *
+ * The blocks are not initialized. Freed blocks are cached and reused by the subsequent
+ * allocations, so that under a steady load the pool stays at its high-water mark and
+ * no memory is allocated. The blocks, which stay unused for `release_after_idle`,
+ * are returned to the system.
+ */
+class HostMemoryPool {
+ public:
+  /**
+   * @brief The pool used by the host IOBuffers.
+   */
+  static HostMemoryPool &Instance();
+
+  explicit HostMemoryPool(const HostPoolOptions &options = {});
+
+  ~HostMemoryPool();
+
+  HostMemoryPool(const HostMemoryPool &) = delete;
+  HostMemoryPool &operator=(const HostMemoryPool &) = delete;
+
+  /**
+   * @brief Change the options of the pool. The cached blocks are released.
+   */
+  void Configure(const HostPoolOptions &options);
+
+  HostPoolOptions Options() const;
+
+  /**
+   * @brief Allocate an uninitialized block of at least `size` bytes.
+   * @param capacity Actual size of the block, that has to be passed to `Free`.
+   * @return Pointer to the block or nullptr, if the `size` is 0.
+   */
+  void *Allocate(size_t size, size_t *capacity);
+
+  /**
+   * @brief Return the block to the pool.
+   */
+  void Free(void *ptr, size_t capacity);
+
+  /**
+   * @brief Return the cached blocks, that were idle for longer than `release_after_idle`,
+   *        to the system.
+   */
+  void ReleaseIdle();
+
+  /**
+   * @brief Return all the cached blocks to the system.
+   */
+  void ReleaseAll();
+
+  HostPoolStats Stats() const;
+
+  using StatsListener = std::function<void(const HostPoolStats &)>;
+
+  /**
+   * @brief Set a callback, that the trimmer thread notifies with the statistics every `period`,
+   *        if they changed since the previous notification. The listener is called with
+   *        the pool locked, so it must not use the pool.
+   */
+  void SetStatsListener(StatsListener listener,
+                        std::chrono::milliseconds period = std::chrono::milliseconds(1000));
+
+ private:
+  using clock = std::chrono::steady_clock;
+
+  struct Block {
+    void *ptr;
+    clock::time_point last_used;
+  };
+
+  size_t BlockSize(size_t size) const;
+
+  void *AllocateBlock(size_t capacity);
+
+  void ReleaseCached(clock::time_point unused_since);
+
+  /**
+   * @brief How long the trimmer thread sleeps between the checks. Zero means until notified.
+   */
+  std::chrono::milliseconds TrimPeriod() const;
+
+  void TrimLoop();
+
+  mutable std::mutex mutex_;
+  std::condition_variable cv_;
+  HostPoolOptions options_;
+  std::multimap<size_t, Block> free_blocks_;
+  HostPoolStats stats_;
+  StatsListener listener_;
+  std::chrono::milliseconds listener_period_{0};
+  bool stop_ = false;
+  std::thread trimmer_;
+};
+
+/**
+ * @brief Host buffer backed by the HostMemoryPool.
+ *
+ * Unlike std::vector, resizing the buffer does not initialize the memory. The contents
+ * of the buffer are not preserved when it is reallocated.
+ */
+class HostBuffer {
+ public:
+  explicit HostBuffer(HostMemoryPool &pool = HostMemoryPool::Instance()) : pool_(&pool) {}
+
+  HostBuffer(HostBuffer &&other) noexcept {
+    *this = std::move(other);
+  }
+
+  HostBuffer &operator=(HostBuffer &&other) noexcept {
+    if (this != &other) {
+      reset();
+      pool_ = other.pool_;
+      data_ = other.data_;
+      size_ = other.size_;
+      capacity_ = other.capacity_;
+      other.data_ = nullptr;
+      other.size_ = other.capacity_ = 0;
+    }
+    return *this;
+  }
+
+  HostBuffer(const HostBuffer &) = delete;
+  HostBuffer &operator=(const HostBuffer &) = delete;
+
+  ~HostBuffer() {
+    reset();
+  }
+
+  /**
+   * @brief Resize the buffer. The buffer is reallocated when it grows beyond its capacity
+   *        or shrinks below a quarter of it, so that the memory of a buffer,
+   *        that once got a very large input, can go back to the pool.
+   */
+  void resize(size_t size);
+
+  void reset();
+
+  uint8_t *data() {
+    return data_;
+  }
+
+  const uint8_t *data() const {
+    return data_;
+  }
+
+  size_t size() const {
+    return size_;
+  }
+
+  size_t capacity() const {
+    return capacity_;
+  }
+
+ private:
+  HostMemoryPool *pool_ = nullptr;
+  uint8_t *data_ = nullptr;
+  size_t size_ = 0;
+  size_t capacity_ = 0;
+};
+
+}}}  // namespace triton::backend::dali
+
+#endif  // TRITONDALIBACKEND_HOST_MEMORY_POOL_H
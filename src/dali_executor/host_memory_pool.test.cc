@@ -0,0 +1,183 @@
+// The MIT License (MIT)
+//
+// Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+#include <catch2/catch.hpp>
+
+#include <cstring>
+#include <mutex>
+#include <thread>
+
+#include "src/dali_executor/host_memory_pool.h"
+
+namespace triton { namespace backend { namespace dali { namespace test {
+
+TEST_CASE("HostMemoryPool reuse") {
+  HostPoolOptions options;
+  options.release_after_idle = std::chrono::milliseconds(0);
+  HostMemoryPool pool(options);
+  size_t capacity;
+  void *ptr = pool.Allocate(1000, &capacity);
+  REQUIRE(ptr != nullptr);
+  REQUIRE(capacity >= 1000);
+  REQUIRE(reinterpret_cast<uintptr_t>(ptr) % options.alignment == 0);
+  std::memset(ptr, 0xAB, 1000);
+  REQUIRE(pool.Stats().in_use == capacity);
+
+  pool.Free(ptr, capacity);
+  auto stats = pool.Stats();
+  REQUIRE(stats.in_use == 0);
+  REQUIRE(stats.cached == capacity);
+
+  SECTION("Same size") {
+    size_t capacity2;
+    void *ptr2 = pool.Allocate(1000, &capacity2);
+    REQUIRE(ptr2 == ptr);
+    REQUIRE(capacity2 == capacity);
+    REQUIRE(pool.Stats().cached == 0);
+    pool.Free(ptr2, capacity2);
+  }
+
+  SECTION("Much smaller size") {
+    size_t capacity2;
+    void *ptr2 = pool.Allocate(10, &capacity2);
+    REQUIRE(ptr2 != ptr);
+    REQUIRE(capacity2 < capacity);
+    REQUIRE(pool.Stats().high_water_mark == capacity + capacity2);
+    pool.Free(ptr2, capacity2);
+  }
+
+  pool.ReleaseAll();
+  REQUIRE(pool.Stats().cached == 0);
+  REQUIRE(pool.Stats().high_water_mark > 0);
+}
+
+TEST_CASE("HostMemoryPool alignment") {
+  HostPoolOptions options;
+  options.alignment = 4096;
+  options.release_after_idle = std::chrono::milliseconds(0);
+  HostMemoryPool pool(options);
+  size_t capacity;
+  void *ptr = pool.Allocate(100, &capacity);
+  REQUIRE(reinterpret_cast<uintptr_t>(ptr) % 4096 == 0);
+  REQUIRE(capacity == 4096);
+  pool.Free(ptr, capacity);
+
+  options.alignment = 3;
+  REQUIRE_THROWS(pool.Configure(options));
+}
+
+TEST_CASE("HostMemoryPool hugepages") {
+  HostPoolOptions options;
+  options.hugepages = true;
+  options.release_after_idle = std::chrono::milliseconds(0);
+  HostMemoryPool pool(options);
+  size_t capacity;
+  void *ptr = pool.Allocate(3 << 20, &capacity);
+  REQUIRE(reinterpret_cast<uintptr_t>(ptr) % (2 << 20) == 0);
+  REQUIRE(capacity == (4 << 20));
+  pool.Free(ptr, capacity);
+}
+
+TEST_CASE("HostMemoryPool release after idle") {
+  HostPoolOptions options;
+  options.release_after_idle = std::chrono::milliseconds(10);
+  HostMemoryPool pool(options);
+  size_t notified_cached = 1;
+  pool.SetStatsListener([&](const HostPoolStats &stats) { notified_cached = stats.cached; });
+  size_t capacity;
+  void *ptr = pool.Allocate(1000, &capacity);
+  pool.Free(ptr, capacity);
+  REQUIRE(pool.Stats().cached == capacity);
+  for (int i = 0; i < 100 && pool.Stats().cached > 0; i++) {
+    std::this_thread::sleep_for(std::chrono::milliseconds(10));
+  }
+  REQUIRE(pool.Stats().cached == 0);
+  pool.SetStatsListener({});
+  REQUIRE(notified_cached == 0);
+}
+
+TEST_CASE("HostMemoryPool periodic statistics") {
+  HostPoolOptions options;
+  options.release_after_idle = std::chrono::milliseconds(0);
+  HostMemoryPool pool(options);
+  std::mutex mutex;
+  HostPoolStats notified{};
+  int notifications = 0;
+  pool.SetStatsListener(
+      [&](const HostPoolStats &stats) {
+        std::lock_guard<std::mutex> lock(mutex);
+        notified = stats;
+        notifications++;
+      },
+      std::chrono::milliseconds(5));
+  auto wait_for = [&](auto predicate) {
+    for (int i = 0; i < 200; i++) {
+      {
+        std::lock_guard<std::mutex> lock(mutex);
+        if (predicate())
+          return true;
+      }
+      std::this_thread::sleep_for(std::chrono::milliseconds(5));
+    }
+    return false;
+  };
+  size_t capacity;
+  void *ptr = pool.Allocate(1000, &capacity);
+  // The allocations don't release anything, the statistics are reported anyway
+  REQUIRE(wait_for([&]() { return notified.in_use == capacity; }));
+  REQUIRE(notified.high_water_mark == capacity);
+  pool.Free(ptr, capacity);
+  REQUIRE(wait_for([&]() { return notified.in_use == 0 && notified.cached == capacity; }));
+  // Unchanged statistics are not reported again
+  int count = notifications;
+  std::this_thread::sleep_for(std::chrono::milliseconds(30));
+  {
+    std::lock_guard<std::mutex> lock(mutex);
+    REQUIRE(notifications == count);
+  }
+  pool.SetStatsListener({});
+}
+
+TEST_CASE("HostBuffer resize") {
+  HostPoolOptions options;
+  options.release_after_idle = std::chrono::milliseconds(0);
+  HostMemoryPool pool(options);
+  {
+    HostBuffer buffer(pool);
+    REQUIRE(buffer.data() == nullptr);
+    buffer.resize(1000);
+    auto *data = buffer.data();
+    REQUIRE(buffer.size() == 1000);
+    buffer.resize(500);
+    REQUIRE(buffer.data() == data);
+    REQUIRE(buffer.size() == 500);
+    buffer.resize(100);
+    REQUIRE(buffer.capacity() < 1000);
+    REQUIRE(buffer.size() == 100);
+    HostBuffer moved(std::move(buffer));
+    REQUIRE(buffer.data() == nullptr);
+    REQUIRE(moved.size() == 100);
+  }
+  REQUIRE(pool.Stats().in_use == 0);
+}
+
+}}}}  // namespace triton::backend::dali::test
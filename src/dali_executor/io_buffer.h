@@ -23,6 +23,7 @@
 #ifndef TRITONDALIBACKEND_IO_BUFFER_H
 #define TRITONDALIBACKEND_IO_BUFFER_H
 
+#include "src/dali_executor/host_memory_pool.h"
 #include "src/dali_executor/io_descriptor.h"
 #include "src/dali_executor/utils/dali.h"
 
@@ -36,6 +37,7 @@ class IOBufferI {
  public:
   /**
    * @brief Resize the buffer to a given szie.
+   *        The contents of the buffer are not preserved, if it's reallocated.
    * @param size New size.
    */
   virtual void resize(size_t size) = 0;
@@ -64,8 +66,8 @@ class IOBufferI {
   IOBufferI() {}
 };
 
-template<typename T, device_type_t Dev>
-using buffer_t = std::conditional_t<Dev == device_type_t::CPU, std::vector<T>, DeviceBuffer<T>>;
+template<device_type_t Dev>
+using buffer_t = std::conditional_t<Dev == device_type_t::CPU, HostBuffer, DeviceBuffer<uint8_t>>;
 
 template<device_type_t Dev>
 class IOBuffer : public IOBufferI {
@@ -104,7 +106,7 @@ class IOBuffer : public IOBufferI {
   }
 
  private:
-  buffer_t<uint8_t, Dev> buffer_;
+  buffer_t<Dev> buffer_;
   int device_id_ = 0;
 };
 
@@ -24,6 +24,8 @@
 #define DALI_BACKEND_UTILS_DALI_H_
 
 #include <dali/c_api.h>
+#include <dali/core/cuda_event.h>
+#include <dali/core/cuda_event_pool.h>
 #include <dali/core/cuda_stream.h>
 #include <dali/core/dev_buffer.h>
 #include <dali/core/device_guard.h>
@@ -42,6 +44,8 @@ using ::dali::copyD2D;
 using ::dali::copyD2H;
 using ::dali::copyH2D;
 using ::dali::copyH2H;
+using ::dali::CUDAEvent;
+using ::dali::CUDAEventPool;
 using ::dali::CUDAStream;
 using ::dali::DALIException;
 using ::dali::DeviceBuffer;
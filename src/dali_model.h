@@ -23,14 +23,22 @@
 #ifndef DALI_BACKEND_DALI_MODEL_H_
 #define DALI_BACKEND_DALI_MODEL_H_
 
+#include <dlfcn.h>
+#include <sys/stat.h>
+
 #include <atomic>
 
 #include "parameters.h"
 #include "src/config_tools/config_tools.h"
 #include "src/dali_executor/dali_pipeline.h"
 #include "src/dali_executor/utils/dali.h"
+#include "src/metrics.h"
+#include "src/model_provider/autoserialize_cache.h"
+#include "src/model_provider/autoserialize_worker.h"
 #include "src/model_provider/model_provider.h"
 #include "src/parameters.h"
+#include "src/response_cache/response_cache.h"
+#include "src/sticky_inputs/sticky_inputs.h"
 #include "src/utils/triton.h"
 #include "src/utils/utils.h"
 #include "triton/backend/backend_common.h"
@@ -60,6 +68,8 @@ class DaliModel : public ::triton::backend::BackendModel {
                 (std::string("model configuration:\n") + buffer.Contents()).c_str());
     try {
       ValidateConfig(model_config_, pipeline_inputs_, pipeline_outputs_, Batched());
+      if (sticky_inputs_)
+        sticky_inputs_->Validate(ReadInputsConfig(model_config_, Batched()));
     } catch (TritonError& err) {
       return err.release();
     }
@@ -121,6 +131,50 @@ class DaliModel : public ::triton::backend::BackendModel {
     return !(config_max_batch_size_.has_value() && config_max_batch_size_ == 0);
   }
 
+  /**
+   * @brief Execution metrics of the model, shared by its instances. Null, if not available.
+   */
+  const ModelMetrics* Metrics() const {
+    return metrics_.get();
+  }
+
+  void SetMetrics(std::unique_ptr<ModelMetrics> metrics) {
+    metrics_ = std::move(metrics);
+  }
+
+  /**
+   * @brief Cache of the pipeline outputs, shared by the instances of the model.
+   *        Null, if the cache is disabled.
+   */
+  ResponseCache* GetResponseCache() {
+    return response_cache_.get();
+  }
+
+  bool HasOutputsToSplit() const {
+    return !outputs_to_split_.empty();
+  }
+
+  /**
+   * @brief Can the model send many responses for a request, after the request is released
+   *        (`model_transaction_policy { decoupled: true }`).
+   */
+  bool Decoupled() {
+    common::TritonJson::Value policy;
+    bool decoupled = false;
+    if (model_config_.Find("model_transaction_policy", &policy) && policy.Find("decoupled")) {
+      TRITON_CALL_GUARD(policy.MemberAsBool("decoupled", &decoupled));
+    }
+    return decoupled;
+  }
+
+  /**
+   * @brief Inputs kept between the requests, shared by the instances of the model.
+   *        Null, if the model has no sticky inputs.
+   */
+  StickyInputs* GetStickyInputs() {
+    return sticky_inputs_.get();
+  }
+
  private:
   explicit DaliModel(TRITONBACKEND_Model* triton_model) :
       BackendModel(triton_model), params_(model_config_), backend_params_(triton_model) {
@@ -146,6 +200,7 @@ class DaliModel : public ::triton::backend::BackendModel {
     fallback_model << model_path << fallback_model_filename_;
 
     ReadParams();
+    LoadStickyInputs(model_path);
 
     LoadModel(default_model.str(), fallback_model.str());
     ReadPipelineProperties();
@@ -157,6 +212,33 @@ class DaliModel : public ::triton::backend::BackendModel {
 
   void ReadParams() {
     outputs_to_split_ = params_.GetOutputsToSplit();
+    auto response_cache_size_mb = params_.GetResponseCacheSizeMb();
+    if (response_cache_size_mb > 0) {
+      response_cache_ =
+          std::make_unique<ResponseCache>(static_cast<size_t>(response_cache_size_mb) << 20);
+    }
+    auto sticky_inputs = params_.GetStickyInputs();
+    if (!sticky_inputs.empty()) {
+      sticky_inputs_ = std::make_unique<StickyInputs>(std::move(sticky_inputs), Batched());
+    }
+  }
+
+  /**
+   * Registers the initial values of the sticky inputs, stored as `<input name>.npy`
+   * in the model version directory. The inputs without such file have to be provided
+   * by the first request.
+   */
+  void LoadStickyInputs(const std::string& model_path) {
+    if (!sticky_inputs_)
+      return;
+    for (auto& name : sticky_inputs_->Names()) {
+      auto path = make_string(model_path, name, ".npy");
+      if (!std::ifstream(path).good())
+        continue;
+      sticky_inputs_->Load(path, name);
+      LOG_MESSAGE(TRITONSERVER_LOG_VERBOSE,
+                  make_string("Sticky input ", name, " loaded from file: ", path).c_str());
+    }
   }
 
   /**
@@ -184,7 +266,7 @@ class DaliModel : public ::triton::backend::BackendModel {
       load_succeeded = true;
 
     // Serialized model could not be loaded, try to autoserialize model from the default location.
-    if (!load_succeeded && TryLoadModel<AutoserializeModelProvider>(model_filename, target))
+    if (!load_succeeded && TryAutoserializeModel(model_filename, target))
       load_succeeded = true;
 
     if (!load_succeeded) {
@@ -196,7 +278,7 @@ class DaliModel : public ::triton::backend::BackendModel {
 
       model_filename = fallback_model_filename;
       // Fallback location may only represent the unserialized model.
-      if (TryLoadModel<AutoserializeModelProvider>(model_filename, target))
+      if (TryAutoserializeModel(model_filename, target))
         load_succeeded = true;
     }
 
@@ -239,6 +321,72 @@ class DaliModel : public ::triton::backend::BackendModel {
   }
 
 
+  /**
+   * Try to autoserialize a model defined in the `module_path`.
+   *
+   * If the autoserialization cache is enabled, the serialized model is reused when both the
+   * model definition and DALI version match the cached one.
+   *
+   * @return True, if the model has been loaded successfully.
+   */
+  bool TryAutoserializeModel(const std::string& module_path, const std::string& target) {
+    auto cache_dir = backend_params_.GetAutoserializeCacheDir();
+    if (cache_dir.empty()) {
+      return TryLoadAutoserializedModel(module_path, target);
+    }
+
+    AutoserializeCache cache(cache_dir, DaliVersionId());
+    std::string key;
+    try {
+      key = cache.Key(FileModelProvider(module_path).GetModel());
+    } catch (const std::runtime_error& e) {
+      LOG_MESSAGE(TRITONSERVER_LOG_VERBOSE,
+                  (make_string("Loading model failed: ", e.what()).c_str()));
+      return false;
+    }
+    if (cache.Contains(key) && TryLoadModel<FileModelProvider>(cache.EntryPath(key))) {
+      LOG_MESSAGE(TRITONSERVER_LOG_VERBOSE,
+                  make_string("Autoserialized DALI pipeline loaded from cache: ",
+                              cache.EntryPath(key))
+                      .c_str());
+      return true;
+    }
+
+    if (!TryLoadAutoserializedModel(module_path, target))
+      return false;
+    try {
+      cache.Put(key, GetModelProvider().GetModel());
+    } catch (const std::exception& e) {
+      LOG_MESSAGE(TRITONSERVER_LOG_WARN,
+                  make_string("Failed to store the autoserialized pipeline in the cache: ",
+                              e.what())
+                      .c_str());
+    }
+    return true;
+  }
+
+  bool TryLoadAutoserializedModel(const std::string& module_path, const std::string& target) {
+    if (backend_params_.UseAutoserializeWorker()) {
+      return TryLoadModel<WorkerAutoserializeModelProvider>(module_path);
+    }
+    return TryLoadModel<AutoserializeModelProvider>(module_path, target);
+  }
+
+  /**
+   * Identifies the DALI version, that the serialized pipelines have to be compatible with:
+   * the version the backend was built with and the DALI library it's running with.
+   */
+  static std::string DaliVersionId() {
+    std::string id = DALI_BUILD_VERSION;
+    Dl_info info;
+    struct stat lib_stat;
+    if (dladdr(reinterpret_cast<void*>(&daliCreatePipeline), &info) && info.dli_fname &&
+        stat(info.dli_fname, &lib_stat) == 0) {
+      id = make_string(id, ";", info.dli_fname, ";", lib_stat.st_size, ";", lib_stat.st_mtime);
+    }
+    return id;
+  }
+
   std::string GetModelFilename() {
     std::string ret;
     TRITON_CALL_GUARD(model_config_.MemberAsString("default_model_filename", &ret));
@@ -357,6 +505,9 @@ class DaliModel : public ::triton::backend::BackendModel {
   BackendParameters backend_params_;
   std::vector<std::string> outputs_to_split_;
   std::unique_ptr<ModelProvider> dali_model_provider_;
+  std::unique_ptr<ModelMetrics> metrics_;
+  std::unique_ptr<ResponseCache> response_cache_;
+  std::unique_ptr<StickyInputs> sticky_inputs_;
   std::unordered_map<std::string, int> output_order_;
   std::vector<IOConfig> pipeline_inputs_{};
   std::vector<IOConfig> pipeline_outputs_{};
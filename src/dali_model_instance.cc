@@ -22,6 +22,8 @@
 
 #include "src/dali_model_instance.h"
 
+#include <algorithm>
+
 namespace triton { namespace backend { namespace dali {
 
 /**
@@ -79,9 +81,15 @@ TRITONSERVER_Error* DaliModelInstance::Create(DaliModel* model_state,
   return error;  // success
 }
 
-void DaliModelInstance::Execute(const std::vector<TritonRequest>& requests) {
-  if (dali_model_->Batched()) {
+void DaliModelInstance::Execute(std::vector<TritonRequest> requests) {
+  if (dali_executor_->Pipelined()) {
+    ExecutePipelined(std::move(requests));
+  } else if (Replicated()) {
+    ExecuteReplicated(std::move(requests));
+  } else if (dali_model_->Batched()) {
     ExecuteBatched(requests);
+  } else if (Interleaved()) {
+    ExecuteInterleaved(std::move(requests));
   } else {
     ExecuteUnbatched(requests);
   }
@@ -92,24 +100,267 @@ void DaliModelInstance::ExecuteBatched(const std::vector<TritonRequest>& request
   TimeInterval exec_interval{};
   start_timer_ns(exec_interval);
   auto responses = CreateResponses(requests);
+  std::vector<int64_t> sent_ns(requests.size(), 0);
   ProcessingMeta proc_meta{};
   TritonError error{};
   try {
-    proc_meta = ProcessRequests(requests, responses);
+    proc_meta = ProcessRequests(*dali_executor_, requests, responses, sent_ns);
   } catch (...) { error = ErrorHandler(); }
+  FinalizeBatch(requests, responses, sent_ns, exec_interval, proc_meta, error);
+}
+
+void DaliModelInstance::ExecuteReplicated(std::vector<TritonRequest> requests) {
+  ReplicaBatch batch{};
+  start_timer_ns(batch.exec_interval);
+  batch.requests = std::move(requests);
+  replica_dispatcher_->Dispatch(std::move(batch));
+}
+
+void DaliModelInstance::StartReplicaDispatcher() {
+  std::vector<DaliExecutor*> executors = {dali_executor_.get()};
+  for (auto& executor : replica_executors_) {
+    executors.push_back(executor.get());
+  }
+  auto process = [this](DaliExecutor& executor, ReplicaBatch& batch) {
+    DeviceGuard dg(GetDaliDeviceId());
+    auto responses = CreateResponses(batch.requests);
+    std::vector<int64_t> sent_ns(batch.requests.size(), 0);
+    ProcessingMeta proc_meta{};
+    TritonError error{};
+    try {
+      proc_meta = ProcessRequests(executor, batch.requests, responses, sent_ns);
+    } catch (...) { error = ErrorHandler(); }
+    FinalizeBatch(batch.requests, responses, sent_ns, batch.exec_interval, proc_meta, error);
+  };
+  replica_dispatcher_ = std::make_unique<ReplicaDispatcher<DaliExecutor, ReplicaBatch>>(
+      std::move(executors), process);
+}
+
+void DaliModelInstance::Warmup(int iterations) {
+  TimeRange tr("[DALI BE] Warm-up", TimeRange::kNavy);
+  DeviceGuard dg(GetDaliDeviceId());
+  auto data_dir = dali_model_->GetModelParamters().GetWarmupDataDir();
+  if (!data_dir.empty() && data_dir[0] != '/') {
+    data_dir = make_string(dali_model_->RepositoryPath(), "/", data_dir);
+  }
+  bool batched = dali_model_->Batched();
+  auto inputs_config = ReadInputsConfig(dali_model_->ModelConfig(), batched);
+  std::vector<std::string> buffers(inputs_config.size());
+  std::vector<IDescr> inputs;
+  auto sticky = dali_model_->GetStickyInputs();
+  std::vector<std::shared_ptr<const StickyInput>> sticky_inputs;
+  try {
+    for (size_t i = 0; i < inputs_config.size(); i++) {
+      auto& config = inputs_config[i];
+      auto dims = config.shape.value_or(std::vector<int64_t>{});
+      int batch_size = std::max(dali_model_->MaxBatchSize(), 1);
+      if (!batched) {
+        // The leading dimension of an unbatched model's input is the batch
+        ENFORCE(!dims.empty(), make_string("Input \"", config.name, "\" has no batch dimension."));
+        batch_size = dims[0] > 0 ? dims[0] : 1;
+        dims.erase(dims.begin());
+      }
+      // The registered sticky inputs are the values the requests are going to use
+      auto registered = sticky ? sticky->Get(config.name) : nullptr;
+      if (registered) {
+        inputs.push_back(sticky->Bind(*registered, batch_size));
+        sticky_inputs.push_back(std::move(registered));
+        continue;
+      }
+      auto type_size = dali_type_size(config.dtype);
+      std::string sample;
+      if (!data_dir.empty()) {
+        sample = FileModelProvider(make_string(data_dir, "/", config.name)).GetModel();
+        auto unknown = std::count(dims.begin(), dims.end(), -1);
+        ENFORCE(unknown <= 1, make_string("The shape of the warm-up sample of \"", config.name,
+                                          "\" can't be inferred, as more than one of its "
+                                          "dimensions is not fixed in the model config."));
+        if (unknown == 1) {
+          int64_t known = type_size;
+          for (auto d : dims)
+            known *= d < 0 ? 1 : d;
+          ENFORCE(sample.size() % known == 0,
+                  make_string("The size of the warm-up sample of \"", config.name, "\" (",
+                              sample.size(),
+                              " bytes) doesn't match the shape in the model config."));
+          *std::find(dims.begin(), dims.end(), -1) = sample.size() / known;
+        }
+        ENFORCE(static_cast<size_t>(volume(dims)) * type_size == sample.size(),
+                make_string("The size of the warm-up sample of \"", config.name, "\" (",
+                            sample.size(), " bytes) doesn't match the shape in the model config."));
+      } else {
+        for (auto& d : dims)
+          d = d < 0 ? 1 : d;
+        sample.assign(volume(dims) * type_size, 0);
+      }
+      auto& buffer = buffers[i];
+      buffer.reserve(sample.size() * batch_size);
+      for (int s = 0; s < batch_size; s++)
+        buffer.append(sample);
+      IDescr input;
+      input.meta.name = config.name;
+      input.meta.type = config.dtype;
+      input.meta.shape = TensorListShape<>::make_uniform(batch_size, TensorShape<>(dims));
+      IBufferDescr buffer_descr;
+      buffer_descr.device = device_type_t::CPU;
+      buffer_descr.data = buffer.data();
+      buffer_descr.size = buffer.size();
+      input.buffers.push_back(buffer_descr);
+      inputs.push_back(std::move(input));
+    }
+    TimeInterval interval{};
+    start_timer_ns(interval);
+    dali_executor_->Warmup(inputs, iterations);
+    for (auto& executor : replica_executors_) {
+      executor->Warmup(inputs, iterations);
+    }
+    end_timer_ns(interval);
+    LOG_MESSAGE(TRITONSERVER_LOG_INFO,
+                make_string("Warm-up of the model instance ", Name(), " finished: ", iterations,
+                            " iterations in ", (interval.end - interval.start) / 1000000, " ms")
+                    .c_str());
+  } catch (const std::exception& e) {
+    throw DaliBackendException(make_string("DALI pipeline warm-up failed: ", e.what()));
+  }
+}
+
+
+void DaliModelInstance::FinalizeBatch(const std::vector<TritonRequest>& requests,
+                                      std::vector<TritonResponse>& responses,
+                                      const std::vector<int64_t>& sent_ns,
+                                      TimeInterval exec_interval, const ProcessingMeta& proc_meta,
+                                      const TritonError& error) {
   for (auto& response : responses) {
-    SendResponse(std::move(response), true, TritonError::Copy(error));
+    if (response) {
+      SendResponse(std::move(response), true, TritonError::Copy(error));
+    }
   }
   end_timer_ns(exec_interval);
 
   TimeRange tr_rep("[DALI BE] Report statistics", TimeRange::kTeal);
-  for (auto& request : requests) {
-    ReportStats(request, exec_interval, proc_meta.compute_interval, !error);
+  for (size_t ri = 0; ri < requests.size(); ++ri) {
+    // The requests, that got their outputs before the error occurred, succeeded
+    bool sent = sent_ns[ri] != 0;
+    TimeInterval req_exec_interval{exec_interval.start,
+                                   sent ? sent_ns[ri] : exec_interval.end};
+    ReportStats(requests[ri], req_exec_interval, proc_meta.compute_interval, sent || !error);
   }
   ReportBatchStats(proc_meta.total_batch_size, exec_interval, proc_meta.compute_interval);
   tr_rep.stop();
 }
 
+void DaliModelInstance::SendOutputs(DaliExecutor& executor, const std::vector<ODescr>& outputs,
+                                    std::vector<TritonResponse>& responses,
+                                    std::vector<int64_t>& sent_ns) {
+  executor.PutOutputs(outputs, [&](int ri) {
+    SendResponse(std::move(responses[ri]), true);
+    SET_TIMESTAMP(sent_ns[ri]);
+  });
+}
+
+void DaliModelInstance::ExecutePipelined(std::vector<TritonRequest> requests) {
+  DeviceGuard dg(GetDaliDeviceId());
+  PendingBatch batch{};
+  start_timer_ns(batch.exec_interval);
+  {
+    std::unique_lock<std::mutex> lock(pending_mutex_);
+    pending_cv_.wait(lock, [&]() { return in_flight_ < dali_executor_->PipelineDepth(); });
+  }
+  TritonError error{};
+  try {
+    TimeRange tr_gi("[DALI BE] GenerateInputs", TimeRange::kTeal);
+    StageTimer st_gi(dali_model_->Metrics(), ExecutionStage::kGenerateInputs);
+    auto inputs_info = GenerateInputs(requests);
+    batch.reqs_batch_sizes = std::move(inputs_info.reqs_batch_sizes);
+    batch.sticky_inputs = std::move(inputs_info.sticky_inputs);
+    st_gi.stop();
+    tr_gi.stop();
+
+    TimeRange tr_sched("[DALI BE] Schedule processing", TimeRange::kTeal);
+    start_timer_ns(batch.compute_interval);
+    batch.generation = dali_executor_->Schedule(inputs_info.inputs);
+    ReportInputCopy();
+  } catch (...) { error = ErrorHandler(); }
+
+  if (error) {
+    for (auto& response : CreateResponses(requests)) {
+      SendResponse(std::move(response), true, TritonError::Copy(error));
+    }
+    end_timer_ns(batch.exec_interval);
+    for (auto& request : requests) {
+      ReportStats(request, batch.exec_interval, batch.compute_interval, false);
+    }
+    return;
+  }
+
+  batch.requests = std::move(requests);
+  {
+    std::lock_guard<std::mutex> lock(pending_mutex_);
+    pending_.push_back(std::move(batch));
+    ++in_flight_;
+  }
+  pending_cv_.notify_all();
+}
+
+void DaliModelInstance::CompletionLoop() {
+  DeviceGuard dg(GetDaliDeviceId());
+  while (true) {
+    PendingBatch batch{};
+    {
+      std::unique_lock<std::mutex> lock(pending_mutex_);
+      pending_cv_.wait(lock, [&]() { return stop_ || !pending_.empty(); });
+      // Complete all of the scheduled batches before stopping
+      if (pending_.empty())
+        return;
+      batch = std::move(pending_.front());
+      pending_.pop_front();
+    }
+    CompleteBatch(batch);
+    {
+      std::lock_guard<std::mutex> lock(pending_mutex_);
+      --in_flight_;
+    }
+    pending_cv_.notify_all();
+  }
+}
+
+void DaliModelInstance::CompleteBatch(PendingBatch& batch) {
+  auto responses = CreateResponses(batch.requests);
+  std::vector<int64_t> sent_ns(batch.requests.size(), 0);
+  TritonError error{};
+  ProcessingMeta proc_meta{};
+  for (auto& bs : batch.reqs_batch_sizes) {
+    proc_meta.total_batch_size += bs;
+  }
+  try {
+    TimeRange tr_run("[DALI BE] Wait for outputs", TimeRange::kTeal);
+    auto outputs_info = dali_executor_->WaitForOutputs(batch.generation);
+    end_timer_ns(batch.compute_interval);
+    ReportStage(ExecutionStage::kRun, batch.compute_interval);
+    tr_run.stop();
+
+    TimeRange tr_ao("[DALI BE] AllocateOutputs", TimeRange::kTeal);
+    StageTimer st_ao(dali_model_->Metrics(), ExecutionStage::kAllocateOutputs);
+    auto dali_outputs =
+        AllocateOutputs(batch.requests, responses, batch.reqs_batch_sizes, outputs_info);
+    st_ao.stop();
+    tr_ao.stop();
+
+    TimeRange tr_copy("[DALI BE] Copy results", TimeRange::kTeal);
+    StageTimer st_copy(dali_model_->Metrics(), ExecutionStage::kCopyOutputs);
+    SendOutputs(*dali_executor_, dali_outputs, responses, sent_ns);
+    st_copy.stop();
+    tr_copy.stop();
+    ReportIteration(dali_outputs, batch.requests.size(), batch.requests.size());
+  } catch (...) { error = ErrorHandler(); }
+  try {
+    dali_executor_->ReleaseOutputs();
+  } catch (...) { ErrorHandler(); }
+
+  proc_meta.compute_interval = batch.compute_interval;
+  FinalizeBatch(batch.requests, responses, sent_ns, batch.exec_interval, proc_meta, error);
+}
+
 void DaliModelInstance::ExecuteUnbatched(const std::vector<TritonRequest>& requests) {
   DeviceGuard dg(GetDaliDeviceId());
   for (auto &request : requests) {
@@ -133,6 +384,96 @@ void DaliModelInstance::ExecuteUnbatched(const std::vector<TritonRequest>& reque
   }
 }
 
+void DaliModelInstance::ExecuteInterleaved(std::vector<TritonRequest> requests) {
+  DeviceGuard dg(GetDaliDeviceId());
+  for (auto& request : requests) {
+    InterleavedRequest ireq{};
+    start_timer_ns(ireq.exec_interval);
+    TritonError error{};
+    try {
+      TimeRange tr_gi("[DALI BE] GenerateInputs", TimeRange::kTeal);
+      StageTimer st_gi(dali_model_->Metrics(), ExecutionStage::kGenerateInputs);
+      ireq.inputs = GenerateInputs(request, ireq.sticky_inputs);
+    } catch (...) { error = ErrorHandler(); }
+    ireq.request = std::move(request);
+    if (error) {
+      SendResponse(TritonResponse::New(ireq.request), true, TritonError::Copy(error));
+      CompleteInterleaved(ireq, false);
+      continue;
+    }
+    interleaver_->Submit(std::move(ireq));
+  }
+}
+
+void DaliModelInstance::StartInterleaver() {
+  std::vector<DaliExecutor*> executors = {dali_executor_.get()};
+  for (auto& executor : replica_executors_) {
+    executors.push_back(executor.get());
+  }
+  auto iterate = [this](DaliExecutor& executor, InterleavedRequest& ireq) {
+    DeviceGuard dg(GetDaliDeviceId());
+    return ProcessIteration(executor, ireq);
+  };
+  auto fail = [this](InterleavedRequest& ireq) {
+    auto error = ErrorHandler();
+    // Only the first error is sent - resetting the executor may fail after the iteration did
+    if (!ireq.failed) {
+      ireq.failed = true;
+      SendResponse(TritonResponse::New(ireq.request), true, std::move(error));
+    }
+  };
+  auto complete = [this](InterleavedRequest& ireq, bool success) {
+    CompleteInterleaved(ireq, success);
+  };
+  interleaver_ = std::make_unique<RequestInterleaver<DaliExecutor, InterleavedRequest>>(
+      std::move(executors), iterate, fail, complete);
+}
+
+bool DaliModelInstance::ProcessIteration(DaliExecutor& executor, InterleavedRequest& ireq) {
+  if (ireq.iterations == 0) {
+    start_timer_ns(ireq.compute_interval);
+  }
+  TimeRange tr_run("[DALI BE] Run processing", TimeRange::kTeal);
+  StageTimer st_run(dali_model_->Metrics(), ExecutionStage::kRun);
+  auto outputs_info = executor.Run(ireq.inputs);
+  st_run.stop();
+  tr_run.stop();
+  if (ireq.iterations == 0) {
+    ReportInputCopy(executor);
+  }
+
+  auto response = TritonResponse::New(ireq.request);
+
+  TimeRange tr_ao("[DALI BE] AllocateOutputs", TimeRange::kTeal);
+  StageTimer st_ao(dali_model_->Metrics(), ExecutionStage::kAllocateOutputs);
+  auto dali_outputs = AllocateOutputs(ireq.request, response, outputs_info);
+  st_ao.stop();
+  tr_ao.stop();
+
+  TimeRange tr_copy("[DALI BE] Copy results", TimeRange::kTeal);
+  StageTimer st_copy(dali_model_->Metrics(), ExecutionStage::kCopyOutputs);
+  executor.PutOutputs(dali_outputs);
+  st_copy.stop();
+  tr_copy.stop();
+
+  bool completed = executor.InputsConsumed();
+  if (completed) {
+    end_timer_ns(ireq.compute_interval);
+  }
+  SendResponse(std::move(response), completed);
+  // The request is merged into the first iteration only, each iteration sends a response
+  ReportIteration(dali_outputs, ireq.iterations == 0 ? 1 : 0, 1);
+  ireq.iterations++;
+  return completed;
+}
+
+void DaliModelInstance::CompleteInterleaved(InterleavedRequest& ireq, bool success) {
+  end_timer_ns(ireq.exec_interval);
+  TimeRange tr_rep("[DALI BE] Report statistics", TimeRange::kTeal);
+  ReportStats(ireq.request, ireq.exec_interval, ireq.compute_interval, success);
+  tr_rep.stop();
+}
+
 std::vector<TritonResponse> DaliModelInstance::CreateResponses(
     const std::vector<TritonRequest>& requests) {
   std::vector<TritonResponse> responses;
@@ -144,75 +485,386 @@ std::vector<TritonResponse> DaliModelInstance::CreateResponses(
 }
 
 
-ProcessingMeta DaliModelInstance::ProcessRequests(const std::vector<TritonRequest>& requests,
-                                                  const std::vector<TritonResponse>& responses) {
+/**
+ * @brief Split the buffers of the \p input at the sample boundaries.
+ * @return Pieces of the buffers, that make up each of the samples.
+ */
+std::vector<std::vector<IBufferDescr>> SplitInputSamples(const IDescr& input) {
+  const auto& shape = input.meta.shape;
+  auto type_size = dali_type_size(input.meta.type);
+  std::vector<std::vector<IBufferDescr>> samples(shape.num_samples());
+  size_t buffer_idx = 0;
+  size_t offset = 0;
+  for (int sample_idx = 0; sample_idx < shape.num_samples(); ++sample_idx) {
+    size_t remaining = volume(shape[sample_idx]) * type_size;
+    while (remaining > 0) {
+      ENFORCE(buffer_idx < input.buffers.size(),
+              make_string("The buffers of the input ", input.meta.name,
+                          " are smaller than its shape indicates."));
+      const auto& buffer = input.buffers[buffer_idx];
+      size_t size = std::min(remaining, buffer.size - offset);
+      if (size > 0) {
+        IBufferDescr piece = buffer;
+        piece.data = static_cast<const char*>(buffer.data) + offset;
+        piece.size = size;
+        samples[sample_idx].push_back(piece);
+      }
+      offset += size;
+      remaining -= size;
+      if (offset == buffer.size) {
+        buffer_idx++;
+        offset = 0;
+      }
+    }
+  }
+  return samples;
+}
+
+/**
+ * @brief Get the location of each sample of the \p output within its buffers.
+ */
+std::vector<OBufferDescr> SplitOutputSamples(const ODescr& output) {
+  const auto& shape = output.meta.shape;
+  auto type_size = dali_type_size(output.meta.type);
+  std::vector<OBufferDescr> samples(shape.num_samples());
+  size_t buffer_idx = 0;
+  size_t offset = 0;
+  for (int sample_idx = 0; sample_idx < shape.num_samples(); ++sample_idx) {
+    size_t sample_size = volume(shape[sample_idx]) * type_size;
+    while (sample_size > 0 && buffer_idx < output.buffers.size() &&
+           offset == output.buffers[buffer_idx].size) {
+      buffer_idx++;
+      offset = 0;
+    }
+    ENFORCE(buffer_idx < output.buffers.size() &&
+                offset + sample_size <= output.buffers[buffer_idx].size,
+            make_string("The buffers provided for the output ", output.meta.name,
+                        " are too small or not split at the sample boundaries."));
+    samples[sample_idx] = output.buffers[buffer_idx];
+    samples[sample_idx].data = static_cast<char*>(output.buffers[buffer_idx].data) + offset;
+    samples[sample_idx].size = sample_size;
+    offset += sample_size;
+  }
+  return samples;
+}
+
+/**
+ * @brief Compute the response cache key of each sample of the \p inputs.
+ *
+ * The key covers the name, type, shape and data of every input of the sample. The sticky inputs
+ * are repeated by the requests, so they are covered by the digest of their data only, and the
+ * cache entries don't keep a copy of them.
+ * @return The keys or an empty vector, if the inputs can't be used as keys (they are not in the
+ *         host memory).
+ */
+std::vector<SampleKey> SampleKeys(const std::vector<IDescr>& inputs, const StickyInputs* sticky) {
+  if (inputs.empty())
+    return {};
+  for (auto& input : inputs) {
+    for (auto& buffer : input.buffers) {
+      if (buffer.device != device_type_t::CPU)
+        return {};
+    }
+  }
+  // The order of the inputs is not guaranteed
+  std::vector<const IDescr*> sorted;
+  for (auto& input : inputs)
+    sorted.push_back(&input);
+  std::sort(sorted.begin(), sorted.end(),
+            [](auto* lhs, auto* rhs) { return lhs->meta.name < rhs->meta.name; });
+  int num_samples = inputs[0].meta.shape.num_samples();
+  std::vector<SampleKey> keys(num_samples);
+  for (auto* input : sorted) {
+    auto samples = SplitInputSamples(*input);
+    bool digest_only = sticky && sticky->IsSticky(input->meta.name);
+    // A registered sticky input is the same buffer in every sample, so it's hashed once
+    IBufferDescr digested{};
+    uint64_t digest = 0;
+    for (int sample_idx = 0; sample_idx < num_samples; ++sample_idx) {
+      auto& key = keys[sample_idx];
+      key.AddCopy(input->meta.name.c_str(), input->meta.name.size() + 1);
+      key.AddValue(input->meta.type);
+      auto sample_shape = input->meta.shape.tensor_shape_span(sample_idx);
+      key.AddValue(sample_shape.size());
+      key.AddCopy(sample_shape.data(), sample_shape.size() * sizeof(sample_shape[0]));
+      const auto& pieces = samples[sample_idx];
+      if (!digest_only) {
+        for (auto& piece : pieces)
+          key.Add(piece.data, piece.size);
+        continue;
+      }
+      bool repeated = pieces.size() == 1 && pieces[0].data == digested.data &&
+                      pieces[0].size == digested.size;
+      if (!repeated) {
+        SampleHasher hasher;
+        for (auto& piece : pieces)
+          hasher.Update(piece.data, piece.size);
+        digest = hasher.Digest();
+        digested = pieces.size() == 1 ? pieces[0] : IBufferDescr{};
+      }
+      key.AddValue(digest);
+    }
+  }
+  return keys;
+}
+
+void DaliModelInstance::ProcessCached(DaliExecutor& executor,
+                                      const std::vector<TritonRequest>& requests,
+                                      std::vector<TritonResponse>& responses,
+                                      std::vector<int64_t>& sent_ns,
+                                      const InputsInfo& inputs_info,
+                                      const std::vector<SampleKey>& keys,
+                                      ProcessingMeta& proc_meta) {
+  auto& cache = *dali_model_->GetResponseCache();
+  int num_samples = keys.size();
+  proc_meta.total_batch_size = num_samples;
+
+  TimeRange tr_lookup("[DALI BE] Response cache lookup", TimeRange::kTeal);
+  std::vector<std::shared_ptr<const CachedSample>> hits(num_samples);
+  std::vector<int> misses;
+  std::vector<int> miss_idx(num_samples, -1);
+  for (int sample_idx = 0; sample_idx < num_samples; ++sample_idx) {
+    hits[sample_idx] = cache.Get(keys[sample_idx]);
+    if (!hits[sample_idx]) {
+      miss_idx[sample_idx] = misses.size();
+      misses.push_back(sample_idx);
+    }
+  }
+  if (auto metrics = dali_model_->Metrics()) {
+    metrics->ReportResponseCache(num_samples - misses.size(), misses.size());
+  }
+  tr_lookup.stop();
+
+  // Run the pipeline for the samples missing in the cache only
+  std::vector<OutputInfo> miss_outputs_info;
+  TimeRange tr_run("[DALI BE] Run processing", TimeRange::kTeal);
+  start_timer_ns(proc_meta.compute_interval);
+  if (!misses.empty()) {
+    std::vector<IDescr> miss_inputs;
+    for (auto& input : inputs_info.inputs) {
+      auto samples = SplitInputSamples(input);
+      IDescr miss_input;
+      miss_input.meta.name = input.meta.name;
+      miss_input.meta.type = input.meta.type;
+      std::vector<TensorShape<>> shapes;
+      for (int sample_idx : misses) {
+        shapes.push_back(input.meta.shape[sample_idx]);
+        for (auto& piece : samples[sample_idx])
+          miss_input.buffers.push_back(piece);
+      }
+      miss_input.meta.shape = TensorListShape<>(shapes);
+      miss_inputs.push_back(std::move(miss_input));
+    }
+    miss_outputs_info = executor.Run(miss_inputs);
+  }
+  end_timer_ns(proc_meta.compute_interval);
+  if (!misses.empty()) {
+    ReportStage(ExecutionStage::kRun, proc_meta.compute_interval);
+    ReportInputCopy(executor);
+  }
+  tr_run.stop();
+
+  // Outputs of the whole batch, assembled from the cached and the computed samples
+  size_t num_outputs = misses.empty() ? hits[0]->outputs.size() : miss_outputs_info.size();
+  std::vector<OutputInfo> outputs_info(num_outputs);
+  for (size_t out_idx = 0; out_idx < num_outputs; ++out_idx) {
+    auto& info = outputs_info[out_idx];
+    if (misses.empty()) {
+      info.type = hits[0]->outputs[out_idx].type;
+      info.device = device_type_t::CPU;
+    } else {
+      info.type = miss_outputs_info[out_idx].type;
+      info.device = miss_outputs_info[out_idx].device;
+    }
+    std::vector<TensorShape<>> shapes(num_samples);
+    for (int sample_idx = 0; sample_idx < num_samples; ++sample_idx) {
+      if (hits[sample_idx]) {
+        const auto& cached = hits[sample_idx]->outputs;
+        ENFORCE(cached.size() == num_outputs && cached[out_idx].type == info.type,
+                "The cached outputs don't match the outputs of the pipeline.");
+        shapes[sample_idx] = cached[out_idx].shape;
+      } else {
+        shapes[sample_idx] = miss_outputs_info[out_idx].shape[miss_idx[sample_idx]];
+      }
+    }
+    info.shape = TensorListShape<>(shapes);
+  }
+
+  TimeRange tr_ao("[DALI BE] AllocateOutputs", TimeRange::kTeal);
+  StageTimer st_ao(dali_model_->Metrics(), ExecutionStage::kAllocateOutputs);
+  auto dali_outputs =
+      AllocateOutputs(requests, responses, inputs_info.reqs_batch_sizes, outputs_info);
+  st_ao.stop();
+  tr_ao.stop();
+
+  TimeRange tr_copy("[DALI BE] Copy results", TimeRange::kTeal);
+  StageTimer st_copy(dali_model_->Metrics(), ExecutionStage::kCopyOutputs);
+  std::vector<std::vector<OBufferDescr>> dsts(num_outputs);
+  for (size_t out_idx = 0; out_idx < num_outputs; ++out_idx)
+    dsts[out_idx] = SplitOutputSamples(dali_outputs[out_idx]);
+
+  if (!misses.empty()) {
+    std::vector<ODescr> miss_outputs(num_outputs);
+    for (size_t out_idx = 0; out_idx < num_outputs; ++out_idx) {
+      auto& miss_output = miss_outputs[out_idx];
+      miss_output.meta.name = dali_outputs[out_idx].meta.name;
+      miss_output.meta.type = outputs_info[out_idx].type;
+      miss_output.meta.shape = miss_outputs_info[out_idx].shape;
+      for (int sample_idx : misses)
+        miss_output.buffers.push_back(dsts[out_idx][sample_idx]);
+    }
+    executor.PutOutputs(miss_outputs);
+  }
+
+  // Fill the cached samples of the responses and store the computed ones in the cache
+  std::vector<std::pair<OBufferDescr, IBufferDescr>> copies;
+  std::vector<std::shared_ptr<CachedSample>> new_entries(misses.size());
+  for (int sample_idx = 0; sample_idx < num_samples; ++sample_idx) {
+    std::shared_ptr<CachedSample> new_entry;
+    if (!hits[sample_idx]) {
+      new_entry = new_entries[miss_idx[sample_idx]] = std::make_shared<CachedSample>();
+      new_entry->outputs.resize(num_outputs);
+    }
+    for (size_t out_idx = 0; out_idx < num_outputs; ++out_idx) {
+      const auto& dst = dsts[out_idx][sample_idx];
+      IBufferDescr host{};
+      host.device = device_type_t::CPU;
+      if (hits[sample_idx]) {
+        const auto& data = hits[sample_idx]->outputs[out_idx].data;
+        host.data = data.data();
+        host.size = data.size();
+        copies.emplace_back(dst, host);
+      } else {
+        auto& cached = new_entry->outputs[out_idx];
+        cached.type = outputs_info[out_idx].type;
+        cached.shape = outputs_info[out_idx].shape[sample_idx];
+        cached.data.resize(dst.size);
+        OBufferDescr host_dst{};
+        host_dst.device = device_type_t::CPU;
+        host_dst.data = cached.data.data();
+        host_dst.size = cached.data.size();
+        copies.emplace_back(host_dst, dst);
+      }
+    }
+  }
+  executor.CopyBuffers(copies);
+  for (size_t i = 0; i < misses.size(); ++i)
+    cache.Put(keys[misses[i]], std::move(new_entries[i]));
+
+  for (size_t ri = 0; ri < responses.size(); ++ri) {
+    SendResponse(std::move(responses[ri]), true);
+    SET_TIMESTAMP(sent_ns[ri]);
+  }
+  st_copy.stop();
+  tr_copy.stop();
+  ReportIteration(dali_outputs, requests.size(), requests.size(), misses.empty() ? 0 : 1);
+}
+
+ProcessingMeta DaliModelInstance::ProcessRequests(DaliExecutor& executor,
+                                                  const std::vector<TritonRequest>& requests,
+                                                  std::vector<TritonResponse>& responses,
+                                                  std::vector<int64_t>& sent_ns) {
   ProcessingMeta ret{};
 
   TimeRange tr_gi("[DALI BE] GenerateInputs", TimeRange::kTeal);
+  StageTimer st_gi(dali_model_->Metrics(), ExecutionStage::kGenerateInputs);
   auto inputs_info = GenerateInputs(requests);
+  st_gi.stop();
   tr_gi.stop();
 
+  if (use_response_cache_) {
+    TimeRange tr_hash("[DALI BE] Hash inputs", TimeRange::kTeal);
+    auto keys = SampleKeys(inputs_info.inputs, dali_model_->GetStickyInputs());
+    tr_hash.stop();
+    if (!keys.empty()) {
+      ProcessCached(executor, requests, responses, sent_ns, inputs_info, keys, ret);
+      return ret;
+    }
+  }
+
   TimeRange tr_run("[DALI BE] Run processing", TimeRange::kTeal);
   start_timer_ns(ret.compute_interval);
-  auto outputs_info = dali_executor_->Run(inputs_info.inputs);
+  auto outputs_info = executor.Run(inputs_info.inputs);
   end_timer_ns(ret.compute_interval);
+  ReportStage(ExecutionStage::kRun, ret.compute_interval);
+  ReportInputCopy(executor);
   for (auto& bs : inputs_info.reqs_batch_sizes) {
     ret.total_batch_size += bs;
   }
   tr_run.stop();
 
   TimeRange tr_ao("[DALI BE] AllocateOutputs", TimeRange::kTeal);
+  StageTimer st_ao(dali_model_->Metrics(), ExecutionStage::kAllocateOutputs);
   auto dali_outputs =
       AllocateOutputs(requests, responses, inputs_info.reqs_batch_sizes, outputs_info);
+  st_ao.stop();
   tr_ao.stop();
 
   TimeRange tr_copy("[DALI BE] Copy results", TimeRange::kTeal);
-  dali_executor_->PutOutputs(dali_outputs);
+  StageTimer st_copy(dali_model_->Metrics(), ExecutionStage::kCopyOutputs);
+  SendOutputs(executor, dali_outputs, responses, sent_ns);
+  st_copy.stop();
   tr_copy.stop();
+  ReportIteration(dali_outputs, requests.size(), requests.size());
 
   return ret;
 }
 
 TimeInterval DaliModelInstance::ProcessRequest(const TritonRequest &request) {
   TimeRange tr_gi("[DALI BE] GenerateInputs", TimeRange::kTeal);
-  auto inputs = GenerateInputs(request);
+  StageTimer st_gi(dali_model_->Metrics(), ExecutionStage::kGenerateInputs);
+  std::vector<std::shared_ptr<const StickyInput>> sticky_inputs;
+  auto inputs = GenerateInputs(request, sticky_inputs);
+  st_gi.stop();
   tr_gi.stop();
 
   TimeInterval compute_interval;
   start_timer_ns(compute_interval);
+  // The request is merged into the first iteration only, each iteration sends a response
+  size_t num_requests = 1;
   do {
     TimeRange tr_run("[DALI BE] Run processing", TimeRange::kTeal);
+    StageTimer st_run(dali_model_->Metrics(), ExecutionStage::kRun);
     auto outputs_info = dali_executor_->Run(inputs);
+    st_run.stop();
     tr_run.stop();
+    ReportInputCopy();
 
     auto response = TritonResponse::New(request);
 
     TimeRange tr_ao("[DALI BE] AllocateOutputs", TimeRange::kTeal);
+    StageTimer st_ao(dali_model_->Metrics(), ExecutionStage::kAllocateOutputs);
     auto dali_outputs = AllocateOutputs(request, response, outputs_info);
+    st_ao.stop();
     tr_ao.stop();
 
     TimeRange tr_copy("[DALI BE] Copy results", TimeRange::kTeal);
+    StageTimer st_copy(dali_model_->Metrics(), ExecutionStage::kCopyOutputs);
     dali_executor_->PutOutputs(dali_outputs);
+    st_copy.stop();
     tr_copy.stop();
 
     SendResponse(std::move(response), dali_executor_->InputsConsumed());
+    ReportIteration(dali_outputs, num_requests, 1);
+    num_requests = 0;
   } while (!dali_executor_->InputsConsumed());
   end_timer_ns(compute_interval);
   return compute_interval;
 }
 
 InputsInfo DaliModelInstance::GenerateInputs(const std::vector<TritonRequest>& requests) {
-  uint32_t input_cnt = requests[0].InputCount();
-  std::vector<IDescr> inputs;
-  inputs.reserve(input_cnt);
+  InputsInfo ret;
   std::unordered_map<std::string, IDescr> input_map;
-  std::vector<int> reqs_batch_sizes(requests.size());
+  ret.reqs_batch_sizes.resize(requests.size());
+  size_t input_cnt = 0;
   for (size_t ri = 0; ri < requests.size(); ++ri) {
     auto& request = requests[ri];
-    ENFORCE(request.InputCount() == input_cnt,
-            "Each request must provide the same number of inputs.");
-    auto idescrs = GenerateInputs(request);
-    reqs_batch_sizes[ri] = idescrs[0].meta.shape.num_samples();
+    auto idescrs = GenerateInputs(request, ret.sticky_inputs);
+    if (ri == 0) {
+      input_cnt = idescrs.size();
+    }
+    ENFORCE(idescrs.size() == input_cnt, "Each request must provide the same number of inputs.");
+    ret.reqs_batch_sizes[ri] = idescrs[0].meta.shape.num_samples();
     if (ri == 0) {
       for (auto &input: idescrs) {
         input_map[input.meta.name] = std::move(input);
@@ -225,13 +877,15 @@ InputsInfo DaliModelInstance::GenerateInputs(const std::vector<TritonRequest>& r
       }
     }
   }
+  ret.inputs.reserve(input_cnt);
   for (const auto& descrs : input_map) {
-    inputs.push_back(std::move(descrs.second));
+    ret.inputs.push_back(std::move(descrs.second));
   }
-  return {inputs, reqs_batch_sizes};
+  return ret;
 }
 
-std::vector<IDescr> DaliModelInstance::GenerateInputs(const TritonRequest &request) {
+std::vector<IDescr> DaliModelInstance::GenerateInputs(
+    const TritonRequest& request, std::vector<std::shared_ptr<const StickyInput>>& sticky_inputs) {
   std::vector<IDescr> inputs(request.InputCount());
   int num_samples = 0;
   for (uint32_t input_idx = 0; input_idx < request.InputCount(); ++input_idx) {
@@ -245,6 +899,9 @@ std::vector<IDescr> DaliModelInstance::GenerateInputs(const TritonRequest &reque
       idescr.buffers.push_back(std::move(buffer));
     }
     idescr.meta = std::move(meta);
+    if (input.IsBytes()) {
+      idescr = UnpackBytes(idescr);
+    }
 
     if (input_idx == 0) {
       num_samples = meta.shape.num_samples();
@@ -253,6 +910,27 @@ std::vector<IDescr> DaliModelInstance::GenerateInputs(const TritonRequest &reque
               "Each input in a request must have the same batch size.");
     }
   }
+
+  auto sticky = dali_model_->GetStickyInputs();
+  if (!sticky)
+    return inputs;
+  int sticky_samples = inputs.empty() ? 1 : inputs[0].meta.shape.num_samples();
+  for (auto& input : inputs) {
+    if (sticky->IsSticky(input.meta.name))
+      sticky->Register(input);
+  }
+  for (auto& name : sticky->Names()) {
+    auto provided = std::find_if(inputs.begin(), inputs.end(),
+                                 [&](auto& input) { return input.meta.name == name; });
+    if (provided != inputs.end())
+      continue;
+    auto registered = sticky->Get(name);
+    ENFORCE(registered != nullptr,
+            make_string("The sticky input ", name,
+                        " must be provided by the first request, that uses it."));
+    inputs.push_back(sticky->Bind(*registered, sticky_samples));
+    sticky_inputs.push_back(std::move(registered));
+  }
   return inputs;
 }
 
@@ -23,7 +23,14 @@
 #ifndef DALI_BACKEND_DALI_MODEL_INSTANCE_H_
 #define DALI_BACKEND_DALI_MODEL_INSTANCE_H_
 
+#include <algorithm>
+#include <condition_variable>
+#include <deque>
+#include <mutex>
+#include <thread>
+
 #include "src/dali_executor/dali_executor.h"
+#include "src/dali_executor/executor_pool.h"
 #include "src/dali_model.h"
 #include "triton/backend/backend_model_instance.h"
 
@@ -37,6 +44,42 @@ struct ProcessingMeta {
 struct InputsInfo {
   std::vector<IDescr> inputs;
   std::vector<int> reqs_batch_sizes;  // batch size of each request
+  // sticky inputs bound to the requests, they must outlive the processing of the inputs
+  std::vector<std::shared_ptr<const StickyInput>> sticky_inputs;
+};
+
+/**
+ * @brief Batch of requests scheduled in the pipelined mode, that awaits the outputs.
+ */
+struct PendingBatch {
+  std::vector<TritonRequest> requests;
+  std::vector<int> reqs_batch_sizes;
+  std::vector<std::shared_ptr<const StickyInput>> sticky_inputs;
+  uint64_t generation = 0;
+  TimeInterval exec_interval{};
+  TimeInterval compute_interval{};
+};
+
+/**
+ * @brief Request of an unbatched model, which is processed in many iterations, interleaved
+ *        with the iterations of the other requests.
+ */
+struct InterleavedRequest {
+  TritonRequest request;
+  std::vector<IDescr> inputs;
+  std::vector<std::shared_ptr<const StickyInput>> sticky_inputs;
+  size_t iterations = 0;
+  bool failed = false;  // the error response is sent already
+  TimeInterval exec_interval{};
+  TimeInterval compute_interval{};
+};
+
+/**
+ * @brief Batch of requests dispatched to one of the pipeline replicas.
+ */
+struct ReplicaBatch {
+  std::vector<TritonRequest> requests;
+  TimeInterval exec_interval{};
 };
 
 class DaliModelInstance : public ::triton::backend::BackendModelInstance {
@@ -53,17 +96,107 @@ class DaliModelInstance : public ::triton::backend::BackendModelInstance {
     return *dali_model_;
   }
 
-  void Execute(const std::vector<TritonRequest>& requests);
+  void Execute(std::vector<TritonRequest> requests);
+
+  ~DaliModelInstance() {
+    // Complete the in-flight requests and batches
+    interleaver_.reset();
+    replica_dispatcher_.reset();
+    {
+      std::lock_guard<std::mutex> lock(pending_mutex_);
+      stop_ = true;
+    }
+    pending_cv_.notify_all();
+    if (completion_thread_.joinable()) {
+      completion_thread_.join();
+    }
+  }
 
  private:
   DaliModelInstance(DaliModel* model, TRITONBACKEND_ModelInstance* triton_model_instance) :
       BackendModelInstance(model, triton_model_instance), dali_model_(model) {
+    // Only the batched models can be pipelined - the unbatched ones may
+    // run a single request through many iterations
+    auto pipeline_depth = dali_model_->Batched() ?
+                              dali_model_->GetModelParamters().GetPipelineDepth() : 1;
+    auto& params = dali_model_->GetModelParamters();
+    // The unbatched models interleave the requests, the batched ones process many batches at once
+    int num_executors = dali_model_->Batched() ? params.GetPipelineReplicas() :
+                                                 params.GetMaxInFlightRequests();
+    if (!dali_model_->Batched() && num_executors > 1 && !dali_model_->Decoupled()) {
+      LOG_MESSAGE(TRITONSERVER_LOG_WARN,
+                  make_string("The max_in_flight_requests of ", dali_model_->Name(),
+                              " is ignored: it's supported only for the decoupled models.")
+                      .c_str());
+      num_executors = 1;
+    }
+    if (pipeline_depth > 1 && num_executors > 1) {
+      LOG_MESSAGE(TRITONSERVER_LOG_WARN,
+                  make_string("The pipeline replicas of ", dali_model_->Name(),
+                              " are disabled: they are not supported with pipeline_depth.")
+                      .c_str());
+      num_executors = 1;
+    }
+    auto num_threads = params.GetNumThreads();
+    if (dali_model_->Batched()) {
+      // The replicas share the threads
+      num_threads = ThreadsPerReplica(num_threads, num_executors);
+    }
+    dali_executor_ = CreateExecutor(pipeline_depth, num_threads);
+    for (int i = 1; i < num_executors; i++) {
+      replica_executors_.push_back(CreateExecutor(pipeline_depth, num_threads));
+    }
+    if (dali_model_->GetResponseCache()) {
+      use_response_cache_ = dali_model_->Batched() && !dali_executor_->Pipelined() &&
+                            !dali_model_->HasOutputsToSplit();
+      if (!use_response_cache_) {
+        LOG_MESSAGE(TRITONSERVER_LOG_WARN,
+                    make_string("The response cache of ", dali_model_->Name(),
+                                " is disabled: it's not supported for the unbatched and "
+                                "pipelined models, nor the models with split outputs.")
+                        .c_str());
+      }
+    }
+    auto warmup_iterations = dali_model_->GetModelParamters().GetWarmupIterations();
+    if (warmup_iterations > 0) {
+      Warmup(warmup_iterations);
+    }
+    if (dali_executor_->Pipelined()) {
+      completion_thread_ = std::thread([this]() { CompletionLoop(); });
+    } else if (!replica_executors_.empty()) {
+      if (dali_model_->Batched()) {
+        StartReplicaDispatcher();
+      } else {
+        StartInterleaver();
+      }
+    }
+  }
+
+  std::unique_ptr<DaliExecutor> CreateExecutor(int pipeline_depth, int num_threads) {
     auto serialized_pipeline = dali_model_->GetModelProvider().GetModel();
     auto max_batch_size = dali_model_->MaxBatchSize();
     if (max_batch_size < 1) max_batch_size = -1;
-    auto num_threads = dali_model_->GetModelParamters().GetNumThreads();
-    DaliPipeline pipeline(serialized_pipeline, max_batch_size, num_threads, GetDaliDeviceId());
-    dali_executor_ = std::make_unique<DaliExecutor>(std::move(pipeline));
+    DaliPipeline pipeline(serialized_pipeline, max_batch_size, num_threads, GetDaliDeviceId(),
+                          pipeline_depth);
+    auto copy_chunk_size = dali_model_->GetModelParamters().GetCopyChunkSize();
+    return std::make_unique<DaliExecutor>(
+        std::move(pipeline), pipeline_depth,
+        copy_chunk_size < 0 ? DaliExecutor::kDefaultCopyChunkSize :
+                              static_cast<size_t>(copy_chunk_size));
+  }
+
+  /**
+   * @brief Are the requests of the unbatched model processed by many pipelines at once.
+   */
+  bool Interleaved() const {
+    return interleaver_ != nullptr;
+  }
+
+  /**
+   * @brief Are the batches of the batched model processed by many pipelines at once.
+   */
+  bool Replicated() const {
+    return replica_dispatcher_ != nullptr;
   }
 
   void ReportStats(TritonRequestView request, TimeInterval exec, TimeInterval compute,
@@ -74,6 +207,50 @@ class DaliModelInstance : public ::triton::backend::BackendModelInstance {
                  "Failed reporting request statistics.");
   }
 
+  /**
+   * @brief Log the size and duration of the input copies done for the most recent iteration.
+   */
+  void ReportInputCopy() {
+    ReportInputCopy(*dali_executor_);
+  }
+
+  void ReportInputCopy(const DaliExecutor& executor) {
+    const auto& stats = executor.LastInputCopyStats();
+    if (stats.bytes > 0) {
+      LOG_MESSAGE(TRITONSERVER_LOG_VERBOSE,
+                  make_string("Copied ", stats.bytes, " bytes of inputs in ", stats.chunks,
+                              " chunks, took ", stats.ns / 1000, " us").c_str());
+    }
+    if (auto metrics = dali_model_->Metrics()) {
+      metrics->ReportInputs(stats);
+    }
+  }
+
+  /**
+   * @brief Report the \p outputs copied to the responses and \p num_iterations pipeline
+   *        iterations, that \p num_requests requests were merged into.
+   */
+  void ReportIteration(const std::vector<ODescr>& outputs, size_t num_requests,
+                       size_t num_responses, size_t num_iterations = 1) {
+    auto metrics = dali_model_->Metrics();
+    if (!metrics)
+      return;
+    size_t output_bytes = 0;
+    for (auto& output : outputs) {
+      for (auto& buffer : output.buffers)
+        output_bytes += buffer.size;
+    }
+    metrics->ReportOutputs(output_bytes);
+    metrics->ReportIterations(num_iterations, num_requests);
+    metrics->ReportResponses(num_responses);
+  }
+
+  void ReportStage(ExecutionStage stage, const TimeInterval& interval) {
+    if (auto metrics = dali_model_->Metrics()) {
+      metrics->ReportStage(stage, interval);
+    }
+  }
+
   void ReportBatchStats(uint32_t total_batch_size, TimeInterval exec, TimeInterval compute) {
     LOG_IF_ERROR(TRITONBACKEND_ModelInstanceReportBatchStatistics(
                      triton_model_instance_, total_batch_size, exec.start, compute.start,
@@ -89,11 +266,44 @@ class DaliModelInstance : public ::triton::backend::BackendModelInstance {
   std::vector<TritonResponse> CreateResponses(const std::vector<TritonRequest>& requests);
 
   /**
-   * @brief Run inference for a given \p request and prepare a response.
+   * @brief Run inference for given \p requests and send the responses.
+   *
+   * Each response is sent as soon as its outputs are copied. Responses that could not be sent
+   * due to an error are left in \p responses.
+   * @param sent_ns Time at which each response was sent, 0 if it was not sent.
    * @return computation time interval and total batch size
    */
-  ProcessingMeta ProcessRequests(const std::vector<TritonRequest>& requests,
-                                 const std::vector<TritonResponse>& responses);
+  ProcessingMeta ProcessRequests(DaliExecutor& executor,
+                                 const std::vector<TritonRequest>& requests,
+                                 std::vector<TritonResponse>& responses,
+                                 std::vector<int64_t>& sent_ns);
+
+  /**
+   * @brief Copy the \p outputs to the \p responses and send each of them as soon as
+   *        its own outputs are copied.
+   */
+  void SendOutputs(DaliExecutor& executor, const std::vector<ODescr>& outputs,
+                   std::vector<TritonResponse>& responses, std::vector<int64_t>& sent_ns);
+
+  /**
+   * @brief Send the \p error to all the responses that haven't been sent yet,
+   *        and report statistics of the \p requests.
+   */
+  void FinalizeBatch(const std::vector<TritonRequest>& requests,
+                     std::vector<TritonResponse>& responses, const std::vector<int64_t>& sent_ns,
+                     TimeInterval exec_interval, const ProcessingMeta& proc_meta,
+                     const TritonError& error);
+
+  /**
+   * @brief Serve the samples of the \p inputs found in the response cache and run the pipeline
+   *        only for the remaining ones. Send the responses and store the new outputs in the cache.
+   *
+   * @param keys Response cache key of each sample of the inputs
+   */
+  void ProcessCached(DaliExecutor& executor, const std::vector<TritonRequest>& requests,
+                     std::vector<TritonResponse>& responses, std::vector<int64_t>& sent_ns,
+                     const InputsInfo& inputs_info, const std::vector<SampleKey>& keys,
+                     ProcessingMeta& proc_meta);
 
   TimeInterval ProcessRequest(const TritonRequest &request);
 
@@ -103,8 +313,16 @@ class DaliModelInstance : public ::triton::backend::BackendModelInstance {
    */
   InputsInfo GenerateInputs(const std::vector<TritonRequest>& requests);
 
-
-  std::vector<IDescr> GenerateInputs(const TritonRequest &request);
+  /**
+   * @brief Generate descriptors of inputs provided by given \p request.
+   *
+   * The sticky inputs provided by the request are registered, the missing ones are bound
+   * to the request.
+   * @param sticky_inputs The bound sticky inputs are appended there
+   */
+  std::vector<IDescr> GenerateInputs(
+      const TritonRequest& request,
+      std::vector<std::shared_ptr<const StickyInput>>& sticky_inputs);
 
   int32_t GetDaliDeviceId() {
     return !CudaStream() ? CPU_ONLY_DEVICE_ID : device_id_;
@@ -127,10 +345,85 @@ class DaliModelInstance : public ::triton::backend::BackendModelInstance {
 
   void ExecuteBatched(const std::vector<TritonRequest>& requests);
 
+  /**
+   * @brief Run the pipeline on synthetic inputs, shaped according to the model config,
+   *        so that the first requests don't pay for the one-time initialization.
+   *
+   * The samples are read from the `warmup_data_dir`, if provided, or filled with zeros.
+   */
+  void Warmup(int iterations);
+
+  /**
+   * @brief Schedule the batch of \p requests and return without waiting for the outputs.
+   *
+   * The outputs are copied and the responses are sent by the completion thread,
+   * while the next batch is being fed to the pipeline.
+   */
+  void ExecutePipelined(std::vector<TritonRequest> requests);
+
+  /**
+   * @brief Wait for the outputs of the pending batches and send the responses, in the order
+   *        the batches were scheduled.
+   */
+  void CompletionLoop();
+
+  void CompleteBatch(PendingBatch& batch);
+
   void ExecuteUnbatched(const std::vector<TritonRequest> &requests);
 
+  /**
+   * @brief Dispatch the batch of \p requests to an idle pipeline replica and return
+   *        without waiting for the responses.
+   *
+   * Blocks, while all of the replicas are busy.
+   */
+  void ExecuteReplicated(std::vector<TritonRequest> requests);
+
+  /**
+   * @brief Start processing the batches with the pipeline replicas, each in a thread of its own.
+   */
+  void StartReplicaDispatcher();
+
+  /**
+   * @brief Pass the \p requests of the unbatched model to the interleaver and return
+   *        without waiting for their responses.
+   *
+   * Blocks, while `max_in_flight_requests` requests are being processed already.
+   */
+  void ExecuteInterleaved(std::vector<TritonRequest> requests);
+
+  /**
+   * @brief Start running the iterations of the in-flight requests in the round-robin order,
+   *        each request with an executor of its own.
+   */
+  void StartInterleaver();
+
+  /**
+   * @brief Run a single iteration of the \p request and send its response.
+   * @return True, if the request is completed.
+   */
+  bool ProcessIteration(DaliExecutor& executor, InterleavedRequest& request);
+
+  /**
+   * @brief Report the statistics of the completed \p request.
+   */
+  void CompleteInterleaved(InterleavedRequest& request, bool success);
+
   std::unique_ptr<DaliExecutor> dali_executor_;
   DaliModel* dali_model_;
+  bool use_response_cache_ = false;
+
+  std::thread completion_thread_;
+  std::mutex pending_mutex_;
+  std::condition_variable pending_cv_;
+  std::deque<PendingBatch> pending_;
+  int in_flight_ = 0;  // batches scheduled, but not completed yet
+  bool stop_ = false;
+
+  // Executors of the requests or batches processed in addition to the ones of the dali_executor_
+  std::vector<std::unique_ptr<DaliExecutor>> replica_executors_;
+  std::unique_ptr<ReplicaDispatcher<DaliExecutor, ReplicaBatch>> replica_dispatcher_;
+  std::unique_ptr<RequestInterleaver<DaliExecutor, InterleavedRequest>> interleaver_;
 };
 
 }}}  // namespace triton::backend::dali
@@ -0,0 +1,264 @@
+// The MIT License (MIT)
+//
+// Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+#ifndef DALI_BACKEND_METRICS_H_
+#define DALI_BACKEND_METRICS_H_
+
+#include <array>
+#include <string>
+
+#include "src/dali_executor/dali_executor.h"
+#include "src/dali_executor/host_memory_pool.h"
+#include "src/utils/triton.h"
+
+namespace triton { namespace backend { namespace dali {
+
+/**
+ * @brief Gauges of the host memory pool, that backs the host input buffers.
+ */
+class HostPoolMetrics {
+ public:
+  HostPoolMetrics() :
+      family_(TritonMetricFamily::New(TRITONSERVER_METRIC_KIND_GAUGE, "nv_dali_host_pool_bytes",
+                                      "Host memory held by the DALI backend buffer pool")),
+      in_use_(TritonMetric::New(family_, {{"state", "in_use"}})),
+      cached_(TritonMetric::New(family_, {{"state", "cached"}})),
+      high_water_mark_(TritonMetric::New(family_, {{"state", "high_water_mark"}})) {}
+
+  void Report(const HostPoolStats &stats) const {
+    in_use_.Set(stats.in_use);
+    cached_.Set(stats.cached);
+    high_water_mark_.Set(stats.high_water_mark);
+  }
+
+ private:
+  TritonMetricFamily family_;
+  TritonMetric in_use_;
+  TritonMetric cached_;
+  TritonMetric high_water_mark_;
+};
+
+/**
+ * @brief Stages of the execution of a batch, timed by the execution metrics.
+ */
+enum class ExecutionStage {
+  kGenerateInputs = 0,
+  kCopyInputs,
+  kRun,
+  kAllocateOutputs,
+  kCopyOutputs,
+  kCount
+};
+
+inline const char *to_string(ExecutionStage stage) {
+  switch (stage) {
+    case ExecutionStage::kGenerateInputs:
+      return "generate_inputs";
+    case ExecutionStage::kCopyInputs:
+      return "copy_inputs";
+    case ExecutionStage::kRun:
+      return "run";
+    case ExecutionStage::kAllocateOutputs:
+      return "allocate_outputs";
+    case ExecutionStage::kCopyOutputs:
+      return "copy_outputs";
+    default:
+      return "unknown";
+  }
+}
+
+/**
+ * @brief Counter families of the execution metrics, shared by all the DALI models.
+ *
+ * Every model creates its own metrics within the families (see ModelMetrics).
+ */
+class ExecutionMetricFamilies {
+ public:
+  ExecutionMetricFamilies() :
+      stage_duration_(TritonMetricFamily::New(
+          TRITONSERVER_METRIC_KIND_COUNTER, "nv_dali_stage_duration_us",
+          "Cumulative time spent by the DALI backend in each stage of the execution")),
+      bytes_(TritonMetricFamily::New(TRITONSERVER_METRIC_KIND_COUNTER, "nv_dali_bytes",
+                                     "Cumulative size of the inputs fed to and the outputs "
+                                     "copied from the DALI pipelines")),
+      inputs_(TritonMetricFamily::New(TRITONSERVER_METRIC_KIND_COUNTER, "nv_dali_input_count",
+                                      "Number of inputs fed to the DALI pipelines, by the way "
+                                      "they were passed")),
+      iterations_(TritonMetricFamily::New(TRITONSERVER_METRIC_KIND_COUNTER,
+                                          "nv_dali_iteration_count",
+                                          "Number of DALI pipeline iterations run for the "
+                                          "inference requests")),
+      requests_(TritonMetricFamily::New(TRITONSERVER_METRIC_KIND_COUNTER,
+                                        "nv_dali_request_count",
+                                        "Number of inference requests merged into the DALI "
+                                        "pipeline iterations")),
+      responses_(TritonMetricFamily::New(TRITONSERVER_METRIC_KIND_COUNTER,
+                                         "nv_dali_response_count",
+                                         "Number of responses sent by the DALI backend")),
+      response_cache_(TritonMetricFamily::New(TRITONSERVER_METRIC_KIND_COUNTER,
+                                              "nv_dali_response_cache_count",
+                                              "Number of samples looked up in the response "
+                                              "cache, by the result of the lookup")) {}
+
+ private:
+  friend class ModelMetrics;
+  TritonMetricFamily stage_duration_;
+  TritonMetricFamily bytes_;
+  TritonMetricFamily inputs_;
+  TritonMetricFamily iterations_;
+  TritonMetricFamily requests_;
+  TritonMetricFamily responses_;
+  TritonMetricFamily response_cache_;
+};
+
+/**
+ * @brief Execution metrics of a single model version, labeled with the model name and version.
+ *
+ * The metrics are shared by all the instances of the model.
+ */
+class ModelMetrics {
+ public:
+  ModelMetrics(const ExecutionMetricFamilies &families, const std::string &model_name,
+               uint64_t model_version) {
+    auto version = std::to_string(model_version);
+    for (int i = 0; i < static_cast<int>(ExecutionStage::kCount); i++) {
+      stages_[i] = TritonMetric::New(families.stage_duration_,
+                                     {{"model", model_name},
+                                      {"version", version},
+                                      {"stage", to_string(static_cast<ExecutionStage>(i))}});
+    }
+    bytes_in_ = TritonMetric::New(
+        families.bytes_, {{"model", model_name}, {"version", version}, {"direction", "in"}});
+    bytes_out_ = TritonMetric::New(
+        families.bytes_, {{"model", model_name}, {"version", version}, {"direction", "out"}});
+    direct_inputs_ = TritonMetric::New(
+        families.inputs_, {{"model", model_name}, {"version", version}, {"path", "no_copy"}});
+    sample_inputs_ = TritonMetric::New(
+        families.inputs_, {{"model", model_name}, {"version", version}, {"path", "per_sample"}});
+    copied_inputs_ = TritonMetric::New(
+        families.inputs_, {{"model", model_name}, {"version", version}, {"path", "copy"}});
+    iterations_ =
+        TritonMetric::New(families.iterations_, {{"model", model_name}, {"version", version}});
+    requests_ =
+        TritonMetric::New(families.requests_, {{"model", model_name}, {"version", version}});
+    responses_ =
+        TritonMetric::New(families.responses_, {{"model", model_name}, {"version", version}});
+    cache_hits_ = TritonMetric::New(
+        families.response_cache_, {{"model", model_name}, {"version", version}, {"result", "hit"}});
+    cache_misses_ = TritonMetric::New(
+        families.response_cache_,
+        {{"model", model_name}, {"version", version}, {"result", "miss"}});
+  }
+
+  void ReportStage(ExecutionStage stage, const TimeInterval &interval) const {
+    ReportStage(stage, interval.end - interval.start);
+  }
+
+  void ReportStage(ExecutionStage stage, int64_t ns) const {
+    stages_[static_cast<int>(stage)].Increment(ns / 1000.);
+  }
+
+  /**
+   * @brief Report how the inputs of an iteration were fed to the pipeline.
+   */
+  void ReportInputs(const CopyStats &stats) const {
+    bytes_in_.Increment(stats.fed_bytes);
+    direct_inputs_.Increment(stats.no_copy_inputs);
+    sample_inputs_.Increment(stats.per_sample_inputs);
+    copied_inputs_.Increment(stats.copied_inputs);
+    if (stats.bytes > 0) {
+      ReportStage(ExecutionStage::kCopyInputs, stats.ns);
+    }
+  }
+
+  void ReportOutputs(size_t output_bytes) const {
+    bytes_out_.Increment(output_bytes);
+  }
+
+  /**
+   * @brief Report \p num_iterations pipeline iterations, that \p num_requests requests
+   *        were merged into.
+   */
+  void ReportIterations(size_t num_iterations, size_t num_requests) const {
+    iterations_.Increment(num_iterations);
+    requests_.Increment(num_requests);
+  }
+
+  void ReportResponses(size_t num_responses) const {
+    responses_.Increment(num_responses);
+  }
+
+  void ReportResponseCache(size_t hits, size_t misses) const {
+    cache_hits_.Increment(hits);
+    cache_misses_.Increment(misses);
+  }
+
+ private:
+  std::array<TritonMetric, static_cast<int>(ExecutionStage::kCount)> stages_;
+  TritonMetric bytes_in_;
+  TritonMetric bytes_out_;
+  TritonMetric direct_inputs_;
+  TritonMetric sample_inputs_;
+  TritonMetric copied_inputs_;
+  TritonMetric iterations_;
+  TritonMetric requests_;
+  TritonMetric responses_;
+  TritonMetric cache_hits_;
+  TritonMetric cache_misses_;
+};
+
+/**
+ * @brief Measure the duration of an execution stage and report it, when stopped or destroyed.
+ *
+ * Does nothing, if the metrics are not available.
+ */
+class StageTimer {
+ public:
+  StageTimer(const ModelMetrics *metrics, ExecutionStage stage) : metrics_(metrics), stage_(stage) {
+    if (metrics_)
+      start_timer_ns(interval_);
+  }
+
+  StageTimer(const StageTimer &) = delete;
+  StageTimer &operator=(const StageTimer &) = delete;
+
+  ~StageTimer() {
+    stop();
+  }
+
+  void stop() {
+    if (metrics_) {
+      end_timer_ns(interval_);
+      metrics_->ReportStage(stage_, interval_);
+      metrics_ = nullptr;
+    }
+  }
+
+ private:
+  const ModelMetrics *metrics_;
+  ExecutionStage stage_;
+  TimeInterval interval_{};
+};
+
+}}}  // namespace triton::backend::dali
+
+#endif  // DALI_BACKEND_METRICS_H_
@@ -0,0 +1,121 @@
+// The MIT License (MIT)
+//
+// Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+#ifndef DALI_BACKEND_MODEL_PROVIDER_AUTOSERIALIZE_CACHE_H_
+#define DALI_BACKEND_MODEL_PROVIDER_AUTOSERIALIZE_CACHE_H_
+
+#include <unistd.h>
+
+#include <cstdint>
+#include <filesystem>
+#include <fstream>
+#include <iomanip>
+#include <sstream>
+#include <string>
+#include <thread>
+#include <utility>
+
+namespace triton { namespace backend { namespace dali {
+
+/**
+ * @brief On-disk cache of the autoserialized pipelines.
+ *
+ * The entries are addressed by a hash of the pipeline definition source and the DALI version,
+ * so that changing either of them results in a cache miss.
+ * Only the source of the pipeline definition file is hashed, the changes in the modules
+ * it imports are not detected.
+ */
+class AutoserializeCache {
+ public:
+  AutoserializeCache(std::string cache_dir, std::string dali_version) :
+      cache_dir_(std::move(cache_dir)), dali_version_(std::move(dali_version)) {}
+
+  /**
+   * @brief Get the key of the pipeline defined by the `module_source`.
+   */
+  std::string Key(const std::string& module_source) const {
+    uint64_t hash = kFnvOffset;
+    hash = Fnv1a(hash, dali_version_);
+    hash = Fnv1a(hash, std::string(1, '\0'));
+    hash = Fnv1a(hash, module_source);
+    std::stringstream ss;
+    ss << std::hex << std::setw(16) << std::setfill('0') << hash;
+    return ss.str();
+  }
+
+  /**
+   * @brief Path of the file, where the serialized pipeline with a given key is stored.
+   */
+  std::string EntryPath(const std::string& key) const {
+    return (std::filesystem::path(cache_dir_) / (key + ".dali")).string();
+  }
+
+  bool Contains(const std::string& key) const {
+    std::error_code ec;
+    return std::filesystem::is_regular_file(EntryPath(key), ec);
+  }
+
+  /**
+   * @brief Store the serialized pipeline.
+   *
+   * The entry is written to a temporary file first and then renamed, so that the concurrent
+   * model loads never see a partially written entry.
+   */
+  void Put(const std::string& key, const std::string& serialized_pipeline) const {
+    std::filesystem::create_directories(cache_dir_);
+    auto entry_path = EntryPath(key);
+    auto tmp_path = entry_path + ".tmp" + std::to_string(getpid()) + "_" +
+                    std::to_string(std::hash<std::thread::id>{}(std::this_thread::get_id()));
+    {
+      std::ofstream fout(tmp_path, std::ios::binary | std::ios::trunc);
+      if (!fout)
+        throw std::runtime_error("Failed to open the autoserialization cache file: " + tmp_path);
+      fout.write(serialized_pipeline.data(), serialized_pipeline.size());
+      if (!fout)
+        throw std::runtime_error("Failed to write the autoserialization cache file: " + tmp_path);
+    }
+    std::filesystem::rename(tmp_path, entry_path);
+  }
+
+  const std::string& Dir() const {
+    return cache_dir_;
+  }
+
+ private:
+  static constexpr uint64_t kFnvOffset = 14695981039346656037ull;
+  static constexpr uint64_t kFnvPrime = 1099511628211ull;
+
+  static uint64_t Fnv1a(uint64_t hash, const std::string& data) {
+    for (unsigned char c : data) {
+      hash ^= c;
+      hash *= kFnvPrime;
+    }
+    return hash;
+  }
+
+  std::string cache_dir_;
+  std::string dali_version_;
+};
+
+}}}  // namespace triton::backend::dali
+
+#endif  // DALI_BACKEND_MODEL_PROVIDER_AUTOSERIALIZE_CACHE_H_
@@ -0,0 +1,52 @@
+// The MIT License (MIT)
+//
+// Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+#include <catch2/catch.hpp>
+
+#include <filesystem>
+
+#include "src/model_provider/autoserialize_cache.h"
+#include "src/model_provider/model_provider.h"
+
+namespace triton { namespace backend { namespace dali { namespace test {
+
+TEST_CASE("Autoserialize cache") {
+  auto cache_dir = std::filesystem::temp_directory_path() /
+                   ("dali_autoserialize_cache_test_" + std::to_string(getpid()));
+  AutoserializeCache cache(cache_dir.string(), "1.0.0");
+  std::string source = "@pipeline_def\ndef pipe():\n  return fn.external_source(name='IN')\n";
+
+  auto key = cache.Key(source);
+  REQUIRE(key == cache.Key(source));
+  REQUIRE(key != cache.Key(source + " "));
+  REQUIRE(key != AutoserializeCache(cache_dir.string(), "1.0.1").Key(source));
+
+  REQUIRE(!cache.Contains(key));
+  std::string serialized("serialized\0pipeline", 19);
+  cache.Put(key, serialized);
+  REQUIRE(cache.Contains(key));
+  REQUIRE(FileModelProvider(cache.EntryPath(key)).GetModel() == serialized);
+
+  std::filesystem::remove_all(cache_dir);
+}
+
+}}}}  // namespace triton::backend::dali::test
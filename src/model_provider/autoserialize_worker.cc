@@ -0,0 +1,288 @@
+// The MIT License (MIT)
+//
+// Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+#include "src/model_provider/autoserialize_worker.h"
+
+#include <poll.h>
+#include <signal.h>
+#include <spawn.h>
+#include <sys/socket.h>
+#include <sys/wait.h>
+#include <unistd.h>
+
+#include <algorithm>
+#include <cerrno>
+#include <cstring>
+#include <limits>
+#include <stdexcept>
+
+namespace triton { namespace backend { namespace dali {
+
+namespace {
+
+const char kWorkerScript[] = R"py(
+import importlib.util, os, sys, sysconfig, tempfile, traceback
+from nvidia.dali._utils.autoserialize import invoke_autoserialize
+
+requests = sys.stdin.buffer
+responses = sys.stdout.buffer
+# Whatever the pipeline definitions print must not get mixed with the responses
+sys.stdout = sys.stderr
+
+installed = tuple(os.path.realpath(sysconfig.get_paths()[key])
+                  for key in ('stdlib', 'platstdlib', 'purelib', 'platlib'))
+
+
+def forget_modules(known):
+    # The local modules imported by a pipeline definition must not be reused by the next
+    # requests, while the installed packages (DALI in particular) stay imported.
+    for name in set(sys.modules) - known:
+        path = getattr(sys.modules.get(name), '__file__', None)
+        if path and not os.path.realpath(path).startswith(installed):
+            del sys.modules[name]
+
+
+def serialize(module_path):
+    # Each definition runs in a fresh module and leaves sys.path and the cwd as it found them
+    known = set(sys.modules)
+    path = list(sys.path)
+    cwd = os.getcwd()
+    fd, target = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        spec = importlib.util.spec_from_file_location('autoserialize_mod', module_path)
+        head_module = importlib.util.module_from_spec(spec)
+        sys.modules['autoserialize_mod'] = head_module
+        spec.loader.exec_module(head_module)
+        invoke_autoserialize(head_module, target)
+        with open(target, 'rb') as f:
+            return f.read()
+    finally:
+        os.remove(target)
+        sys.modules.pop('autoserialize_mod', None)
+        forget_modules(known)
+        sys.path[:] = path
+        os.chdir(cwd)
+        importlib.invalidate_caches()
+
+
+for line in requests:
+    try:
+        status, data = b'OK', serialize(line.decode().rstrip('\n'))
+    except BaseException:
+        status, data = b'ERR', traceback.format_exc().encode()
+    responses.write(b'%s %d\n' % (status, len(data)))
+    responses.write(data)
+    responses.flush()
+)py";
+
+struct WorkerDied : public std::runtime_error {
+  explicit WorkerDied(const std::string &msg) : std::runtime_error(msg) {}
+};
+
+struct WorkerTimeout : public std::runtime_error {
+  explicit WorkerTimeout(const std::string &msg) : std::runtime_error(msg) {}
+};
+
+std::string errno_string() {
+  return std::strerror(errno);
+}
+
+}  // namespace
+
+
+AutoserializeWorker &AutoserializeWorker::Instance() {
+  static AutoserializeWorker worker;
+  return worker;
+}
+
+
+std::string AutoserializeWorker::Serialize(const std::string &module_path) {
+  if (module_path.find('\n') != std::string::npos) {
+    throw std::runtime_error("Unsupported pipeline definition path: " + module_path);
+  }
+  std::lock_guard<std::mutex> lock(mutex_);
+  for (int attempt = 0;; ++attempt) {
+    if (pid_ < 0) {
+      Start();
+    }
+    try {
+      return Request(module_path);
+    } catch (const WorkerDied &e) {
+      StopImpl();
+      if (attempt > 0) {
+        throw std::runtime_error(std::string("Autoserialization worker died: ") + e.what());
+      }
+      // Restart the worker and try again
+    } catch (const WorkerTimeout &e) {
+      StopImpl();
+      throw std::runtime_error(std::string("Autoserialization of ") + module_path +
+                               " timed out: " + e.what());
+    }
+  }
+}
+
+
+void AutoserializeWorker::SetTimeout(std::chrono::milliseconds timeout) {
+  std::lock_guard<std::mutex> lock(mutex_);
+  timeout_ = timeout;
+}
+
+
+void AutoserializeWorker::Stop() {
+  std::lock_guard<std::mutex> lock(mutex_);
+  StopImpl();
+}
+
+
+void AutoserializeWorker::Start() {
+  int fds[2];
+  if (socketpair(AF_UNIX, SOCK_STREAM | SOCK_CLOEXEC, 0, fds) != 0) {
+    throw std::runtime_error("Failed to create a socket for the autoserialization worker: " +
+                             errno_string());
+  }
+  posix_spawn_file_actions_t actions;
+  posix_spawn_file_actions_init(&actions);
+  posix_spawn_file_actions_adddup2(&actions, fds[1], STDIN_FILENO);
+  posix_spawn_file_actions_adddup2(&actions, fds[1], STDOUT_FILENO);
+  const char *argv[] = {"python3", "-u", "-c", kWorkerScript, nullptr};
+  pid_t pid;
+  int err = posix_spawnp(&pid, "python3", &actions, nullptr, const_cast<char *const *>(argv),
+                         environ);
+  posix_spawn_file_actions_destroy(&actions);
+  close(fds[1]);
+  if (err != 0) {
+    close(fds[0]);
+    throw std::runtime_error(std::string("Failed to start the autoserialization worker: ") +
+                             std::strerror(err));
+  }
+  pid_ = pid;
+  fd_ = fds[0];
+  read_buffer_.clear();
+}
+
+
+void AutoserializeWorker::StopImpl() {
+  if (fd_ >= 0) {
+    close(fd_);
+    fd_ = -1;
+  }
+  if (pid_ > 0) {
+    kill(pid_, SIGKILL);
+    waitpid(pid_, nullptr, 0);
+    pid_ = -1;
+  }
+  read_buffer_.clear();
+}
+
+
+std::string AutoserializeWorker::Request(const std::string &module_path) {
+  auto deadline = std::chrono::steady_clock::now() + timeout_;
+  Send(module_path + "\n", deadline);
+  auto header = ReadLine(deadline);
+  auto sep = header.find(' ');
+  if (sep == std::string::npos) {
+    throw WorkerDied("Malformed response: " + header);
+  }
+  auto status = header.substr(0, sep);
+  auto size = std::stoull(header.substr(sep + 1));
+  auto data = Read(size, deadline);
+  if (status != "OK") {
+    throw std::runtime_error("Failed to autoserialize " + module_path + ":\n" + data);
+  }
+  return data;
+}
+
+
+void AutoserializeWorker::Send(const std::string &data,
+                               std::chrono::steady_clock::time_point deadline) {
+  size_t offset = 0;
+  while (offset < data.size()) {
+    Wait(POLLOUT, deadline);
+    auto n = send(fd_, data.data() + offset, data.size() - offset, MSG_NOSIGNAL);
+    if (n < 0) {
+      if (errno == EINTR || errno == EAGAIN)
+        continue;
+      throw WorkerDied("Failed to send the request: " + errno_string());
+    }
+    offset += n;
+  }
+}
+
+
+std::string AutoserializeWorker::ReadLine(std::chrono::steady_clock::time_point deadline) {
+  size_t pos;
+  while ((pos = read_buffer_.find('\n')) == std::string::npos) {
+    Fill(read_buffer_.size() + 1, deadline);
+  }
+  auto line = read_buffer_.substr(0, pos);
+  read_buffer_.erase(0, pos + 1);
+  return line;
+}
+
+
+std::string AutoserializeWorker::Read(size_t size, std::chrono::steady_clock::time_point deadline) {
+  Fill(size, deadline);
+  auto data = read_buffer_.substr(0, size);
+  read_buffer_.erase(0, size);
+  return data;
+}
+
+
+void AutoserializeWorker::Fill(size_t size, std::chrono::steady_clock::time_point deadline) {
+  char chunk[1 << 16];
+  while (read_buffer_.size() < size) {
+    Wait(POLLIN, deadline);
+    auto n = recv(fd_, chunk, sizeof(chunk), 0);
+    if (n == 0) {
+      throw WorkerDied("The worker exited.");
+    }
+    if (n < 0) {
+      if (errno == EINTR || errno == EAGAIN)
+        continue;
+      throw WorkerDied("Failed to read the response: " + errno_string());
+    }
+    read_buffer_.append(chunk, n);
+  }
+}
+
+
+void AutoserializeWorker::Wait(short events, std::chrono::steady_clock::time_point deadline) {
+  while (true) {
+    auto remaining = std::chrono::duration_cast<std::chrono::milliseconds>(
+        deadline - std::chrono::steady_clock::now());
+    if (remaining.count() <= 0) {
+      throw WorkerTimeout("no response from the worker");
+    }
+    pollfd pfd{fd_, events, 0};
+    auto timeout_ms = std::min<int64_t>(remaining.count(), std::numeric_limits<int>::max());
+    int ret = poll(&pfd, 1, static_cast<int>(timeout_ms));
+    if (ret > 0) {
+      return;
+    }
+    if (ret < 0 && errno != EINTR) {
+      throw WorkerDied("Failed to wait for the worker: " + errno_string());
+    }
+  }
+}
+
+}}}  // namespace triton::backend::dali
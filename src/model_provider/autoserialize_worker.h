@@ -0,0 +1,129 @@
+// The MIT License (MIT)
+//
+// Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+#ifndef DALI_BACKEND_MODEL_PROVIDER_AUTOSERIALIZE_WORKER_H_
+#define DALI_BACKEND_MODEL_PROVIDER_AUTOSERIALIZE_WORKER_H_
+
+#include <sys/types.h>
+
+#include <chrono>
+#include <mutex>
+#include <string>
+
+#include "src/model_provider/model_provider.h"
+
+namespace triton { namespace backend { namespace dali {
+
+/**
+ * @brief Long-lived Python process, that autoserializes the pipelines.
+ *
+ * The worker is started with the first request, so the Python interpreter start-up and
+ * the DALI import are paid once, instead of once per model load. The requests are served
+ * one at a time; concurrent callers wait for their turn.
+ *
+ * A worker that crashed is restarted and the request is retried once. A worker that doesn't
+ * respond within the timeout is killed and the request fails.
+ */
+class AutoserializeWorker {
+ public:
+  static constexpr std::chrono::seconds kDefaultTimeout{300};
+
+  /**
+   * @brief The worker shared by all the models of the backend.
+   */
+  static AutoserializeWorker &Instance();
+
+  explicit AutoserializeWorker(std::chrono::milliseconds timeout = kDefaultTimeout) :
+      timeout_(timeout) {}
+
+  ~AutoserializeWorker() {
+    Stop();
+  }
+
+  AutoserializeWorker(const AutoserializeWorker &) = delete;
+  AutoserializeWorker &operator=(const AutoserializeWorker &) = delete;
+
+  /**
+   * @brief Autoserialize the pipeline defined in the `module_path`.
+   * @return Serialized pipeline.
+   */
+  std::string Serialize(const std::string &module_path);
+
+  void SetTimeout(std::chrono::milliseconds timeout);
+
+  /**
+   * @brief Terminate the worker process, if it's running.
+   */
+  void Stop();
+
+ private:
+  void Start();
+
+  void StopImpl();
+
+  std::string Request(const std::string &module_path);
+
+  void Send(const std::string &data, std::chrono::steady_clock::time_point deadline);
+
+  std::string ReadLine(std::chrono::steady_clock::time_point deadline);
+
+  std::string Read(size_t size, std::chrono::steady_clock::time_point deadline);
+
+  /**
+   * @brief Receive the data from the worker, until at least `size` bytes are buffered.
+   */
+  void Fill(size_t size, std::chrono::steady_clock::time_point deadline);
+
+  /**
+   * @brief Wait until the worker's socket is ready for reading or writing.
+   */
+  void Wait(short events, std::chrono::steady_clock::time_point deadline);
+
+  std::mutex mutex_;
+  std::chrono::milliseconds timeout_;
+  pid_t pid_ = -1;
+  int fd_ = -1;
+  std::string read_buffer_;
+};
+
+
+/**
+ * @brief Provides a pipeline autoserialized by the AutoserializeWorker.
+ */
+class WorkerAutoserializeModelProvider : public ModelProvider {
+ public:
+  explicit WorkerAutoserializeModelProvider(const std::string &module_path) :
+      model_(AutoserializeWorker::Instance().Serialize(module_path)) {}
+
+  const std::string &GetModel() const override {
+    return model_;
+  }
+
+  ~WorkerAutoserializeModelProvider() override = default;
+
+ private:
+  std::string model_;
+};
+
+}}}  // namespace triton::backend::dali
+
+#endif  // DALI_BACKEND_MODEL_PROVIDER_AUTOSERIALIZE_WORKER_H_
@@ -0,0 +1,120 @@
+// The MIT License (MIT)
+//
+// Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+#include <catch2/catch.hpp>
+
+#include <unistd.h>
+
+#include <filesystem>
+#include <fstream>
+#include <string>
+
+#include "src/model_provider/autoserialize_worker.h"
+
+namespace triton { namespace backend { namespace dali { namespace test {
+
+namespace {
+
+const char kPipelineDef[] = R"py(
+import nvidia.dali as dali
+import nvidia.dali.fn as fn
+from nvidia.dali.plugin.triton import autoserialize
+
+
+@autoserialize
+@dali.pipeline_def(batch_size=1, num_threads=1, device_id=None)
+def pipeline():
+  return fn.external_source(device='cpu', name=INPUT_NAME)
+)py";
+
+/**
+ * @brief Write a pipeline definition, with the `prologue` run before the pipeline is defined.
+ */
+std::string WriteDefinition(const std::filesystem::path &path, const std::string &prologue) {
+  std::filesystem::create_directories(path.parent_path());
+  std::ofstream(path) << prologue << "\n" << kPipelineDef;
+  return path.string();
+}
+
+}  // namespace
+
+TEST_CASE("Autoserialize worker") {
+  auto dir = std::filesystem::temp_directory_path() /
+             ("dali_autoserialize_worker_test_" + std::to_string(getpid()));
+  AutoserializeWorker worker;
+  auto trivial = WriteDefinition(dir / "trivial.py", "INPUT_NAME = 'DALI_INPUT_0'");
+  REQUIRE(worker.Serialize(trivial).find("DALI_INPUT_0") != std::string::npos);
+
+  SECTION("error") {
+    auto failing = WriteDefinition(dir / "failing.py", "raise ValueError('boom')");
+    REQUIRE_THROWS_WITH(worker.Serialize(failing),
+                        Catch::Contains("Traceback") && Catch::Contains("ValueError: boom"));
+    REQUIRE(worker.Serialize(trivial).find("DALI_INPUT_0") != std::string::npos);
+  }
+
+  SECTION("crash") {
+    auto marker = dir / "crashed";
+    auto crash_once = WriteDefinition(dir / "crash_once.py", R"py(
+import os
+if not os.path.exists(')py" + marker.string() + R"py('):
+  open(')py" + marker.string() + R"py(', 'w').close()
+  os._exit(1)
+INPUT_NAME = 'DALI_INPUT_1'
+)py");
+    REQUIRE(worker.Serialize(crash_once).find("DALI_INPUT_1") != std::string::npos);
+    REQUIRE(std::filesystem::exists(marker));
+
+    auto crash = WriteDefinition(dir / "crash.py", "import os\nos._exit(1)");
+    REQUIRE_THROWS_WITH(worker.Serialize(crash), Catch::Contains("worker died"));
+    REQUIRE(worker.Serialize(trivial).find("DALI_INPUT_0") != std::string::npos);
+  }
+
+  SECTION("timeout") {
+    auto hang = WriteDefinition(dir / "hang.py", "import time\ntime.sleep(60)");
+    worker.SetTimeout(std::chrono::seconds(1));
+    REQUIRE_THROWS_WITH(worker.Serialize(hang), Catch::Contains("timed out"));
+    worker.SetTimeout(AutoserializeWorker::kDefaultTimeout);
+    REQUIRE(worker.Serialize(trivial).find("DALI_INPUT_0") != std::string::npos);
+  }
+
+  SECTION("local modules") {
+    // Both definitions import their own `helper` module, the second one must not get the first
+    for (auto name : {"a", "b"}) {
+      std::filesystem::create_directories(dir / name);
+      std::ofstream(dir / name / "helper.py") << "INPUT_NAME = 'DALI_INPUT_" << name << "'\n";
+    }
+    const char import_helper[] = R"py(
+import os, sys
+sys.path.insert(0, os.path.dirname(__file__))
+from helper import INPUT_NAME
+)py";
+    auto a = WriteDefinition(dir / "a" / "model.py", import_helper);
+    auto b = WriteDefinition(dir / "b" / "model.py", import_helper);
+    REQUIRE(worker.Serialize(a).find("DALI_INPUT_a") != std::string::npos);
+    REQUIRE(worker.Serialize(b).find("DALI_INPUT_b") != std::string::npos);
+  }
+
+  worker.Stop();
+  std::filesystem::remove_all(dir);
+}
+
+}}}}  // namespace triton::backend::dali::test
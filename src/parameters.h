@@ -23,6 +23,7 @@
 #ifndef TRITONDALIBACKEND_PARAMETERS_H
 #define TRITONDALIBACKEND_PARAMETERS_H
 
+#include "src/dali_executor/host_memory_pool.h"
 #include "src/utils/triton.h"
 #include "src/utils/utils.h"
 
@@ -56,6 +57,70 @@ class ModelParameters {
     return GetParam("num_threads", -1);
   }
 
+  /**
+   * Number of batches that can be processed at once by a model instance.
+   * Values greater than 1 enable the pipelined execution.
+   */
+  int GetPipelineDepth() {
+    return GetParam("pipeline_depth", 1);
+  }
+
+  /**
+   * Number of requests, that an instance of an unbatched model processes at once,
+   * interleaving their iterations. Each of them is served by a separate pipeline.
+   */
+  int GetMaxInFlightRequests() {
+    return GetParam("max_in_flight_requests", 1);
+  }
+
+  /**
+   * Number of pipelines, that an instance of a batched model runs the batches on.
+   * The threads set with `num_threads` are split evenly between them.
+   */
+  int GetPipelineReplicas() {
+    return GetParam("pipeline_replicas", 1);
+  }
+
+  /**
+   * Size (in bytes) of the chunks, that the host-to-host input copies are split into.
+   * 0 disables the splitting, -1 (default) means the executor's default.
+   */
+  int GetCopyChunkSize() {
+    return GetParam("copy_chunk_size", -1);
+  }
+
+  /**
+   * Number of pipeline iterations run when the model instance is loaded, before it serves
+   * any requests. 0 (default) disables the warm-up.
+   */
+  int GetWarmupIterations() {
+    return GetParam("warmup_iterations", 0);
+  }
+
+  /**
+   * Directory with the warm-up samples, a file per input, named after the input.
+   * Relative paths are resolved against the model repository. If empty, the inputs are zeros.
+   */
+  std::string GetWarmupDataDir() {
+    return GetParam<std::string>("warmup_data_dir");
+  }
+
+  /**
+   * Capacity (in megabytes) of the cache of the pipeline outputs, addressed by the contents
+   * of the inputs. 0 (default) disables the cache.
+   */
+  int GetResponseCacheSizeMb() {
+    return GetParam("response_cache_size_mb", 0);
+  }
+
+  /**
+   * Inputs, that the server keeps between the requests, so that the clients can omit them.
+   */
+  std::vector<std::string> GetStickyInputs() {
+    std::string inputs_list = GetParam<std::string>("sticky_inputs");
+    return split(inputs_list, separator);
+  }
+
   std::vector<std::string> GetOutputsToSplit() {
     std::string outs_list = GetParam<std::string>("split_along_outer_axis");
     return split(outs_list, separator);
@@ -114,6 +179,37 @@ class BackendParameters {
     return GetParam<bool>("release_after_unload");
   }
 
+  /**
+   * Directory, where the autoserialized pipelines are cached. Empty disables the cache.
+   */
+  std::string GetAutoserializeCacheDir() const {
+    return GetParam<std::string>("autoserialize_cache_dir");
+  }
+
+  /**
+   * Whether the pipelines are autoserialized by a long-lived worker process, shared by all
+   * the models, instead of a new Python process per model.
+   */
+  bool UseAutoserializeWorker() const {
+    return GetParam<bool>("autoserialize_worker", false);
+  }
+
+  /**
+   * Timeout (in seconds) of a single autoserialization done by the worker.
+   */
+  int GetAutoserializeTimeout() const {
+    return GetParam<int>("autoserialize_timeout", 300);
+  }
+
+  HostPoolOptions GetHostPoolOptions() const {
+    HostPoolOptions options;
+    options.alignment = GetParam<int>("host_pool_alignment", options.alignment);
+    options.hugepages = GetParam<bool>("host_pool_hugepages", options.hugepages);
+    options.release_after_idle = std::chrono::milliseconds(GetParam<int>(
+        "host_pool_release_after_idle_ms", options.release_after_idle.count()));
+    return options;
+  }
+
  private:
   template<typename T>
   void GetMember(const std::string& key, T& value) const {
@@ -0,0 +1,340 @@
+// The MIT License (MIT)
+//
+// Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+#ifndef DALI_BACKEND_RESPONSE_CACHE_RESPONSE_CACHE_H_
+#define DALI_BACKEND_RESPONSE_CACHE_RESPONSE_CACHE_H_
+
+#include <algorithm>
+#include <cstddef>
+#include <cstdint>
+#include <cstring>
+#include <list>
+#include <memory>
+#include <mutex>
+#include <type_traits>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+#include "src/dali_executor/utils/dali.h"
+
+namespace triton { namespace backend { namespace dali {
+
+/**
+ * @brief Incremental 64-bit hash of a byte stream.
+ *
+ * The digest doesn't depend on how the stream is split between the Update calls,
+ * so a sample can be hashed piece by piece, when it spans many buffers.
+ * The stream is processed in 32-byte stripes, by four independent lanes (as in xxHash64),
+ * which makes hashing large samples (e.g. encoded images) fast.
+ */
+class SampleHasher {
+ public:
+  explicit SampleHasher(uint64_t seed = 0) :
+      lanes_{seed + kPrime1 + kPrime2, seed + kPrime2, seed, seed - kPrime1} {}
+
+  void Update(const void* data, size_t size) {
+    auto ptr = static_cast<const uint8_t*>(data);
+    length_ += size;
+    if (buffered_ > 0) {
+      size_t n = std::min(size, kStripe - buffered_);
+      std::memcpy(buffer_ + buffered_, ptr, n);
+      buffered_ += n;
+      ptr += n;
+      size -= n;
+      if (buffered_ < kStripe)
+        return;
+      Consume(buffer_);
+      buffered_ = 0;
+    }
+    for (; size >= kStripe; ptr += kStripe, size -= kStripe)
+      Consume(ptr);
+    std::memcpy(buffer_, ptr, size);
+    buffered_ = size;
+  }
+
+  template <typename T>
+  void UpdateValue(const T& value) {
+    static_assert(std::is_trivially_copyable<T>::value, "Only plain values can be hashed");
+    Update(&value, sizeof(T));
+  }
+
+  uint64_t Digest() const {
+    uint64_t h = Rotl(lanes_[0], 1) + Rotl(lanes_[1], 7) + Rotl(lanes_[2], 12) +
+                 Rotl(lanes_[3], 18);
+    for (auto lane : lanes_)
+      h = (h ^ Round(0, lane)) * kPrime1 + kPrime4;
+    h += length_;
+    size_t i = 0;
+    for (; i + 8 <= buffered_; i += 8)
+      h = Rotl(h ^ Round(0, Load64(buffer_ + i)), 27) * kPrime1 + kPrime4;
+    for (; i < buffered_; i++)
+      h = Rotl(h ^ (buffer_[i] * kPrime5), 11) * kPrime1;
+    h ^= h >> 33;
+    h *= kPrime2;
+    h ^= h >> 29;
+    h *= kPrime3;
+    h ^= h >> 32;
+    return h;
+  }
+
+ private:
+  static constexpr size_t kStripe = 32;
+  static constexpr uint64_t kPrime1 = 11400714785074694791ull;
+  static constexpr uint64_t kPrime2 = 14029467366897019727ull;
+  static constexpr uint64_t kPrime3 = 1609587929392839161ull;
+  static constexpr uint64_t kPrime4 = 9650029242287828579ull;
+  static constexpr uint64_t kPrime5 = 2870177450012600261ull;
+
+  static uint64_t Rotl(uint64_t x, int r) {
+    return (x << r) | (x >> (64 - r));
+  }
+
+  static uint64_t Load64(const uint8_t* ptr) {
+    uint64_t ret;
+    std::memcpy(&ret, ptr, sizeof(ret));
+    return ret;
+  }
+
+  static uint64_t Round(uint64_t acc, uint64_t input) {
+    acc += input * kPrime2;
+    acc = Rotl(acc, 31);
+    return acc * kPrime1;
+  }
+
+  void Consume(const uint8_t* stripe) {
+    for (int l = 0; l < 4; l++)
+      lanes_[l] = Round(lanes_[l], Load64(stripe + 8 * l));
+  }
+
+  uint64_t lanes_[4];
+  uint8_t buffer_[kStripe];
+  size_t buffered_ = 0;
+  uint64_t length_ = 0;
+};
+
+/**
+ * @brief The inputs of a single sample, identifying an entry of the response cache.
+ *
+ * The key is a sequence of byte pieces: the input data is referenced, while the metadata
+ * (names, types, shapes) is copied. Therefore, the key must not outlive the input buffers.
+ */
+class SampleKey {
+ public:
+  /**
+   * @brief Append a piece of the input data, without copying it.
+   */
+  void Add(const void* data, size_t size) {
+    if (size == 0)
+      return;
+    hasher_.Update(data, size);
+    pieces_.push_back({static_cast<const char*>(data), 0, size});
+    size_ += size;
+  }
+
+  /**
+   * @brief Append a copy of the given bytes.
+   */
+  void AddCopy(const void* data, size_t size) {
+    if (size == 0)
+      return;
+    hasher_.Update(data, size);
+    auto ptr = static_cast<const char*>(data);
+    pieces_.push_back({nullptr, metadata_.size(), size});
+    metadata_.insert(metadata_.end(), ptr, ptr + size);
+    size_ += size;
+  }
+
+  template <typename T>
+  void AddValue(const T& value) {
+    static_assert(std::is_trivially_copyable<T>::value, "Only plain values can be copied");
+    AddCopy(&value, sizeof(T));
+  }
+
+  uint64_t Hash() const {
+    return hasher_.Digest();
+  }
+
+  /**
+   * @brief Total size of the pieces, in bytes.
+   */
+  size_t Size() const {
+    return size_;
+  }
+
+  /**
+   * @brief Check if the concatenated pieces are equal to the \p bytes.
+   */
+  bool Matches(const std::vector<char>& bytes) const {
+    if (bytes.size() != size_)
+      return false;
+    const char* ptr = bytes.data();
+    for (auto& piece : pieces_) {
+      if (std::memcmp(ptr, Data(piece), piece.size) != 0)
+        return false;
+      ptr += piece.size;
+    }
+    return true;
+  }
+
+  /**
+   * @brief The concatenated pieces.
+   */
+  std::vector<char> Bytes() const {
+    std::vector<char> bytes;
+    bytes.reserve(size_);
+    for (auto& piece : pieces_)
+      bytes.insert(bytes.end(), Data(piece), Data(piece) + piece.size);
+    return bytes;
+  }
+
+ private:
+  struct Piece {
+    const char* data;  // nullptr, if the piece is stored in the metadata_ (at the offset)
+    size_t offset;
+    size_t size;
+  };
+
+  const char* Data(const Piece& piece) const {
+    return piece.data ? piece.data : metadata_.data() + piece.offset;
+  }
+
+  SampleHasher hasher_;
+  std::vector<Piece> pieces_;
+  std::vector<char> metadata_;
+  size_t size_ = 0;
+};
+
+/**
+ * @brief Outputs of the pipeline, produced for a single sample of the inputs.
+ */
+struct CachedSample {
+  struct Output {
+    dali_data_type_t type{};
+    TensorShape<> shape{};
+    std::vector<char> data{};
+  };
+
+  /// The inputs, that the outputs were produced for (see SampleKey::Bytes)
+  std::vector<char> inputs;
+  std::vector<Output> outputs;
+
+  size_t ByteSize() const {
+    size_t size = sizeof(*this) + inputs.size();
+    for (auto& output : outputs)
+      size += sizeof(output) + output.data.size();
+    return size;
+  }
+};
+
+/**
+ * @brief LRU cache of the per-sample pipeline outputs, bounded by the total size of the entries.
+ *
+ * The entries are addressed by the hash of the sample's inputs (see SampleKey). Every entry
+ * stores the inputs, which are compared with the key on a lookup, so a hash collision is a miss
+ * rather than the outputs of another sample.
+ * The cache is shared by all the instances of a model, so it's thread-safe.
+ */
+class ResponseCache {
+ public:
+  explicit ResponseCache(size_t capacity) : capacity_(capacity) {}
+
+  /**
+   * @brief Get the entry with a given key and mark it as the most recently used.
+   * @return The entry or nullptr, if there's no such entry.
+   */
+  std::shared_ptr<const CachedSample> Get(const SampleKey& key) {
+    uint64_t hash = key.Hash();
+    std::shared_ptr<const CachedSample> sample;
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      auto it = index_.find(hash);
+      if (it == index_.end())
+        return nullptr;
+      lru_.splice(lru_.begin(), lru_, it->second);
+      sample = it->second->second;
+    }
+    // The entries are immutable, so the (possibly large) inputs are compared without the lock
+    return key.Matches(sample->inputs) ? sample : nullptr;
+  }
+
+  /**
+   * @brief Insert (or replace) the entry, evicting the least recently used ones,
+   *        if the capacity would be exceeded.
+   *
+   * The inputs of the \p sample are set to the ones of the \p key.
+   * The entries larger than the whole capacity are not stored.
+   */
+  void Put(const SampleKey& key, std::shared_ptr<CachedSample> sample) {
+    sample->inputs = key.Bytes();
+    size_t size = sample->ByteSize();
+    if (size > capacity_)
+      return;
+    uint64_t hash = key.Hash();
+    std::lock_guard<std::mutex> lock(mutex_);
+    auto it = index_.find(hash);
+    if (it != index_.end()) {
+      size_ -= it->second->second->ByteSize();
+      lru_.erase(it->second);
+      index_.erase(it);
+    }
+    while (size_ + size > capacity_) {
+      auto& last = lru_.back();
+      size_ -= last.second->ByteSize();
+      index_.erase(last.first);
+      lru_.pop_back();
+    }
+    lru_.emplace_front(hash, std::move(sample));
+    index_[hash] = lru_.begin();
+    size_ += size;
+  }
+
+  /**
+   * @brief Total size of the entries, in bytes.
+   */
+  size_t Size() const {
+    std::lock_guard<std::mutex> lock(mutex_);
+    return size_;
+  }
+
+  size_t Count() const {
+    std::lock_guard<std::mutex> lock(mutex_);
+    return index_.size();
+  }
+
+  size_t Capacity() const {
+    return capacity_;
+  }
+
+ private:
+  using Entry = std::pair<uint64_t, std::shared_ptr<const CachedSample>>;
+
+  mutable std::mutex mutex_;
+  std::list<Entry> lru_;
+  std::unordered_map<uint64_t, std::list<Entry>::iterator> index_;
+  size_t capacity_;
+  size_t size_ = 0;
+};
+
+}}}  // namespace triton::backend::dali
+
+#endif  // DALI_BACKEND_RESPONSE_CACHE_RESPONSE_CACHE_H_
@@ -0,0 +1,162 @@
+// The MIT License (MIT)
+//
+// Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+#include <catch2/catch.hpp>
+
+#include <cstring>
+#include <numeric>
+#include <vector>
+
+#include "src/response_cache/response_cache.h"
+
+namespace triton { namespace backend { namespace dali { namespace test {
+
+TEST_CASE("Sample hasher") {
+  std::vector<uint8_t> data(1000);
+  std::iota(data.begin(), data.end(), 0);
+  SampleHasher whole;
+  whole.Update(data.data(), data.size());
+
+  SECTION("Digest doesn't depend on how the data is split") {
+    for (size_t split : {1, 7, 31, 32, 33, 500, 999}) {
+      SampleHasher pieces;
+      pieces.Update(data.data(), split);
+      pieces.Update(data.data() + split, data.size() - split);
+      REQUIRE(pieces.Digest() == whole.Digest());
+    }
+  }
+
+  SECTION("Digest depends on the contents and the length") {
+    SampleHasher shorter;
+    shorter.Update(data.data(), data.size() - 1);
+    REQUIRE(shorter.Digest() != whole.Digest());
+    data[500] ^= 1;
+    SampleHasher modified;
+    modified.Update(data.data(), data.size());
+    REQUIRE(modified.Digest() != whole.Digest());
+  }
+}
+
+TEST_CASE("Sample key") {
+  std::vector<char> data(100);
+  std::iota(data.begin(), data.end(), 0);
+  int64_t shape[] = {10, 10};
+  SampleKey key;
+  key.AddCopy("input", 6);
+  key.AddValue(shape);
+  key.Add(data.data(), 50);
+  key.Add(data.data() + 50, 50);
+  REQUIRE(key.Size() == 6 + sizeof(shape) + 100);
+
+  SECTION("Bytes are the concatenated pieces") {
+    auto bytes = key.Bytes();
+    REQUIRE(bytes.size() == key.Size());
+    REQUIRE(std::memcmp(bytes.data(), "input", 6) == 0);
+    REQUIRE(std::memcmp(bytes.data() + 6, shape, sizeof(shape)) == 0);
+    REQUIRE(std::memcmp(bytes.data() + 6 + sizeof(shape), data.data(), 100) == 0);
+    REQUIRE(key.Matches(bytes));
+  }
+
+  SECTION("Hash doesn't depend on how the pieces are split") {
+    SampleKey other;
+    other.AddCopy("inp", 3);
+    other.AddCopy("ut", 3);
+    other.AddValue(shape);
+    other.Add(data.data(), 100);
+    REQUIRE(other.Hash() == key.Hash());
+    REQUIRE(other.Matches(key.Bytes()));
+  }
+
+  SECTION("Data is referenced, while the metadata is copied") {
+    auto bytes = key.Bytes();
+    shape[0] = 5;
+    REQUIRE(key.Matches(bytes));
+    data[99] ^= 1;
+    REQUIRE(!key.Matches(bytes));
+  }
+
+  SECTION("Keys of a different size don't match") {
+    auto bytes = key.Bytes();
+    bytes.push_back(0);
+    REQUIRE(!key.Matches(bytes));
+  }
+}
+
+SampleKey MakeKey(int id) {
+  SampleKey key;
+  key.AddValue(id);
+  return key;
+}
+
+std::shared_ptr<CachedSample> MakeSample(size_t size) {
+  auto sample = std::make_shared<CachedSample>();
+  sample->outputs.resize(1);
+  sample->outputs[0].data.resize(size);
+  return sample;
+}
+
+TEST_CASE("Response cache") {
+  const size_t entry_size = MakeSample(100)->ByteSize() + sizeof(int);
+  ResponseCache cache(3 * entry_size);
+  cache.Put(MakeKey(1), MakeSample(100));
+  cache.Put(MakeKey(2), MakeSample(100));
+  cache.Put(MakeKey(3), MakeSample(100));
+  REQUIRE(cache.Count() == 3);
+  REQUIRE(cache.Size() == 3 * entry_size);
+
+  SECTION("Least recently used entry is evicted") {
+    REQUIRE(cache.Get(MakeKey(1)));
+    cache.Put(MakeKey(4), MakeSample(100));
+    REQUIRE(cache.Count() == 3);
+    REQUIRE(!cache.Get(MakeKey(2)));
+    REQUIRE(cache.Get(MakeKey(1)));
+    REQUIRE(cache.Get(MakeKey(3)));
+    REQUIRE(cache.Get(MakeKey(4)));
+  }
+
+  SECTION("Replacing an entry") {
+    cache.Put(MakeKey(2), MakeSample(100));
+    REQUIRE(cache.Count() == 3);
+    REQUIRE(cache.Size() == 3 * entry_size);
+  }
+
+  SECTION("Entries exceeding the capacity are not stored") {
+    cache.Put(MakeKey(5), MakeSample(4 * entry_size));
+    REQUIRE(!cache.Get(MakeKey(5)));
+    REQUIRE(cache.Count() == 3);
+  }
+}
+
+TEST_CASE("Response cache verifies the inputs") {
+  ResponseCache cache(1 << 20);
+  auto sample = MakeSample(100);
+  cache.Put(MakeKey(1), sample);
+  REQUIRE(sample->inputs == MakeKey(1).Bytes());
+  REQUIRE(cache.Get(MakeKey(1)) == sample);
+
+  // An entry of other inputs stored under the same hash, as if the hashes collided
+  sample->inputs = MakeKey(2).Bytes();
+  REQUIRE(!cache.Get(MakeKey(1)));
+  REQUIRE(cache.Count() == 1);
+}
+
+}}}}  // namespace triton::backend::dali::test
@@ -0,0 +1,290 @@
+// The MIT License (MIT)
+//
+// Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+#ifndef DALI_BACKEND_STICKY_INPUTS_STICKY_INPUTS_H_
+#define DALI_BACKEND_STICKY_INPUTS_STICKY_INPUTS_H_
+
+#include <algorithm>
+#include <cstring>
+#include <fstream>
+#include <memory>
+#include <mutex>
+#include <sstream>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+#include "src/config_tools/config_tools.h"
+#include "src/dali_executor/io_buffer.h"
+#include "src/dali_executor/io_descriptor.h"
+#include "src/dali_executor/utils/dali.h"
+#include "src/error_handling.h"
+#include "src/utils/utils.h"
+
+namespace triton { namespace backend { namespace dali {
+
+/**
+ * @brief Constant input tensor kept by the server, so that the clients don't need to send it.
+ *
+ * For the batched models, the tensor is a single sample, that is repeated for every sample
+ * of a request. For the unbatched models, the tensor is the whole input (with the leading
+ * batch dimension).
+ */
+struct StickyInput {
+  IOMeta meta;
+  std::vector<char> data;
+};
+
+/**
+ * @brief Map the NumPy type description (e.g. "<f4") to the DALI data type.
+ */
+inline dali_data_type_t NpyToDaliType(const std::string &descr) {
+  ENFORCE(descr.size() >= 3 && descr[0] != '>',
+          make_string("Unsupported .npy data type: ", descr,
+                      ". Only little-endian arrays are supported."));
+  static const std::unordered_map<std::string, dali_data_type_t> types = {
+      {"b1", DALI_BOOL},    {"u1", DALI_UINT8},   {"i1", DALI_INT8},    {"u2", DALI_UINT16},
+      {"i2", DALI_INT16},   {"u4", DALI_UINT32},  {"i4", DALI_INT32},   {"u8", DALI_UINT64},
+      {"i8", DALI_INT64},   {"f2", DALI_FLOAT16}, {"f4", DALI_FLOAT},   {"f8", DALI_FLOAT64}};
+  auto it = types.find(descr.substr(1));
+  ENFORCE(it != types.end(), make_string("Unsupported .npy data type: ", descr));
+  return it->second;
+}
+
+/**
+ * @brief Parse the \p contents of a NumPy .npy file.
+ *
+ * Only the C-ordered (not Fortran-ordered) arrays of the numeric types are supported.
+ * @param name Name of the input, that the tensor is parsed for.
+ * @param path Path of the file, used in the error messages.
+ */
+inline std::shared_ptr<StickyInput> ParseNpy(const std::string &contents, const std::string &name,
+                                             const std::string &path = "<memory>") {
+  const std::string magic = "\x93NUMPY";
+  ENFORCE(contents.size() >= 10 && contents.compare(0, magic.size(), magic) == 0,
+          make_string(path, " is not a .npy file."));
+  auto major_version = static_cast<uint8_t>(contents[6]);
+  size_t header_len_size = major_version == 1 ? 2 : 4;
+  size_t header_len = 0;
+  for (size_t i = 0; i < header_len_size; i++)
+    header_len |= static_cast<size_t>(static_cast<uint8_t>(contents[8 + i])) << (8 * i);
+  size_t data_offset = 8 + header_len_size + header_len;
+  ENFORCE(contents.size() >= data_offset, make_string(path, " is truncated."));
+  auto header = contents.substr(8 + header_len_size, header_len);
+
+  auto value_of = [&](const std::string &key) {
+    auto pos = header.find("'" + key + "'");
+    ENFORCE(pos != std::string::npos, make_string("Missing '", key, "' in the header of ", path));
+    pos = header.find(':', pos);
+    ENFORCE(pos != std::string::npos, make_string("Malformed header of ", path));
+    return pos + 1;
+  };
+
+  auto descr_begin = header.find('\'', value_of("descr")) + 1;
+  auto descr = header.substr(descr_begin, header.find('\'', descr_begin) - descr_begin);
+
+  auto fortran_order = header.substr(value_of("fortran_order"));
+  ENFORCE(fortran_order.find("False") < fortran_order.find("True"),
+          make_string("Fortran-ordered arrays are not supported: ", path));
+
+  auto shape_begin = header.find('(', value_of("shape")) + 1;
+  auto shape_str = header.substr(shape_begin, header.find(')', shape_begin) - shape_begin);
+  std::vector<int64_t> shape;
+  for (auto &extent : split(shape_str, ",")) {
+    if (extent.find_first_of("0123456789") != std::string::npos)
+      shape.push_back(std::stoll(extent));
+  }
+
+  auto sticky = std::make_shared<StickyInput>();
+  sticky->meta.name = name;
+  sticky->meta.type = NpyToDaliType(descr);
+  sticky->meta.shape = TensorListShape<>::make_uniform(1, TensorShape<>(shape));
+  size_t size = volume(shape) * dali_type_size(sticky->meta.type);
+  ENFORCE(contents.size() - data_offset >= size, make_string(path, " is truncated."));
+  sticky->data.assign(contents.begin() + data_offset, contents.begin() + data_offset + size);
+  return sticky;
+}
+
+/**
+ * @brief Read a tensor stored in the NumPy .npy file.
+ */
+inline std::shared_ptr<StickyInput> ReadNpy(const std::string &path, const std::string &name) {
+  std::ifstream fin(path, std::ios::binary);
+  ENFORCE(fin.good(), make_string("Failed to open the file: ", path));
+  std::stringstream ss;
+  ss << fin.rdbuf();
+  return ParseNpy(ss.str(), name, path);
+}
+
+/**
+ * @brief Registry of the sticky inputs of a model.
+ *
+ * Whenever a request provides a sticky input, it replaces the registered one. The requests,
+ * that omit a sticky input, get the registered one instead.
+ * The registry is shared by all the instances of the model, so it's thread-safe.
+ */
+class StickyInputs {
+ public:
+  StickyInputs(std::vector<std::string> names, bool batched) :
+      names_(std::move(names)), batched_(batched) {}
+
+  const std::vector<std::string> &Names() const {
+    return names_;
+  }
+
+  bool IsSticky(const std::string &name) const {
+    return std::find(names_.begin(), names_.end(), name) != names_.end();
+  }
+
+  /**
+   * @brief Get the registered input, nullptr if there's none.
+   *
+   * The returned input stays valid, even if it's replaced in the meantime.
+   */
+  std::shared_ptr<const StickyInput> Get(const std::string &name) const {
+    std::lock_guard<std::mutex> lock(mutex_);
+    auto it = inputs_.find(name);
+    return it != inputs_.end() ? it->second : nullptr;
+  }
+
+  void Set(std::shared_ptr<const StickyInput> input) {
+    auto name = input->meta.name;
+    std::lock_guard<std::mutex> lock(mutex_);
+    inputs_[name] = std::move(input);
+  }
+
+  /**
+   * @brief Register the input \p name, read from the .npy file.
+   *
+   * For the unbatched models, the outermost dimension of the array is the batch dimension.
+   */
+  void Load(const std::string &path, const std::string &name) {
+    auto input = ReadNpy(path, name);
+    if (!batched_) {
+      auto shape = input->meta.shape.tensor_shape(0);
+      ENFORCE(shape.sample_dim() > 0,
+              make_string("The sticky input ", name, " of an unbatched model can't be a scalar."));
+      input->meta.shape = TensorListShape<>::make_uniform(shape[0], shape.last(shape.size() - 1));
+    }
+    Set(std::move(input));
+  }
+
+  /**
+   * @brief Register the \p input provided by a request.
+   *
+   * The data is copied, so the request can be released afterwards.
+   * For the batched models, only the first sample is kept.
+   */
+  void Register(const IDescr &input) {
+    ENFORCE(input.meta.shape.num_samples() > 0,
+            make_string("The sticky input ", input.meta.name, " can't be empty."));
+    auto sticky = std::make_shared<StickyInput>();
+    sticky->meta.name = input.meta.name;
+    sticky->meta.type = input.meta.type;
+    if (batched_) {
+      sticky->meta.shape = TensorListShape<>::make_uniform(1, input.meta.shape.tensor_shape(0));
+    } else {
+      sticky->meta.shape = input.meta.shape;
+    }
+    size_t size = sticky->meta.shape.num_elements() * dali_type_size(input.meta.type);
+    sticky->data.resize(size);
+    size_t offset = 0;
+    bool gpu_copy = false;
+    for (auto &buffer : input.buffers) {
+      size_t n = std::min(buffer.size, size - offset);
+      if (buffer.device == device_type_t::CPU) {
+        std::memcpy(sticky->data.data() + offset, buffer.data, n);
+      } else {
+        MemCopy(device_type_t::CPU, sticky->data.data() + offset, buffer.device, buffer.data, n);
+        gpu_copy = true;
+      }
+      offset += n;
+      if (offset == size)
+        break;
+    }
+    if (gpu_copy)
+      CUDA_CALL_GUARD(cudaStreamSynchronize(0));
+    ENFORCE(offset == size, make_string("The buffers of the input ", input.meta.name,
+                                        " are smaller than its shape indicates."));
+    Set(std::move(sticky));
+  }
+
+  /**
+   * @brief Create the descriptor of the registered \p input for a request
+   *        with \p num_samples samples.
+   *
+   * For the batched models, the sample is repeated \p num_samples times, without a copy.
+   * The descriptor points to the data of the \p input, so it must be kept alive
+   * until the pipeline consumes it.
+   */
+  IDescr Bind(const StickyInput &input, int num_samples) const {
+    IDescr descr;
+    IBufferDescr buffer;
+    buffer.device = device_type_t::CPU;
+    buffer.data = input.data.data();
+    buffer.size = input.data.size();
+    descr.meta.name = input.meta.name;
+    descr.meta.type = input.meta.type;
+    if (batched_) {
+      descr.meta.shape =
+          TensorListShape<>::make_uniform(num_samples, input.meta.shape.tensor_shape(0));
+      descr.buffers.assign(num_samples, buffer);
+    } else {
+      descr.meta.shape = input.meta.shape;
+      descr.buffers.push_back(buffer);
+    }
+    return descr;
+  }
+
+  /**
+   * @brief Check if the registered inputs match the inputs declared in the model config.
+   */
+  void Validate(const std::vector<IOConfig> &inputs_config) const {
+    for (auto &name : names_) {
+      auto config = std::find_if(inputs_config.begin(), inputs_config.end(),
+                                 [&](auto &input) { return input.name == name; });
+      if (config == inputs_config.end()) {
+        throw TritonError::InvalidArg(
+            make_string("The sticky input ", name, " is not declared in the model config."));
+      }
+      auto input = Get(name);
+      if (!input || !config->shape)
+        continue;
+      auto ndim = input->meta.shape.sample_dim() + (batched_ ? 0 : 1);
+      if (input->meta.type != config->dtype || ndim != static_cast<int>(config->shape->size())) {
+        throw TritonError::InvalidArg(make_string(
+            "The registered sticky input ", name,
+            " doesn't match the type or the number of dimensions declared in the model config."));
+      }
+    }
+  }
+
+ private:
+  std::vector<std::string> names_;
+  bool batched_;
+  mutable std::mutex mutex_;
+  std::unordered_map<std::string, std::shared_ptr<const StickyInput>> inputs_;
+};
+
+}}}  // namespace triton::backend::dali
+
+#endif  // DALI_BACKEND_STICKY_INPUTS_STICKY_INPUTS_H_
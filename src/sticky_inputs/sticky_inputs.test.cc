@@ -0,0 +1,145 @@
+// The MIT License (MIT)
+//
+// Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+#include <catch2/catch.hpp>
+
+#include <cstring>
+#include <numeric>
+#include <string>
+#include <vector>
+
+#include "src/sticky_inputs/sticky_inputs.h"
+
+namespace triton { namespace backend { namespace dali { namespace test {
+
+std::string MakeNpy(const std::string &descr, const std::string &shape, const void *data,
+                    size_t size) {
+  std::string header = "{'descr': '" + descr + "', 'fortran_order': False, 'shape': " + shape +
+                       ", }";
+  header.append(64 - (10 + header.size() + 1) % 64, ' ');
+  header.push_back('\n');
+  std::string npy = "\x93NUMPY";
+  npy.push_back(1);
+  npy.push_back(0);
+  npy.push_back(static_cast<char>(header.size() & 0xff));
+  npy.push_back(static_cast<char>(header.size() >> 8));
+  npy += header;
+  npy.append(static_cast<const char *>(data), size);
+  return npy;
+}
+
+TEST_CASE("Parse npy") {
+  std::vector<float> data(2 * 3);
+  std::iota(data.begin(), data.end(), 0.f);
+
+  SECTION("Matrix") {
+    auto npy = MakeNpy("<f4", "(2, 3)", data.data(), data.size() * sizeof(float));
+    auto input = ParseNpy(npy, "INPUT");
+    REQUIRE(input->meta.name == "INPUT");
+    REQUIRE(input->meta.type == DALI_FLOAT);
+    REQUIRE(input->meta.shape == TensorListShape<>::make_uniform(1, TensorShape<>(2, 3)));
+    REQUIRE(input->data.size() == data.size() * sizeof(float));
+    REQUIRE(std::memcmp(input->data.data(), data.data(), input->data.size()) == 0);
+  }
+
+  SECTION("Vector") {
+    auto npy = MakeNpy("|u1", "(6,)", data.data(), 6);
+    auto input = ParseNpy(npy, "INPUT");
+    REQUIRE(input->meta.type == DALI_UINT8);
+    REQUIRE(input->meta.shape == TensorListShape<>::make_uniform(1, TensorShape<>(6)));
+  }
+
+  SECTION("Unsupported arrays") {
+    REQUIRE_THROWS(ParseNpy(MakeNpy(">f4", "(2, 3)", data.data(), 24), "INPUT"));
+    REQUIRE_THROWS(ParseNpy(MakeNpy("<U4", "(2, 3)", data.data(), 24), "INPUT"));
+    REQUIRE_THROWS(ParseNpy(MakeNpy("<f4", "(2, 3)", data.data(), 20), "INPUT"));
+    REQUIRE_THROWS(ParseNpy("not a numpy file", "INPUT"));
+  }
+}
+
+TEST_CASE("Sticky inputs") {
+  std::vector<int32_t> data = {1, 2, 3, 4, 5, 6};
+  IDescr request_input;
+  request_input.meta.name = "MAP";
+  request_input.meta.type = DALI_INT32;
+  request_input.meta.shape = TensorListShape<>::make_uniform(2, TensorShape<>(3));
+  IBufferDescr buffer;
+  buffer.device = device_type_t::CPU;
+  buffer.data = data.data();
+  buffer.size = data.size() * sizeof(int32_t);
+  request_input.buffers.push_back(buffer);
+
+  SECTION("Batched") {
+    StickyInputs sticky({"MAP", "LUT"}, true);
+    REQUIRE(sticky.IsSticky("MAP"));
+    REQUIRE(!sticky.IsSticky("INPUT"));
+    REQUIRE(sticky.Get("MAP") == nullptr);
+
+    sticky.Register(request_input);
+    auto input = sticky.Get("MAP");
+    REQUIRE(input);
+    REQUIRE(input->meta.shape == TensorListShape<>::make_uniform(1, TensorShape<>(3)));
+    REQUIRE(input->data.size() == 3 * sizeof(int32_t));
+
+    auto bound = sticky.Bind(*input, 4);
+    REQUIRE(bound.meta.name == "MAP");
+    REQUIRE(bound.meta.shape == TensorListShape<>::make_uniform(4, TensorShape<>(3)));
+    REQUIRE(bound.buffers.size() == 4);
+    for (auto &b : bound.buffers) {
+      REQUIRE(b.data == input->data.data());
+      REQUIRE(b.size == 3 * sizeof(int32_t));
+    }
+
+    IOConfig lut("LUT");
+    REQUIRE_NOTHROW(sticky.Validate({IOConfig("MAP", DALI_INT32, std::vector<int64_t>{3}), lut}));
+    REQUIRE_THROWS(sticky.Validate({IOConfig("MAP", DALI_FLOAT, std::vector<int64_t>{3}), lut}));
+    REQUIRE_THROWS(sticky.Validate({IOConfig("MAP", DALI_INT32, std::vector<int64_t>{3, 1}), lut}));
+    REQUIRE_THROWS(sticky.Validate({IOConfig("MAP", DALI_INT32, std::vector<int64_t>{3})}));
+  }
+
+  SECTION("Unbatched") {
+    StickyInputs sticky({"MAP"}, false);
+    sticky.Register(request_input);
+    auto input = sticky.Get("MAP");
+    REQUIRE(input->meta.shape == request_input.meta.shape);
+    REQUIRE(input->data.size() == data.size() * sizeof(int32_t));
+
+    auto bound = sticky.Bind(*input, 1);
+    REQUIRE(bound.meta.shape == request_input.meta.shape);
+    REQUIRE(bound.buffers.size() == 1);
+    REQUIRE(std::memcmp(bound.buffers[0].data, data.data(), bound.buffers[0].size) == 0);
+
+    REQUIRE_NOTHROW(sticky.Validate({IOConfig("MAP", DALI_INT32, std::vector<int64_t>{2, 3})}));
+  }
+
+  SECTION("Registered input outlives its replacement") {
+    StickyInputs sticky({"MAP"}, true);
+    sticky.Register(request_input);
+    auto old_input = sticky.Get("MAP");
+    data[0] = 42;
+    sticky.Register(request_input);
+    REQUIRE(reinterpret_cast<const int32_t *>(old_input->data.data())[0] == 1);
+    REQUIRE(reinterpret_cast<const int32_t *>(sticky.Get("MAP")->data.data())[0] == 42);
+  }
+}
+
+}}}}  // namespace triton::backend::dali::test
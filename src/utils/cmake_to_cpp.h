@@ -27,4 +27,7 @@
 
 static constexpr bool SKIP_DALI_DOWNLOAD = TRITON_DALI_SKIP_DOWNLOAD;
 
+// DALI version requested at build time. Empty, if the latest or a preinstalled DALI was used.
+static constexpr const char* DALI_BUILD_VERSION = TRITON_DALI_VERSION;
+
 #endif  // DALI_BACKEND_UTILS_CMAKE_TO_CPP_H_
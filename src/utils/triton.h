@@ -25,6 +25,10 @@
 
 #include <dali/c_api.h>
 
+#include <algorithm>
+#include <cstring>
+#include <vector>
+
 #include "src/dali_executor/io_descriptor.h"
 #include "src/dali_executor/utils/utils.h"
 #include "triton/backend/backend_model.h"
@@ -175,6 +179,7 @@ class TritonInput {
     const char *name;
     TRITON_CALL(TRITONBACKEND_InputProperties(handle_, &name, &input_datatype, &input_shape,
                                               &input_dims_count, &byte_size_, &buffer_cnt_));
+    is_bytes_ = input_datatype == TRITONSERVER_TYPE_BYTES;
     meta_.name = std::string(name);
     meta_.type = to_dali(input_datatype);
     TensorShape<> sample_shape(input_shape + 1, input_shape + input_dims_count);
@@ -194,6 +199,14 @@ class TritonInput {
     return buffer_cnt_;
   }
 
+  /**
+   * @brief Is the input of BYTES (TYPE_STRING) type. The buffers of such input hold
+   *        the elements prefixed with their lengths, see UnpackBytes.
+   */
+  bool IsBytes() const {
+    return is_bytes_;
+  }
+
   /**
    * @brief Request an input buffer.
    * @param idx Input index.
@@ -220,8 +233,75 @@ class TritonInput {
   IOMeta meta_{};
   size_t byte_size_ = 0;
   uint32_t buffer_cnt_ = 0;
+  bool is_bytes_ = false;
 };
 
+/**
+ * @brief Convert the BYTES input to the UINT8 input with every element being a separate,
+ *        1D sample of the element's length.
+ *
+ * Triton serializes every element of the BYTES tensor as its length (4-byte, little-endian)
+ * followed by the data. The buffers of the returned descriptor point to the data of the elements
+ * within the buffers of the \p input, so nothing is copied.
+ * Every sample of the \p input must consist of a single element.
+ */
+inline IDescr UnpackBytes(const IDescr &input) {
+  const auto &name = input.meta.name;
+  for (int sample_idx = 0; sample_idx < input.meta.shape.num_samples(); sample_idx++) {
+    ENFORCE(volume(input.meta.shape[sample_idx]) == 1,
+            make_string("Every sample of the BYTES input ", name,
+                        " must consist of a single element."));
+  }
+  size_t buffer_idx = 0;
+  size_t offset = 0;
+  // Read `size` bytes from the buffers, calling `consume` for each contiguous piece
+  auto read = [&](size_t size, auto &&consume) {
+    while (size > 0) {
+      ENFORCE(buffer_idx < input.buffers.size(),
+              make_string("The buffers of the BYTES input ", name, " are truncated."));
+      const auto &buffer = input.buffers[buffer_idx];
+      ENFORCE(buffer.device == device_type_t::CPU,
+              make_string("The BYTES input ", name, " must be passed in the host memory."));
+      size_t piece = std::min(size, buffer.size - offset);
+      if (piece > 0)
+        consume(buffer, offset, piece);
+      offset += piece;
+      size -= piece;
+      if (offset == buffer.size) {
+        buffer_idx++;
+        offset = 0;
+      }
+    }
+  };
+
+  IDescr ret;
+  ret.meta.name = name;
+  ret.meta.type = DALI_UINT8;
+  std::vector<TensorShape<>> shapes;
+  shapes.reserve(input.meta.shape.num_samples());
+  for (int sample_idx = 0; sample_idx < input.meta.shape.num_samples(); sample_idx++) {
+    uint8_t len_bytes[sizeof(uint32_t)];
+    size_t len_offset = 0;
+    read(sizeof(uint32_t), [&](const IBufferDescr &buffer, size_t buf_offset, size_t size) {
+      std::memcpy(len_bytes + len_offset, static_cast<const char *>(buffer.data) + buf_offset,
+                  size);
+      len_offset += size;
+    });
+    uint32_t len = 0;
+    for (size_t i = 0; i < sizeof(uint32_t); i++)
+      len |= static_cast<uint32_t>(len_bytes[i]) << (8 * i);
+    read(len, [&](const IBufferDescr &buffer, size_t buf_offset, size_t size) {
+      IBufferDescr piece = buffer;
+      piece.data = static_cast<const char *>(buffer.data) + buf_offset;
+      piece.size = size;
+      ret.buffers.push_back(piece);
+    });
+    shapes.push_back(TensorShape<>(static_cast<int64_t>(len)));
+  }
+  ret.meta.shape = TensorListShape<>(shapes);
+  return ret;
+}
+
 template<class Actual>
 class TritonRequestWrapper {
  public:
@@ -380,6 +460,66 @@ class TritonResponseView : public TritonResponseWrapper<TritonResponseView> {
   TRITONBACKEND_Response *handle_ = nullptr;
 };
 
+/** @brief Owning handle for a family of Triton metrics. */
+class TritonMetricFamily : public UniqueHandle<TRITONSERVER_MetricFamily *, TritonMetricFamily> {
+ public:
+  DALI_INHERIT_UNIQUE_HANDLE(TRITONSERVER_MetricFamily *, TritonMetricFamily)
+
+  static TritonMetricFamily New(TRITONSERVER_MetricKind kind, const std::string &name,
+                                const std::string &description) {
+    TRITONSERVER_MetricFamily *handle;
+    TRITON_CALL(TRITONSERVER_MetricFamilyNew(&handle, kind, name.c_str(), description.c_str()));
+    return TritonMetricFamily(handle);
+  }
+
+  static void DestroyHandle(TRITONSERVER_MetricFamily *family) {
+    LOG_IF_ERROR(TRITONSERVER_MetricFamilyDelete(family),
+                 make_string("Failed deleting a metric family."));
+  }
+};
+
+/**
+ * @brief Owning handle for a Triton metric.
+ *
+ * The metric has to be destroyed before its family.
+ */
+class TritonMetric : public UniqueHandle<TRITONSERVER_Metric *, TritonMetric> {
+ public:
+  DALI_INHERIT_UNIQUE_HANDLE(TRITONSERVER_Metric *, TritonMetric)
+
+  /**
+   * @brief Create a metric in the `family`, with the given (name, value) label pairs.
+   */
+  static TritonMetric New(const TritonMetricFamily &family,
+                          const std::vector<std::pair<std::string, std::string>> &labels = {}) {
+    std::vector<const TRITONSERVER_Parameter *> params;
+    for (auto &label : labels) {
+      params.push_back(TRITONSERVER_ParameterNew(label.first.c_str(), TRITONSERVER_PARAMETER_STRING,
+                                                 label.second.c_str()));
+    }
+    TRITONSERVER_Metric *handle;
+    auto err = TRITONSERVER_MetricNew(&handle, family, params.data(), params.size());
+    for (auto param : params) {
+      TRITONSERVER_ParameterDelete(const_cast<TRITONSERVER_Parameter *>(param));
+    }
+    TRITON_CALL(err);
+    return TritonMetric(handle);
+  }
+
+  static void DestroyHandle(TRITONSERVER_Metric *metric) {
+    LOG_IF_ERROR(TRITONSERVER_MetricDelete(metric), make_string("Failed deleting a metric."));
+  }
+
+  void Set(double value) const {
+    LOG_IF_ERROR(TRITONSERVER_MetricSet(handle_, value), make_string("Failed setting a metric."));
+  }
+
+  void Increment(double value) const {
+    LOG_IF_ERROR(TRITONSERVER_MetricIncrement(handle_, value),
+                 make_string("Failed incrementing a metric."));
+  }
+};
+
 /**
  * @brief Consume and send response and error.
  * final_response - true if it's the last response for a current request
@@ -23,6 +23,7 @@
 #include <catch2/catch.hpp>
 #include <iostream>
 
+#include "src/utils/triton.h"
 #include "src/utils/utils.h"
 
 #include "src/dali_executor/utils/utils.h"
@@ -119,5 +120,59 @@ TEST_CASE("Split outer dim") {
   }
 }
 
+TEST_CASE("Unpack BYTES input") {
+  std::vector<std::string> elements = {"first", "", "the third element"};
+  int num_elements = elements.size();
+  std::string serialized;
+  for (auto &element : elements) {
+    uint32_t len = element.size();
+    for (size_t i = 0; i < sizeof(len); i++)
+      serialized.push_back(static_cast<char>((len >> (8 * i)) & 0xff));
+    serialized += element;
+  }
+
+  IDescr input;
+  input.meta.name = "encoded";
+  input.meta.type = DALI_UINT8;
+  input.meta.shape = TensorListShape<>::make_uniform(num_elements, TensorShape<>(1));
+
+  // The split points fall within the lengths as well as the data of the elements
+  size_t split = GENERATE(0, 2, 7, 11);
+  IBufferDescr buffer;
+  buffer.device = device_type_t::CPU;
+  if (split > 0) {
+    buffer.data = serialized.data();
+    buffer.size = split;
+    input.buffers.push_back(buffer);
+  }
+  buffer.data = serialized.data() + split;
+  buffer.size = serialized.size() - split;
+  input.buffers.push_back(buffer);
+
+  auto unpacked = UnpackBytes(input);
+  CHECK(unpacked.meta.name == "encoded");
+  CHECK(unpacked.meta.type == DALI_UINT8);
+  REQUIRE(unpacked.meta.shape.num_samples() == num_elements);
+  std::string data;
+  for (int i = 0; i < num_elements; i++) {
+    int64_t len = elements[i].size();
+    CHECK(unpacked.meta.shape.tensor_shape(i) == TensorShape<>(len));
+  }
+  for (auto &piece : unpacked.buffers) {
+    data.append(static_cast<const char *>(piece.data), piece.size);
+  }
+  CHECK(data == "firstthe third element");
+
+  SECTION("Many elements per sample") {
+    input.meta.shape = TensorListShape<>::make_uniform(1, TensorShape<>(num_elements));
+    REQUIRE_THROWS(UnpackBytes(input));
+  }
+
+  SECTION("Truncated buffers") {
+    input.buffers.back().size--;
+    REQUIRE_THROWS(UnpackBytes(input));
+  }
+}
+
 
 }}}}  // namespace triton::backend::dali::test